@@ -0,0 +1,279 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows: RSS is reported as None there
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.server import SyntheticTarget
+from utils.wordlist import iter_wordlist
+
+PROFILES = ["stealth", "balanced", "aggressive"]
+BUILTIN_WORDLISTS = ["common", "medium", "large"]
+
+# compared against --baseline: (metric, higher_is_better)
+REGRESSION_METRICS = [("rps", True), ("latency_p99_ms", False), ("peak_rss_kb", False)]
+
+
+# --------------------------------------------------------------------------- #
+# One case (runs in its own process so RSS / CPU are per case)
+# --------------------------------------------------------------------------- #
+def _timed(cls, latencies):
+    """Subclass of an engine that records the client-side latency of every probe."""
+
+    class Timed(cls):
+        def send_request(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return super().send_request(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - started)
+
+        async def send_request_async(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await super().send_request_async(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - started)
+
+    return Timed
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _cpu_seconds():
+    if resource is None:
+        return time.process_time(), 0.0
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime, usage.ru_stime
+
+
+def run_case(spec):
+    from modules.async_engine import AsyncContentDiscoverer
+    from modules.content_discoverer import ContentDiscoverer
+    from modules.output import iter_results
+    from utils.context import ScanContext
+
+    latencies = []
+    engine_kwargs = {}
+    if spec["engine"] == "async":
+        cls = _timed(AsyncContentDiscoverer, latencies)
+        engine_kwargs["concurrency"] = spec.get("concurrency")
+    else:
+        cls = _timed(ContentDiscoverer, latencies)
+        engine_kwargs["http2"] = spec["engine"] == "http2"
+
+    workdir = tempfile.mkdtemp(prefix="pathhunter-bench-")
+    discoverer = cls(
+        context=ScanContext(target_url=spec["url"], wordlist_path=spec["wordlist"]),
+        threads=spec["threads"],
+        profile=spec["profile"],
+        recursion=False,
+        output_path=os.path.join(workdir, "results"),
+        formats=["json"],
+        verify_ssl=False,
+        rate=spec.get("rate"),
+        max_rate=spec.get("max_rate"),
+        ui=False,
+        **engine_kwargs,
+    )
+
+    user0, sys0 = _cpu_seconds()
+    started = time.perf_counter()
+    discoverer.run(spec["url"], spec["wordlist"])
+    wall = time.perf_counter() - started
+    user1, sys1 = _cpu_seconds()
+
+    latencies.sort()
+    results_path = discoverer.results.path if discoverer.results else None
+    result = {
+        "requests": len(latencies),
+        "wall_s": round(wall, 3),
+        "rps": round(len(latencies) / wall, 1) if wall else None,
+        "latency_p50_ms": round(_percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "latency_p99_ms": round(_percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        "cpu_user_s": round(user1 - user0, 3),
+        "cpu_sys_s": round(sys1 - sys0, 3),
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        "peak_rss_kb": (
+            None if resource is None
+            else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == "darwin" else 1)
+        ),
+        "results": sum(1 for _ in iter_results(results_path)) if results_path else 0,
+    }
+    with open(spec["out"], "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+# --------------------------------------------------------------------------- #
+# Suite
+# --------------------------------------------------------------------------- #
+def _resolve_wordlist(name, words, tmpdir):
+    path = name
+    if name in BUILTIN_WORDLISTS:
+        path = os.path.join(REPO_ROOT, "wordlists", f"{name}.txt")
+    if not os.path.isfile(path):
+        raise SystemExit(f"Wordlist not found: {path}")
+    if not words:
+        return path
+    trimmed = os.path.join(tmpdir, f"{os.path.basename(path)}.{words}")
+    with open(trimmed, "w", encoding="utf-8") as f:
+        for i, word in enumerate(iter_wordlist(path)):
+            if i >= words:
+                break
+            f.write(word + "\n")
+    return trimmed
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline, tolerance):
+    """Regressions of report vs baseline beyond tolerance (fraction), per matching case."""
+    def key(case):
+        return case["wordlist"], case["profile"], case["engine"], case["words"]
+
+    previous = {key(case): case for case in baseline.get("cases", [])}
+    regressions = []
+    for case in report["cases"]:
+        before = previous.get(key(case))
+        if before is None:
+            continue
+        for metric, higher_is_better in REGRESSION_METRICS:
+            old, new = before.get(metric), case.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append({"case": list(key(case)), "metric": metric, "baseline": old, "current": new,
+                                    "change": round(change, 3)})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmark ContentDiscoverer.run against a local synthetic target",
+    )
+    parser.add_argument("--wordlists", default=",".join(BUILTIN_WORDLISTS), help="Comma-separated: common,medium,large or paths")
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="Comma-separated scan profiles")
+    parser.add_argument("--engines", default="thread", help="Comma-separated engines: thread,async,http2 (thread engine over the HTTP/2 transport)")
+    parser.add_argument("--words", type=int, default=None, help="Only use the first N words of each wordlist")
+    parser.add_argument("--threads", type=int, default=30, help="Worker threads (profiles still clamp/raise this)")
+    parser.add_argument("--concurrency", type=int, default=None, help="In-flight requests for the async engine")
+    parser.add_argument("--rate", type=float, default=None, help="Override the profile's initial rate")
+    parser.add_argument("--max-rate", type=float, default=None, help="Override the profile's rate ceiling")
+    parser.add_argument("--latency", type=float, default=0.002, help="Server latency per response (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- latency jitter (seconds)")
+    parser.add_argument("--wildcard", choices=["none", "200", "403"], default="none", help="Catch-all answer for unknown paths")
+    parser.add_argument("--large-body", type=int, default=256 * 1024, help="Size of the large responses (bytes)")
+    parser.add_argument("--tls", action="store_true", help="Serve HTTPS with a throwaway self-signed certificate")
+    parser.add_argument("--http2", action="store_true", help="Also serve HTTP/2 (negotiated through ALPN; implies --tls)")
+    parser.add_argument("--timeout", type=float, default=3600, help="Per-case time limit (seconds)")
+    parser.add_argument("-o", "--output", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="Earlier report to compare against; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown vs --baseline")
+    parser.add_argument("--case", help=argparse.SUPPRESS)  # internal: run a single case
+    args = parser.parse_args(argv)
+
+    if args.case:
+        return run_case(json.loads(args.case))
+
+    wildcard = None if args.wildcard == "none" else int(args.wildcard)
+    target = SyntheticTarget(
+        latency=args.latency, jitter=args.jitter, wildcard=wildcard, large_body=args.large_body,
+        tls=args.tls or args.http2, http2=args.http2,
+    )
+    cases = []
+    with target, tempfile.TemporaryDirectory(prefix="pathhunter-bench-") as tmpdir:
+        for wordlist in args.wordlists.split(","):
+            path = _resolve_wordlist(wordlist.strip(), args.words, tmpdir)
+            for profile in args.profiles.split(","):
+                for engine in args.engines.split(","):
+                    spec = {
+                        "url": target.url,
+                        "wordlist": path,
+                        "profile": profile.strip(),
+                        "engine": engine.strip(),
+                        "threads": args.threads,
+                        "concurrency": args.concurrency,
+                        "rate": args.rate,
+                        "max_rate": args.max_rate,
+                        "out": os.path.join(tmpdir, "case.json"),
+                    }
+                    served = target.requests
+                    subprocess.run(
+                        [sys.executable, "-m", "benchmarks.run", "--case", json.dumps(spec)],
+                        cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                        timeout=args.timeout, check=True,
+                    )
+                    with open(spec["out"], encoding="utf-8") as f:
+                        case = json.load(f)
+                    case = dict(
+                        wordlist=wordlist.strip(), profile=spec["profile"], engine=spec["engine"], words=args.words,
+                        server_requests=target.requests - served, **case,
+                    )
+                    cases.append(case)
+                    print(
+                        f"{case['wordlist']:>8} {case['profile']:>10} {case['engine']:>6}: "
+                        f"{case['rps']} req/s, p50 {case['latency_p50_ms']} ms, p99 {case['latency_p99_ms']} ms, "
+                        f"{case['peak_rss_kb']} KiB peak RSS, "
+                        f"{case['cpu_user_s'] + case['cpu_sys_s']:.2f}s CPU",
+                        file=sys.stderr,
+                    )
+
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "server": target.config(),
+        },
+        "cases": cases,
+    }
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if report.get("regressions"):
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
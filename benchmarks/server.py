@@ -0,0 +1,272 @@
+import os
+import queue
+import random
+import select
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --------------------------------------------------------------------------- #
+# Synthetic target
+#
+# Every path is classified by a hash of the path itself, so the same
+# wordlist always finds the same things:
+#
+#   0.5%  200 small page        0.3%  403 (triggers bypass probes)
+#   0.2%  302 -> /login         0.1%  200 with a large body
+#   rest  404, or the wildcard answer (200 / 403) when enabled
+# --------------------------------------------------------------------------- #
+FOUND, FORBIDDEN, REDIRECT, LARGE = 5, 8, 10, 11  # per-mille thresholds
+
+
+def classify(path):
+    bucket = zlib.crc32(path.encode("utf-8", "replace")) % 1000
+    if bucket < FOUND:
+        return "found"
+    if bucket < FORBIDDEN:
+        return "forbidden"
+    if bucket < REDIRECT:
+        return "redirect"
+    if bucket < LARGE:
+        return "large"
+    return None
+
+
+def respond(target, path):
+    """(status, body, headers) the target answers a GET of path with, after its latency."""
+    target.count()
+    if target.latency or target.jitter:
+        time.sleep(max(0.0, target.latency + random.uniform(-target.jitter, target.jitter)))
+
+    path = path.split("?", 1)[0]
+    if path == "/login":
+        return 200, b"<form><input type=password></form>", {}
+
+    kind = classify(path)
+    if kind == "found":
+        return 200, b"<html>found " + path.encode() + b"</html>", {}
+    if kind == "forbidden":
+        return 403, b"forbidden", {}
+    if kind == "redirect":
+        return 302, b"", {"Location": "/login"}
+    if kind == "large":
+        return 200, target.large_body, {}
+    if target.wildcard == 200:
+        return 200, b"<html>Welcome! You asked for " + path.encode() + b"</html>", {}
+    if target.wildcard == 403:
+        return 403, b"Access denied by policy", {}
+    return 404, b"not found", {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        code, body, headers = respond(self.server.target, self.path)
+        self.send_response(code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_HEAD = do_GET
+
+
+# --------------------------------------------------------------------------- #
+# HTTP/2 (TLS connections that negotiate h2 through ALPN)
+#
+# One thread owns the socket and the h2 state machine; every request is
+# answered on a thread of its own (so latency overlaps, as with HTTP/1.1)
+# and handed back through a queue. Bodies go out as flow control allows.
+# --------------------------------------------------------------------------- #
+def _serve_h2(sock, target):
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+
+    conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+    conn.initiate_connection()
+    answered = queue.SimpleQueue()  # (stream_id, method, status, body, headers)
+    wake_r, wake_w = socket.socketpair()
+    sending = {}  # stream_id -> [body, offset]
+
+    def answer(stream_id, method, path):
+        answered.put((stream_id, method) + respond(target, path))
+        try:
+            wake_w.send(b"x")
+        except OSError:
+            pass  # connection already gone
+
+    def pump():
+        for stream_id, state in list(sending.items()):
+            body, offset = state
+            try:
+                while offset < len(body):
+                    size = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size, len(body) - offset)
+                    if size <= 0:
+                        break
+                    conn.send_data(stream_id, body[offset:offset + size], end_stream=offset + size == len(body))
+                    offset += size
+            except h2.exceptions.StreamClosedError:
+                offset = len(body)  # reset by the client
+            state[1] = offset
+            if offset >= len(body):
+                del sending[stream_id]
+
+    try:
+        sock.sendall(conn.data_to_send())
+        while True:
+            if not sock.pending():
+                select.select([sock, wake_r], [], [])
+            if sock.pending() or select.select([sock], [], [], 0)[0]:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        headers = dict(event.headers)
+                        threading.Thread(
+                            target=answer, args=(event.stream_id, headers[":method"], headers[":path"]), daemon=True
+                        ).start()
+                    elif isinstance(event, h2.events.DataReceived):
+                        conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.StreamReset):
+                        sending.pop(event.stream_id, None)
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+            if select.select([wake_r], [], [], 0)[0]:
+                wake_r.recv(4096)
+            while not answered.empty():
+                stream_id, method, code, body, headers = answered.get()
+                fields = [(":status", str(code)), ("content-length", str(len(body)))]
+                fields += [(name.lower(), value) for name, value in headers.items()]
+                if method == "HEAD" or not body:
+                    body = b""
+                try:
+                    conn.send_headers(stream_id, fields, end_stream=not body)
+                except h2.exceptions.StreamClosedError:
+                    continue
+                if body:
+                    sending[stream_id] = [body, 0]
+            pump()
+            sock.sendall(conn.data_to_send())
+    finally:
+        wake_r.close()
+        wake_w.close()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def finish_request(self, request, client_address):
+        if self.target.http2:
+            request.do_handshake()
+            if request.selected_alpn_protocol() == "h2":
+                return _serve_h2(request, self.target)
+        super().finish_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        # clients drop connections on purpose (unread large bodies, shutdown)
+        if not isinstance(sys.exc_info()[1], (ConnectionError, ssl.SSLError)):
+            super().handle_error(request, client_address)
+
+
+class SyntheticTarget:
+    """
+    Local stand-in HTTP(S) server for benchmarks, run on a background thread.
+
+    latency/jitter are seconds added to every response, wildcard is None,
+    200 or 403 (catch-all answer for unknown paths), large_body the size of
+    the "large" responses. With tls=True a throwaway self-signed certificate
+    is generated with the openssl CLI; http2=True (needs tls and the h2
+    package) also offers HTTP/2 through ALPN, keeping HTTP/1.1 for clients
+    that do not ask for it.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, wildcard: int = None,
+                 large_body: int = 256 * 1024, tls: bool = False, http2: bool = False,
+                 host: str = "127.0.0.1", port: int = 0):
+        if http2 and not tls:
+            raise ValueError("http2=True needs tls=True (h2 is negotiated through ALPN)")
+        self.latency = latency
+        self.jitter = jitter
+        self.wildcard = wildcard
+        self.large_body = b"Z" * large_body
+        self.tls = tls
+        self.http2 = http2
+        self.requests = 0
+        self._count_lock = threading.Lock()
+
+        self._server = _Server((host, port), _Handler)
+        self._server.target = self
+        self._certs = None
+        if tls:
+            self._wrap_tls()
+        self._thread = None
+
+    def count(self):
+        with self._count_lock:
+            self.requests += 1
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"{'https' if self.tls else 'http'}://{host}:{port}/"
+
+    def _wrap_tls(self):
+        if shutil.which("openssl") is None:
+            raise RuntimeError("tls=True needs the openssl command line tool")
+        self._certs = tempfile.mkdtemp(prefix="pathhunter-bench-")
+        cert, key = os.path.join(self._certs, "cert.pem"), os.path.join(self._certs, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+             "-subj", "/CN=localhost", "-keyout", key, "-out", cert],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        if self.http2:
+            context.set_alpn_protocols(["h2", "http/1.1"])
+        # handshake lazily in the handler thread, not serially in the accept loop
+        self._server.socket = context.wrap_socket(self._server.socket, server_side=True, do_handshake_on_connect=False)
+
+    def config(self):
+        return {
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "wildcard": self.wildcard,
+            "large_body": len(self.large_body),
+            "tls": self.tls,
+            "http2": self.http2,
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._certs:
+            shutil.rmtree(self._certs, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
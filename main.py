@@ -1,139 +1,484 @@
-import os
-import argparse
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-
-from modules.content_discoverer import ContentDiscoverer
-from utils.context import ScanContext
-
-console = Console()
-
-
-reports_dir = "reports"
-
-if not os.path.exists(reports_dir):
-    os.makedirs(reports_dir)
-
-
-def print_banner():
-    banner = """
-██████   █████ ████████ ██   ██ ██    ██ ███    ██ ████████ ███████ ██████  
-██   ██ ██   ██  ██     ██   ██ ██    ██ ████   ██    ██    ██      ██   ██ 
-██████  ███████  ██     ███████ ██    ██ ██ ██  ██    ██    █████   ██████  
-██      ██   ██  ██     ██   ██ ██    ██ ██  ██ ██    ██    ██      ██   ██ 
-██      ██   ██  ██     ██   ██  ██████  ██   ████    ██    ███████ ██   ██ 
-    Advanced Web Content Discovery Tool 
-    """
-    console.print(Panel(banner, style="bold cyan"))
-
-
-def print_scan_summary(url, wordlist, threads, profile, recursion, include_regex, exclude_regex, delay, output_path, formats):
-    summary_table = Table(show_header=False, box=None)
-    summary_table.add_row("🌍 Target", f"[yellow]{url}[/yellow]")
-    summary_table.add_row("📂 Wordlist", wordlist)
-    summary_table.add_row("⚙️ Threads", str(threads))
-    summary_table.add_row("🚀 Profile", profile)
-    summary_table.add_row("🔁 Recursion", str(recursion))
-    summary_table.add_row("⏱ Delay", f"{delay}s")
-    summary_table.add_row("✅ Include Regex", str(include_regex) if include_regex else "None")
-    summary_table.add_row("❌ Exclude Regex", str(exclude_regex) if exclude_regex else "None")
-    summary_table.add_row("💾 Output Base", output_path)
-    summary_table.add_row("📄 Formats", ", ".join(formats))
-    console.print(Panel(summary_table, title="[bold green]Scan Configuration[/bold green]", border_style="green"))
-
-
-def main():
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-    parser = argparse.ArgumentParser(description="PathHunter - Web Content Discovery Tool")
-    parser.add_argument("url", help="Target URL (must start with http:// or https://)")
-    parser.add_argument("-w", "--wordlist", help="Path to custom wordlist file (overrides --mode)")
-    parser.add_argument("-t", "--threads", type=int, default=30, help="Number of threads")
-    parser.add_argument("--delay", type=float, default=0.1, help="Delay between requests")
-    parser.add_argument("--profile", choices=["stealth", "balanced", "aggressive"], default="balanced", help="Scan profile")
-    parser.add_argument("--recursion", action="store_true", help="Enable recursion (experimental)")
-    parser.add_argument("--include-regex", help="Only include responses whose body matches this regex")
-    parser.add_argument("--exclude-regex", help="Exclude responses whose body matches this regex")
-    parser.add_argument("--mode", choices=["fast", "balanced", "deep"], default="balanced", help="Scan mode to select wordlist automatically")
-    parser.add_argument("-o", "--output", default="scan_results", help="Output base filename (extension auto-added per format)")
-    parser.add_argument("--format", default="json", help="Comma-separated formats: json,csv,txt or 'all'")
-    args = parser.parse_args()
-
-    # Validate URL
-    if not args.url.startswith(("http://", "https://")):
-        console.print("[bold red][ERROR][/bold red] Invalid URL. It must start with http:// or https://")
-        exit(1)
-
-    # Map modes to wordlist files
-    wordlist_map = {
-        "fast": os.path.join(BASE_DIR, "wordlists", "common.txt"),
-        "balanced": os.path.join(BASE_DIR, "wordlists", "medium.txt"),
-        "deep": os.path.join(BASE_DIR, "wordlists", "large.txt"),
-    }
-
-    # Determine wordlist
-    if args.wordlist:
-        wordlist_path = args.wordlist
-        if not os.path.isabs(wordlist_path):
-            wordlist_path = os.path.join(BASE_DIR, wordlist_path)
-    else:
-        wordlist_path = wordlist_map.get(args.mode, wordlist_map["balanced"])
-
-    # Check wordlist exists
-    if not os.path.isfile(wordlist_path):
-        console.print(f"[bold red][ERROR][/bold red] Wordlist not found: {wordlist_path}")
-        exit(1)
-
-    # Normalize formats
-    formats = [f.strip().lower() for f in args.format.split(",")]
-    if "all" in formats:
-        formats = ["json", "csv", "txt"]
-
-    print_banner()
-    print_scan_summary(
-        args.url,
-        wordlist_path,
-        args.threads,
-        args.profile,
-        args.recursion,
-        args.include_regex,
-        args.exclude_regex,
-        args.delay,
-        args.output,
-        formats,
-    )
-
-    # Init scan context
-    context = ScanContext(target_url=args.url, wordlist_path=wordlist_path)
-
-    # Build discoverer
-    discoverer = ContentDiscoverer(
-        context=context,
-        threads=args.threads,
-        delay=args.delay,
-        profile=args.profile,
-        recursion=args.recursion,
-        include_regex=args.include_regex,
-        exclude_regex=args.exclude_regex,
-        output_path=args.output,
-        formats=formats,
-        verify_ssl=True,  # adjust or expose flag
-    )
-
-    console.print(f"\n🚀 Starting {args.mode.upper()} scan on: {args.url}")
-    console.print(f"📂 Using wordlist: {wordlist_path}\n")
-
-    discoverer.run(args.url, wordlist_path)
-
-    # Show where files went
-    base = os.path.abspath(args.output)
-    got = ", ".join(formats)
-    console.print(f"\n✅ [bold green]Scan complete! Results saved (formats: {got}) with base: {base}[/bold green]")
-
-
-if __name__ == "__main__":
-    try:
-        main()
-    except KeyboardInterrupt:
-        console.print("\n⚠️ [bold red]Scan interrupted by user. Exiting...[/bold red]")
+import os
+import sys
+import sqlite3
+import argparse
+from rich.console import Console
+from rich.table import Table
+from rich.panel import Panel
+
+from modules.content_discoverer import ContentDiscoverer, results_path_for
+from modules.async_engine import AsyncContentDiscoverer
+from modules.baseline import DEFAULT_SAMPLE, ScanBaseline
+from modules.cache import DEFAULT_MAX_MB, ResponseCache
+from modules.classifier import ResponseClassifier
+from modules.distributed import DEFAULT_LEASE_SIZE, DEFAULT_LEASE_TIMEOUT, TOKEN_ENV, DistributedScan, parse_address, run_worker
+from modules.extensions import DEFAULT_EXTENSION_SAMPLE
+from modules.output import CONVERTERS, convert_results
+from modules.recursion import DEFAULT_MAX_DEPTH
+from modules.sharding import ShardedScan
+from modules.transport import DEFAULT_H2_CONNECTIONS, DEFAULT_H2_STREAMS, http2_available
+from utils.context import ScanContext
+from utils.wordlist import compile_wordlist, ensure_compiled, read_header
+
+console = Console()
+
+
+reports_dir = "reports"
+
+if not os.path.exists(reports_dir):
+    os.makedirs(reports_dir)
+
+
+def print_banner():
+    banner = """
+██████   █████ ████████ ██   ██ ██    ██ ███    ██ ████████ ███████ ██████  
+██   ██ ██   ██  ██     ██   ██ ██    ██ ████   ██    ██    ██      ██   ██ 
+██████  ███████  ██     ███████ ██    ██ ██ ██  ██    ██    █████   ██████  
+██      ██   ██  ██     ██   ██ ██    ██ ██  ██ ██    ██    ██      ██   ██ 
+██      ██   ██  ██     ██   ██  ██████  ██   ████    ██    ███████ ██   ██ 
+    Advanced Web Content Discovery Tool 
+    """
+    console.print(Panel(banner, style="bold cyan"))
+
+
+def print_scan_summary(url, wordlist, threads, profile, recursion, include_regex, exclude_regex, governor, output_path, formats, plain=False, processes=1):
+    rows = [
+        ("🌍 Target", url),
+        ("📂 Wordlist", wordlist),
+        ("⚙️ Threads", str(threads) if processes == 1 else f"{threads} per process × {processes} processes"),
+        ("🚀 Profile", profile),
+        ("🔁 Recursion", str(recursion)),
+        ("⏱ Rate", f"{governor.rate:g} req/s (adaptive {governor.min_rate:g}-{governor.max_rate:g})"),
+        ("✅ Include Regex", str(include_regex) if include_regex else "None"),
+        ("❌ Exclude Regex", str(exclude_regex) if exclude_regex else "None"),
+        ("💾 Output Base", output_path),
+        ("📄 Formats", ", ".join(formats)),
+    ]
+    if plain:
+        for label, value in rows:
+            print(f"{label.split(' ', 1)[1]}: {value}")
+        return
+
+    summary_table = Table(show_header=False, box=None)
+    for label, value in rows:
+        summary_table.add_row(label, f"[yellow]{value}[/yellow]" if label == "🌍 Target" else value)
+    console.print(Panel(summary_table, title="[bold green]Scan Configuration[/bold green]", border_style="green"))
+
+
+def load_targets(path):
+    """Target URLs from a file: one per line, blank lines and # comments skipped, duplicates dropped."""
+    targets = []
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            url = line.strip()
+            if not url or url.startswith("#"):
+                continue
+            if not url.startswith(("http://", "https://")):
+                raise ValueError(f"{path}:{number}: invalid URL {url!r} (must start with http:// or https://)")
+            if url not in targets:
+                targets.append(url)
+    return targets
+
+
+def builtin_wordlists(base_dir):
+    return {
+        "fast": os.path.join(base_dir, "wordlists", "common.txt"),
+        "balanced": os.path.join(base_dir, "wordlists", "medium.txt"),
+        "deep": os.path.join(base_dir, "wordlists", "large.txt"),
+    }
+
+
+def compile_wordlist_main(argv):
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(
+        prog="main.py compile-wordlist",
+        description="Normalize, dedupe and index wordlists into the compiled .phw format",
+    )
+    parser.add_argument("sources", nargs="*", help="Text wordlists to compile (default: all built-in lists)")
+    parser.add_argument("-o", "--output", help="Output path (single source only; default: <source>.phw)")
+    args = parser.parse_args(argv)
+
+    sources = args.sources or list(builtin_wordlists(BASE_DIR).values())
+    if args.output and len(sources) != 1:
+        parser.error("--output can only be used with a single source")
+
+    for source in sources:
+        if not os.path.isfile(source):
+            console.print(f"[bold red][ERROR][/bold red] Wordlist not found: {source}")
+            exit(1)
+        dest = compile_wordlist(source, args.output)
+        header = read_header(dest)
+        console.print(f"[green]✔[/green] {source} → {dest} ({header['count']} words, sha256 {header['sha256'][:12]})")
+
+
+def convert_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py convert",
+        description="Convert a streamed JSONL result file (written during a scan) to json/csv/txt",
+    )
+    parser.add_argument("source", help="JSONL results file, e.g. scan_results.jsonl (may still be growing)")
+    parser.add_argument("-o", "--output", help="Output base filename (default: source without .jsonl)")
+    parser.add_argument("--format", default="json", help="Comma-separated formats: json,csv,txt or 'all'")
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.source):
+        console.print(f"[bold red][ERROR][/bold red] Results file not found: {args.source}")
+        exit(1)
+
+    formats = [f.strip().lower() for f in args.format.split(",")]
+    if "all" in formats:
+        formats = list(CONVERTERS)
+    unknown = [f for f in formats if f not in CONVERTERS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+
+    base = args.output or os.path.splitext(args.source)[0]
+    paths = {fmt: f"{base}.{fmt}" for fmt in formats}
+    errors = convert_results(args.source, paths)
+    for fmt, path in paths.items():
+        if fmt in errors:
+            console.print(f"[bold red][ERROR][/bold red] {fmt.upper()}: {errors[fmt]}")
+        else:
+            console.print(f"[green]✔[/green] {args.source} → {path}")
+
+
+def replay_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py replay",
+        description="Filter the responses of an earlier scan's --cache again, without sending requests",
+    )
+    parser.add_argument("cache", help="Response cache written by a scan with --cache")
+    parser.add_argument("--status-codes", default=None, help="Comma-separated status codes that count as hits (default: the scan default)")
+    parser.add_argument("--include-regex", help="Only include responses whose body matches this regex")
+    parser.add_argument("--exclude-regex", help="Exclude responses whose body matches this regex")
+    parser.add_argument("--rules", metavar="PATH", help="JSON file of extra content signatures and severity suffixes for the response classifier")
+    parser.add_argument("--no-calibration", action="store_true", help="Ignore the cached soft-404 / wildcard calibration samples")
+    parser.add_argument("-o", "--output", default="replay_results", help="Output base filename (extension auto-added per format)")
+    parser.add_argument("--format", default="json", help="Comma-separated formats: json,csv,txt or 'all' (results always go to <output>.jsonl)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.cache):
+        console.print(f"[bold red][ERROR][/bold red] Cache not found: {args.cache}")
+        exit(1)
+    status_filter = None
+    if args.status_codes:
+        try:
+            status_filter = [int(code) for code in args.status_codes.split(",")]
+        except ValueError:
+            parser.error("--status-codes must be comma-separated integers")
+    try:
+        ResponseClassifier(args.include_regex, args.exclude_regex, args.rules)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        cache = ResponseCache(args.cache)
+    except sqlite3.Error as e:
+        parser.error(f"cannot read cache {args.cache}: {e}")
+
+    discoverer = ContentDiscoverer(
+        context=ScanContext(target_url=None, wordlist_path=None),
+        status_filter=status_filter,
+        include_regex=args.include_regex,
+        exclude_regex=args.exclude_regex,
+        rules_path=args.rules,
+        calibrate=not args.no_calibration,
+        output_path=args.output,
+        formats=args.format,
+        ui=False,
+    )
+    discoverer.replay(cache)
+    cache.close()
+
+
+def worker_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py worker",
+        description="Join a scan started with --coordinator and scan the tasks it leases",
+    )
+    parser.add_argument("coordinator", help="HOST:PORT the coordinator listens on")
+    parser.add_argument("--token", default=os.environ.get(TOKEN_ENV), help=f"Token the coordinator printed or was given (default: ${TOKEN_ENV})")
+    args = parser.parse_args(argv)
+
+    try:
+        address = parse_address(args.coordinator)
+    except ValueError as e:
+        parser.error(str(e))
+    if not args.token:
+        parser.error(f"the coordinator's token is needed: --token or ${TOKEN_ENV}")
+    run_worker(address, args.token)
+
+
+COMMANDS = {
+    "compile-wordlist": compile_wordlist_main,
+    "convert": convert_main,
+    "replay": replay_main,
+    "worker": worker_main,
+}
+
+
+def main():
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
+
+    parser = argparse.ArgumentParser(description="PathHunter - Web Content Discovery Tool")
+    parser.add_argument("url", nargs="?", help="Target URL (must start with http:// or https://)")
+    parser.add_argument("--targets-file", metavar="PATH", help="Scan every URL in PATH (one per line) over one shared worker pool, instead of a single url")
+    parser.add_argument("--per-host-concurrency", type=int, default=None, help="Max tasks queued or running per host in a --targets-file scan (default: an even share of the workers)")
+    parser.add_argument("-w", "--wordlist", help="Path to custom wordlist file (overrides --mode)")
+    parser.add_argument("-t", "--threads", type=int, default=30, help="Number of threads")
+    parser.add_argument("--delay", type=float, default=None, help="Per-thread delay between requests; caps the rate at threads/delay")
+    parser.add_argument("--rate", type=float, default=None, help="Initial target requests/second (default: from --profile)")
+    parser.add_argument("--max-rate", type=float, default=None, help="Ceiling for the adaptive rate governor (default: from --profile)")
+    parser.add_argument("--profile", choices=["stealth", "balanced", "aggressive"], default="balanced", help="Scan profile")
+    parser.add_argument("--recursion", action="store_true", help="Enable recursion into discovered directories")
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_MAX_DEPTH, help="Deepest directory level below the target that recursion scans")
+    parser.add_argument("--extension-sample", type=int, default=0, help=f"Opt in to extension pruning: words per directory probed with every server-side extension before those without a hit are dropped (default 0: never drop; {DEFAULT_EXTENSION_SAMPLE} is a good start)")
+    parser.add_argument("--recursion-budget", type=int, default=None, help="Words tried per discovered directory (default: the whole wordlist)")
+    parser.add_argument("--include-regex", help="Only include responses whose body matches this regex")
+    parser.add_argument("--exclude-regex", help="Exclude responses whose body matches this regex")
+    parser.add_argument("--rules", metavar="PATH", help="JSON file of extra content signatures and severity suffixes for the response classifier")
+    parser.add_argument("--mode", choices=["fast", "balanced", "deep"], default="balanced", help="Scan mode to select wordlist automatically")
+    parser.add_argument("-o", "--output", default="scan_results", help="Output base filename (extension auto-added per format)")
+    parser.add_argument("--format", default="json", help="Comma-separated formats converted at the end: json,csv,txt or 'all' (results always stream to <output>.jsonl)")
+    parser.add_argument("--pool-size", type=int, default=None, help="Keep-alive connections per host pool (default: threads)")
+    parser.add_argument("--session-mode", choices=["thread", "shared"], default="thread", help="One HTTP session per thread, or one shared pool")
+    parser.add_argument("--http2", action="store_true", help="Multiplex probes as HTTP/2 streams over a few connections per https host (hosts without h2 fall back to HTTP/1.1; needs httpcore[http2])")
+    parser.add_argument("--h2-connections", type=int, default=DEFAULT_H2_CONNECTIONS, help="HTTP/2 connections per host for --http2")
+    parser.add_argument("--h2-streams", type=int, default=DEFAULT_H2_STREAMS, help="Max concurrent streams per HTTP/2 connection for --http2")
+    parser.add_argument("--engine", choices=["thread", "async"], default="thread", help="Scan engine: OS threads or a single asyncio event loop")
+    parser.add_argument("--concurrency", type=int, default=None, help="Max in-flight requests for --engine async (default: threads)")
+    parser.add_argument("--probe", choices=["get", "stream", "head"], default="stream", help="Probe mode: full GET, streamed GET reading bodies only when needed, or HEAD first")
+    parser.add_argument("--max-body", type=int, default=512 * 1024, help="Max response body bytes read per probe (stream/head modes)")
+    parser.add_argument("--no-follow-redirects", action="store_true", help="Record 3xx status + Location instead of following redirects")
+    parser.add_argument("--no-calibration", action="store_true", help="Disable soft-404 / wildcard response calibration")
+    parser.add_argument("--calibration-samples", type=int, default=2, help="Random probes per directory and extension when calibrating")
+    parser.add_argument("--dedupe", choices=["exact", "bloom"], default="exact", help="Visited-URL set: exact (hashed keys) or bloom (fixed few bytes per URL, rare false skips)")
+    parser.add_argument("--dedupe-fp-rate", type=float, default=0.0001, help="Max false-positive rate for --dedupe bloom")
+    parser.add_argument("--no-ui", action="store_true", help="Headless mode: no live TUI; hits and periodic progress are printed as plain lines")
+    parser.add_argument("--checkpoint", metavar="STATE", help="Write periodic checkpoints to STATE (plus STATE.visited)")
+    parser.add_argument("--checkpoint-interval", type=float, default=30.0, help="Seconds between checkpoints")
+    parser.add_argument("--resume", metavar="STATE", help="Resume an interrupted scan from its checkpoint (keeps checkpointing to STATE unless --checkpoint is given)")
+    parser.add_argument("--bypass-threads", type=int, default=None, help="Workers for the 403/401 bypass stage (default: a quarter of --threads)")
+    parser.add_argument("--bypass-prune-after", type=int, default=20, help="Stop trying a bypass technique on a host after this many failures")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve live metrics (Prometheus text) on http://127.0.0.1:PORT/metrics during the scan")
+    parser.add_argument("--metrics-file", metavar="PATH", help="Dump a JSON metrics snapshot to PATH periodically and at the end")
+    parser.add_argument("--metrics-interval", type=float, default=10.0, help="Seconds between --metrics-file dumps")
+    parser.add_argument("--results-db", metavar="PATH", default=None, help="Also keep results in an SQLite file indexed by status, severity and directory (for very large result sets)")
+    parser.add_argument("--baseline", metavar="RESULTS", help="Rescan incrementally against the JSONL results of an earlier scan: known hits are revalidated with conditional requests, past misses sampled, and the --format files hold only the changes")
+    parser.add_argument("--baseline-sample", type=float, default=DEFAULT_SAMPLE, help="Share of the past misses probed again with --baseline (words that hit somewhere are always probed)")
+    parser.add_argument("--cache", metavar="PATH", help="Keep every response judged (status, headers, body) in an SQLite cache at PATH, for `main.py replay`")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_MB, help="Max --cache size in MB; the oldest responses are dropped beyond it")
+    parser.add_argument("--coordinator", metavar="HOST:PORT", help="Do not scan here: listen on HOST:PORT (an empty HOST is 127.0.0.1) and lease the scan out to `main.py worker HOST:PORT` processes, on this or other machines")
+    parser.add_argument("--token", default=os.environ.get(TOKEN_ENV), help=f"Shared secret workers must join --coordinator with (default: ${TOKEN_ENV}, else a random one is printed)")
+    parser.add_argument("--lease-size", type=int, default=DEFAULT_LEASE_SIZE, help="Tasks per lease handed to a worker with --coordinator")
+    parser.add_argument("--lease-timeout", type=float, default=DEFAULT_LEASE_TIMEOUT, help="Seconds without a message from a worker before its leases go to other workers")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes, each running its own engine with --threads / --concurrency (e.g. the number of CPU cores)")
+    args = parser.parse_args()
+
+    if args.processes < 1:
+        parser.error("--processes must be at least 1")
+    if args.processes > 1 and (args.checkpoint or args.resume):
+        parser.error("--checkpoint / --resume cannot be combined with --processes")
+    if args.coordinator:
+        if args.processes > 1 or args.checkpoint or args.resume or args.baseline or args.cache:
+            parser.error("--coordinator cannot be combined with --processes, --checkpoint / --resume, --baseline or --cache")
+        try:
+            coordinator_address = parse_address(args.coordinator)
+        except ValueError as e:
+            parser.error(f"--coordinator: {e}")
+        if args.lease_size < 1 or args.lease_timeout <= 0:
+            parser.error("--lease-size must be at least 1 and --lease-timeout positive")
+    if args.max_depth < 1 or (args.recursion_budget is not None and args.recursion_budget < 1):
+        parser.error("--max-depth and --recursion-budget must be at least 1")
+    if args.extension_sample < 0:
+        parser.error("--extension-sample cannot be negative")
+    if args.http2:
+        if args.engine == "async":
+            parser.error("--http2 needs --engine thread")
+        if not http2_available():
+            parser.error("--http2 needs httpcore with HTTP/2 support: pip install 'httpcore[http2]'")
+    if args.h2_connections < 1 or args.h2_streams < 1:
+        parser.error("--h2-connections and --h2-streams must be at least 1")
+    try:
+        ResponseClassifier(args.include_regex, args.exclude_regex, args.rules)
+    except ValueError as e:
+        parser.error(str(e))
+    if not 0 <= args.baseline_sample <= 1:
+        parser.error("--baseline-sample must be between 0 and 1")
+    if args.baseline:
+        if os.path.abspath(args.baseline) == os.path.abspath(results_path_for(args.output)):
+            parser.error(f"--baseline {args.baseline} would be overwritten by this scan's results; rename it or pick another -o")
+        try:
+            ScanBaseline(args.baseline, args.baseline_sample)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot use --baseline {args.baseline}: {e}")
+    if args.cache_size < 1:
+        parser.error("--cache-size must be at least 1")
+    if args.cache:
+        try:
+            ResponseCache(args.cache).close()
+        except sqlite3.Error as e:
+            parser.error(f"cannot use --cache {args.cache}: {e}")
+
+    # Validate URL / targets
+    if bool(args.url) == bool(args.targets_file):
+        parser.error("give either a url or --targets-file")
+    if args.targets_file:
+        try:
+            targets = load_targets(args.targets_file)
+        except (OSError, ValueError) as e:
+            console.print(f"[bold red][ERROR][/bold red] {e}")
+            exit(1)
+        if not targets:
+            console.print(f"[bold red][ERROR][/bold red] No targets in {args.targets_file}")
+            exit(1)
+    else:
+        targets = [args.url]
+    if not args.url:
+        args.url = targets[0]
+    if not args.url.startswith(("http://", "https://")):
+        console.print("[bold red][ERROR][/bold red] Invalid URL. It must start with http:// or https://")
+        exit(1)
+    target_label = args.url if len(targets) == 1 else f"{len(targets)} targets from {args.targets_file}"
+
+    # Map modes to wordlist files
+    wordlist_map = builtin_wordlists(BASE_DIR)
+
+    # Determine wordlist
+    if args.wordlist:
+        wordlist_path = args.wordlist
+        if not os.path.isabs(wordlist_path):
+            wordlist_path = os.path.join(BASE_DIR, wordlist_path)
+    else:
+        wordlist_path = wordlist_map.get(args.mode, wordlist_map["balanced"])
+
+    # Check wordlist exists
+    if not os.path.isfile(wordlist_path):
+        console.print(f"[bold red][ERROR][/bold red] Wordlist not found: {wordlist_path}")
+        exit(1)
+
+    # Built-in lists are scanned from their compiled form (rebuilt when the text changes)
+    scan_wordlist_path = wordlist_path
+    if not args.wordlist:
+        try:
+            scan_wordlist_path = ensure_compiled(wordlist_path)
+        except OSError as e:
+            console.print(f"[yellow][WARN][/yellow] Could not compile {wordlist_path} ({e}); using text form")
+
+    # Normalize formats
+    formats = [f.strip().lower() for f in args.format.split(",")]
+    if "all" in formats:
+        formats = ["json", "csv", "txt"]
+
+    # Init scan context
+    context = ScanContext(target_url=args.url, wordlist_path=wordlist_path, targets=targets, store_path=args.results_db)
+
+    # Build discoverer
+    engine_kwargs = {}
+    if args.engine == "async":
+        discoverer_cls = AsyncContentDiscoverer
+        engine_kwargs["concurrency"] = args.concurrency
+    else:
+        discoverer_cls = ContentDiscoverer
+
+    discoverer_kwargs = dict(
+        threads=args.threads,
+        delay=args.delay,
+        profile=args.profile,
+        extension_sample=args.extension_sample,
+        recursion=args.recursion,
+        max_depth=args.max_depth,
+        recursion_budget=args.recursion_budget,
+        include_regex=args.include_regex,
+        exclude_regex=args.exclude_regex,
+        rules_path=args.rules,
+        output_path=args.output,
+        formats=formats,
+        verify_ssl=True,  # adjust or expose flag
+        pool_size=args.pool_size,
+        session_mode=args.session_mode,
+        http2=args.http2,
+        h2_connections=args.h2_connections,
+        h2_streams=args.h2_streams,
+        calibrate=not args.no_calibration,
+        calibration_samples=args.calibration_samples,
+        rate=args.rate,
+        max_rate=args.max_rate,
+        probe_mode=args.probe,
+        max_body=args.max_body,
+        follow_redirects=not args.no_follow_redirects,
+        checkpoint_path=args.checkpoint,
+        checkpoint_interval=args.checkpoint_interval,
+        resume_path=args.resume,
+        dedupe=args.dedupe,
+        dedupe_fp_rate=args.dedupe_fp_rate,
+        ui=not args.no_ui,
+        bypass_threads=args.bypass_threads,
+        bypass_prune_after=args.bypass_prune_after,
+        per_host_concurrency=args.per_host_concurrency,
+        metrics_port=args.metrics_port,
+        metrics_path=args.metrics_file,
+        metrics_interval=args.metrics_interval,
+        baseline_path=args.baseline,
+        baseline_sample=args.baseline_sample,
+        cache_path=args.cache,
+        cache_max_mb=args.cache_size,
+        **engine_kwargs,
+    )
+    discoverer = discoverer_cls(context=context, **discoverer_kwargs)
+    # --processes: shards run in worker processes; this discoverer collects and reports for them
+    # (--coordinator likewise, for workers that connect over TCP)
+    if args.coordinator:
+        scan = DistributedScan(
+            discoverer, coordinator_address, discoverer_kwargs, args.lease_size, args.lease_timeout, args.token
+        )
+    elif args.processes > 1:
+        scan = ShardedScan(discoverer, args.processes, discoverer_kwargs)
+    else:
+        scan = discoverer
+
+    if not args.no_ui:
+        print_banner()
+    print_scan_summary(
+        target_label,
+        wordlist_path,
+        discoverer.threads,
+        args.profile,
+        args.recursion,
+        args.include_regex,
+        args.exclude_regex,
+        discoverer.governor,
+        args.output,
+        formats,
+        plain=args.no_ui,
+        processes=args.processes,
+    )
+
+    # Headless runs stay plain text (no Rich markup / live rendering) for CI logs
+    say = print if args.no_ui else console.print
+    say(f"\n🚀 Starting {args.mode.upper()} scan on: {target_label}")
+    say(f"📂 Using wordlist: {wordlist_path}\n")
+
+    scan.run(targets[0] if len(targets) == 1 else targets, scan_wordlist_path)
+
+    # Show where files went
+    base = os.path.abspath(args.output)
+    got = ", ".join(formats)
+    if args.baseline and not discoverer.saved:
+        outcome = f"No changes since the baseline {args.baseline}"
+    else:
+        outcome = f"Results saved (formats: {got}) with base: {base}"
+    if args.no_ui:
+        print(f"\nScan complete! {outcome}")
+    else:
+        console.print(f"\n✅ [bold green]Scan complete! {outcome}[/bold green]")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        console.print("\n⚠️ [bold red]Scan interrupted by user. Exiting...[/bold red]")
@@ -0,0 +1,370 @@
+import asyncio
+import os
+import time
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import aiohttp
+except ImportError:  # optional: only needed for --engine async
+    aiohttp = None
+
+from modules.baseline import without_conditionals
+from modules.content_discoverer import DRAIN_LIMIT, HEAD_UNSUPPORTED, SCHEDULER_IDLE, ContentDiscoverer
+from modules.transport import MAX_REDIRECTS, REDIRECT_CODES, ProbeResult
+from utils.logger import log_error
+
+
+# --------------------------------------------------------------------------- #
+# AsyncContentDiscoverer
+# --------------------------------------------------------------------------- #
+class AsyncContentDiscoverer(ContentDiscoverer):
+    """
+    asyncio variant of ContentDiscoverer.
+
+    Runs the same path/extension expansion, filters, bypass logic and result
+    collection as the threaded engine, but on a single event loop with an
+    aiohttp client. A semaphore bounds the number of in-flight requests, so
+    `concurrency` can go into the thousands without one OS thread each.
+    """
+
+    def __init__(self, *args, concurrency: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.concurrency = max(1, concurrency or self.threads)
+        self._session = None
+        self._semaphore = None
+        self._calibration_locks = {}
+        self._redirect_locks = [asyncio.Lock() for _ in range(64)]
+
+    def _task_slots(self):
+        # a task fans out into one request per target (word/ + every extension)
+        return max(1, self.concurrency // (1 + len(self.extensions)))
+
+    # ------------------------------------------------------------------ #
+    # HTTP
+    # ------------------------------------------------------------------ #
+    def _proxy_for(self, url):
+        if not self.proxies:
+            return None
+        return self.proxies.get(urlsplit(url).scheme)
+
+    async def send_request_async(self, url, extra_headers=None, want_body=None):
+        """Async counterpart of send_request (same probe modes and body cap)."""
+        headers = self._request_headers(extra_headers)
+        async with self._semaphore:
+            started = time.monotonic()
+            try:
+                status, content, location, response_headers = await self._fetch_async(
+                    url, headers, self._hop_body_policy(want_body)
+                )
+                if location and self.follow_redirects:
+                    status, content = await self._resolve_redirect_async(
+                        urljoin(url, location), without_conditionals(headers)
+                    )
+                    location, response_headers = None, None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._governor_for(url).record(error=True)
+                self.metrics.error(e)
+                log_error(f"Request error for {url}: {e!r}")
+                return ProbeResult(None, None, url, None)
+        self._governor_for(url).record(status, time.monotonic() - started)
+        self.metrics.count("responses", status)
+        return ProbeResult(status, content, url, location, response_headers)
+
+    async def _fetch_async(self, url, headers, want_body):
+        proxy = self._proxy_for(url)
+
+        if self.probe_mode == "head" and want_body is not None:
+            async with self._session.head(url, headers=headers, allow_redirects=False, proxy=proxy) as response:
+                self._observe_headers(url, response.headers)
+                status = response.status
+                location = self._location(status, response.headers)
+            if status not in HEAD_UNSUPPORTED and not want_body(status):
+                return status, "", location, response.headers
+
+        async with self._session.get(url, headers=headers, allow_redirects=False, proxy=proxy) as response:
+            self._observe_headers(url, response.headers)
+            status = response.status
+            location = self._location(status, response.headers)
+            started = time.perf_counter()
+            try:
+                if self.probe_mode == "get":
+                    return status, await response.text(errors="replace"), location, response.headers
+                if want_body is not None and not want_body(status):
+                    await self._discard_body_async(response)
+                    return status, "", location, response.headers
+                return status, await self._read_capped_async(response), location, response.headers
+            finally:
+                self.metrics.observe("body", time.perf_counter() - started)
+
+    def _trace_config(self):
+        """aiohttp request hooks feeding the connect / ttfb phases (like HttpTransport does)."""
+        metrics = self.metrics
+
+        async def on_request_start(session, ctx, params):
+            ctx.started = time.perf_counter()
+            ctx.connect = 0.0
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_started = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params):
+            ctx.connect += time.perf_counter() - ctx.connect_started
+
+        async def on_request_end(session, ctx, params):
+            # fired once the response headers are in, before the body is read
+            metrics.count("requests")
+            if ctx.connect:
+                metrics.observe("connect", ctx.connect)
+            metrics.observe("ttfb", max(0.0, time.perf_counter() - ctx.started - ctx.connect))
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+    async def _resolve_redirect_async(self, target, headers):
+        cached = self.redirect_cache.get(target)
+        if cached is not None:
+            return cached
+        async with self._redirect_locks[hash(target) % len(self._redirect_locks)]:
+            cached = self.redirect_cache.get(target)
+            if cached is not None:
+                return cached
+            result = await self._follow_chain_async(target, headers)
+            self.redirect_cache.put(target, result)
+            return result
+
+    async def _follow_chain_async(self, target, headers):
+        status, content = None, None
+        for _ in range(MAX_REDIRECTS):
+            status, content, location, _ = await self._fetch_async(target, headers, lambda s: s not in REDIRECT_CODES)
+            if not location:
+                break
+            target = urljoin(target, location)
+            cached = self.redirect_cache.get(target)
+            if cached is not None:
+                return cached
+        return status, content
+
+    async def _read_capped_async(self, response):
+        chunks = []
+        size = 0
+        while size < self.max_body:
+            chunk = await response.content.read(self.max_body - size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        if not response.content.at_eof():
+            response.close()  # rest of the body is not wanted; drop the connection
+        return self._decode_body(b"".join(chunks), response.charset)
+
+    @staticmethod
+    async def _discard_body_async(response):
+        length = response.content_length
+        if length is not None and length <= DRAIN_LIMIT:
+            await response.read()
+        else:
+            response.close()
+
+    async def _paced_request_async(self, url, extra_headers=None, want_body=None):
+        await asyncio.sleep(self._next_delay(url))
+        return await self.send_request_async(url, extra_headers=extra_headers, want_body=want_body)
+
+    # ------------------------------------------------------------------ #
+    # Bypass stage
+    # ------------------------------------------------------------------ #
+    async def _bypass_probe_async(self, job):
+        if not self.bypass_tracker.should_try(job.url, job.technique):
+            return
+        started = time.perf_counter()
+        response = await self._paced_request_async(
+            job.probe_url, extra_headers=job.headers, want_body=self._bypass_want_body(job)
+        )
+        self._cache_response("bypass", job.url, job.label, response, variant=job.technique)
+        self._finish_bypass(job, response.status, response.content)
+        self.metrics.observe("bypass", time.perf_counter() - started)
+
+    async def _bypass_worker_async(self):
+        while True:
+            job = await self.bypass_queue.get()
+            try:
+                await self._bypass_probe_async(job)
+            except Exception as e:
+                self.metrics.error(e)
+                log_error(f"Bypass probe failed for {job.probe_url}: {e}")
+            except asyncio.CancelledError:
+                # interrupted: the url stays in pending_bypass, so a resumed scan redoes it
+                self.bypass_queue.task_done()
+                raise
+            self._bypass_done(job)
+            self.bypass_queue.task_done()
+
+    # ------------------------------------------------------------------ #
+    # Probing
+    # ------------------------------------------------------------------ #
+    async def _ensure_calibrated_async(self, directory):
+        if not self._calibration_needed(directory):
+            return
+        lock = self._calibration_locks.setdefault(directory, asyncio.Lock())
+        async with lock:
+            if self.calibrator.is_calibrated(directory):
+                return
+            probes = self.calibrator.probes(directory)
+            responses = await asyncio.gather(*(self._paced_request_async(url) for _, url in probes))
+            for (kind, _), response in zip(probes, responses):
+                self._cache_response("calibration", directory, kind, response)
+                self.calibrator.learn(directory, kind, response.status, response.content, response.url, response.location)
+            self.calibrator.finish(directory)
+
+    async def _probe_async(self, directory, target, full_url):
+        response = await self._paced_request_async(
+            full_url,
+            extra_headers=self._conditional_headers(full_url),
+            want_body=lambda s: s in self.status_filter and self._body_matters(directory, s),
+        )
+        self._cache_response("probe", directory, target, response)
+        status, content, _, location, headers = response
+
+        if not self._not_modified(directory, target, full_url, status):
+            verdict = self._accept_response(directory, target, full_url, status, content, location)
+            if verdict is not None:
+                if status in (403, 401):
+                    self._queue_bypass(full_url)
+                self._finish_hit(directory, target, full_url, status, verdict, location, headers)
+
+        self._url_done(full_url)
+
+    async def _process_path_async(self, base_url, path):
+        directory = self._scan_directory(base_url)
+        pending = self._pending_targets(base_url, path)
+        if pending:
+            await self._ensure_calibrated_async(directory)
+
+        # a failing probe must not leave its siblings running past the task's completion
+        outcomes = await asyncio.gather(
+            *(self._probe_async(directory, target, full_url) for target, full_url in pending), return_exceptions=True
+        )
+        for (_, full_url), outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                self._probe_failed(full_url, outcome)
+
+    async def _worker_async(self):
+        while True:
+            base_url, path, index, queued = await self.task_queue.get()
+            self.metrics.observe("queue_wait", time.perf_counter() - queued)
+            try:
+                await self._process_path_async(base_url, path)
+            except Exception as e:
+                self.metrics.error(e)
+                log_error(f"Error processing {path}: {e}")
+            except asyncio.CancelledError:
+                # interrupted mid-task: left pending, so a resumed scan redoes it
+                self.task_queue.task_done()
+                raise
+            self._complete_task(base_url, path, index)
+            self._drain_overflow()
+            self.task_queue.task_done()
+
+    async def _feed_async(self, tasks):
+        """Stream tasks into the bounded queue; `put` suspends while it is full."""
+        try:
+            for task in tasks:
+                if task is None:
+                    await asyncio.sleep(SCHEDULER_IDLE)  # every batch-scan host is at its cap
+                    continue
+                base_url, path, index = task
+                with self.total_tasks_lock:
+                    self.total_tasks += 1
+                self._drain_overflow()
+                await self.task_queue.put((base_url, path, index, time.perf_counter()))
+        finally:
+            self.feed_done.set()
+
+    async def _update_progress(self, task_id):
+        while True:
+            completed, total, _ = self._progress_state()
+            self._update_view(task_id, completed, total)
+            self._drain_overflow()
+            self.results.poll()
+            self._checkpoint(force=False)
+            self._poll_metrics()
+            await asyncio.sleep(0.5)
+
+    # ------------------------------------------------------------------ #
+    # Run scan
+    # ------------------------------------------------------------------ #
+    async def _run_async(self, base_url, wordlist_path):
+        self.task_queue = asyncio.Queue(maxsize=self.queue_size)
+        self.bypass_queue = asyncio.Queue()
+
+        targets = [base_url] if isinstance(base_url, str) else list(base_url)
+        words = self._plan(targets, wordlist_path)
+        start = self._start_outputs(targets, wordlist_path, words)
+        if start is None:
+            return
+        task_id = self.progress_bar.add_task("Scanning", total=self.estimated_tasks)
+
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            ssl=None if self.verify_ssl else False,
+        )
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout, trace_configs=[self._trace_config()]
+        ) as session:
+            self._session = session
+            # Each worker fans a word out into concurrent probes; the
+            # semaphore, not the worker count, bounds in-flight requests.
+            workers = [asyncio.create_task(self._worker_async()) for _ in range(self.concurrency)]
+            workers += [asyncio.create_task(self._bypass_worker_async()) for _ in range(self.bypass_threads)]
+            progress = asyncio.create_task(self._update_progress(task_id))
+
+            with self._live_view(task_id):
+                finished = False
+                try:
+                    await self._feed_async(self._tasks(targets, wordlist_path, start))
+                    # recursion parked in overflow re-enters the queue as it drains
+                    # bypass probes never queue discovery work, so it is drained last
+                    while True:
+                        await self.task_queue.join()
+                        self._drain_overflow()
+                        if self.task_queue.empty():
+                            await self.bypass_queue.join()
+                            break
+                    finished = True
+                finally:
+                    for task in workers + [progress]:
+                        task.cancel()
+                    await asyncio.gather(*workers, progress, return_exceptions=True)
+                    completed, total, _ = self._progress_state()
+                    self._update_view(task_id, completed, total, final=True)
+                    self._close_checkpoints(finished)
+
+    def _report_transport_stats(self):
+        pass  # requests go through aiohttp here, not HttpTransport
+
+    def run(self, base_url, wordlist_path):
+        if aiohttp is None:
+            log_error("The async engine requires aiohttp (pip install aiohttp).")
+            return
+
+        if not os.path.exists(wordlist_path):
+            log_error(f"Wordlist not found: {wordlist_path}")
+            return
+
+        self._start_metrics()
+        try:
+            asyncio.run(self._run_async(base_url, wordlist_path))
+        except KeyboardInterrupt:
+            self.shutdown_event.set()
+
+        self._report_stats()
+        self._stop_metrics()
+
+        # save data
+        self._save_all_formats()
@@ -0,0 +1,164 @@
+import random
+from collections import Counter
+from urllib.parse import urljoin, urlsplit
+
+from modules.calibration import directory_of
+from modules.output import iter_results
+
+DEFAULT_SAMPLE = 0.1  # share of past misses probed again
+
+# Response headers a result keeps so the next scan can revalidate it
+VALIDATOR_HEADERS = (("ETag", "etag"), ("Last-Modified", "last_modified"))
+CONDITIONAL_HEADERS = {"etag": "If-None-Match", "last_modified": "If-Modified-Since"}
+
+# Fields whose change makes a known result "changed" (etag / last_modified
+# only count when the baseline has them: older result files do not)
+COMPARED_FIELDS = ("status", "severity", "location", "signatures")
+VALIDATOR_FIELDS = ("etag", "last_modified")
+
+
+def validators_of(headers):
+    """{"etag": ..., "last_modified": ...} from response headers (only those present), or None."""
+    found = {field: headers[header] for header, field in VALIDATOR_HEADERS if header in headers}
+    return found or None
+
+
+def without_conditionals(headers):
+    """headers minus If-None-Match / If-Modified-Since (a followed redirect is not revalidated)."""
+    return {key: value for key, value in headers.items() if key not in CONDITIONAL_HEADERS.values()}
+
+
+def result_identity(result):
+    """A result's key across scans: its URL, plus the bypass technique for bypass results."""
+    return result["url"], result.get("bypass")
+
+
+def split_target(url):
+    """(directory, target) of a result URL: ("https://h/a/", "admin/") for https://h/a/admin/."""
+    directory = directory_of(url.rstrip("/"))
+    return directory, url[len(directory):]
+
+
+def _word_of(target):
+    return target[:-1] if target.endswith("/") else target.rsplit(".", 1)[0]
+
+
+# --------------------------------------------------------------------------- #
+# ScanBaseline
+# --------------------------------------------------------------------------- #
+class ScanBaseline:
+    """
+    The results of an earlier scan of the same targets (its JSONL file),
+    for an incremental rescan.
+
+    Known hits are probed again with If-None-Match / If-Modified-Since
+    from their recorded validators; a 304 carries the old result forward
+    without a body. In a directory where the baseline found something,
+    the rest of the wordlist was a miss last time, so only part of it is
+    probed again: every variant of a word that hit anywhere in the
+    baseline, plus a random `sample` of the other words (a new draw every
+    run, so repeated rescans cover different words). Directories the
+    baseline has no hits in are scanned in full.
+
+    `diff` compares the new results with the old ones: new, changed, and
+    gone (only for known results whose URL was probed again this time).
+    """
+
+    def __init__(self, path, sample: float = DEFAULT_SAMPLE):
+        self.path = path
+        self.sample = sample
+        self._results = {}  # identity -> result
+        self._urls = set()  # URLs of every result, bypass probes included
+        self._by_url = {}  # URL -> result (wordlist hits, not bypass results)
+        self._targets = {}  # directory -> targets hit there
+        self._words = set()  # words with a hit anywhere
+        self.checked = set()  # known URLs probed this scan
+        self.changes = Counter()
+
+        for result in iter_results(path):
+            if not isinstance(result, dict) or not isinstance(result.get("url"), str):
+                raise ValueError(f"{path}: not a results file (every line must be a result with a 'url')")
+            self._results[result_identity(result)] = result
+            self._urls.add(result["url"])
+            if result.get("bypass"):
+                continue
+            self._by_url[result["url"]] = result
+            directory, target = split_target(result["url"])
+            self._targets.setdefault(directory, set()).add(target)
+            # the word that found it, scanned from its own directory or a parent
+            # (a word like ".well-known/security.txt" spans directories)
+            while True:
+                self._words.add(_word_of(target))
+                if urlsplit(directory).path in ("", "/"):
+                    break
+                directory, parent = split_target(directory)
+                target = parent + target
+
+    def __len__(self):
+        return len(self._results)
+
+    def previous(self, url):
+        """The baseline result of a wordlist hit at url, or None."""
+        return self._by_url.get(url)
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since for a known hit with validators, else None."""
+        previous = self._by_url.get(url)
+        if previous is None:
+            return None
+        headers = {header: previous[field] for field, header in CONDITIONAL_HEADERS.items() if previous.get(field)}
+        return headers or None
+
+    def select(self, directory, word, targets, extensions):
+        """
+        The targets (word + "/" or word.ext) of word to probe in directory.
+        Returns (targets, number of past misses skipped).
+        """
+        if directory not in self._targets:
+            return targets, 0  # nothing found here last time: not a past miss
+        # known hits are always probed, also with an extension that pruning dropped
+        # (matched by URL: a word with a "/" hits below directory)
+        candidates = [word + "/"] + [f"{word}.{ext}" for ext in extensions]
+        hits = [t for t in candidates if urljoin(directory, t) in self._by_url]
+        if word in self._words or random.random() < self.sample:
+            return targets + [t for t in hits if t not in targets], 0
+        return hits, sum(1 for t in targets if urljoin(directory, t) not in self._by_url)
+
+    def check(self, url):
+        """url was probed this scan (its known results can be reported gone)."""
+        if url in self._urls:
+            self.checked.add(url)
+
+    def diff(self, results):
+        """
+        Change records for results (the new scan, in order): new and changed
+        ones first, then the known results that are gone. Every record is a
+        result plus "change", and "previous_<field>" for changed fields.
+        Counts go to self.changes.
+        """
+        self.changes = Counter()
+        seen = set()
+        for result in results:
+            key = result_identity(result)
+            seen.add(key)
+            previous = self._results.get(key)
+            if previous is None:
+                self.changes["new"] += 1
+                yield {"change": "new", **result}
+                continue
+            fields = COMPARED_FIELDS + tuple(f for f in VALIDATOR_FIELDS if previous.get(f))
+            changed = {f"previous_{f}": previous.get(f) for f in fields if previous.get(f) != result.get(f)}
+            if changed:
+                self.changes["changed"] += 1
+                yield {"change": "changed", **result, **changed}
+            else:
+                self.changes["unchanged"] += 1
+
+        for key, previous in self._results.items():
+            if key in seen:
+                continue
+            if previous["url"] in self.checked:
+                self.changes["gone"] += 1
+                yield {"change": "gone", **previous}
+            else:
+                self.changes["unchecked"] += 1
@@ -0,0 +1,117 @@
+import threading
+from collections import Counter, namedtuple
+from urllib.parse import urlsplit
+
+from modules.calibration import directory_of
+
+DEFAULT_PRUNE_AFTER = 20  # failures on one host (and no success) before a technique is dropped there
+PREFIX_FAILURES = 3  # failures under one directory (and no success) before it is skipped there
+
+# One queued bypass probe. technique identifies the trick (for pruning),
+# label is what results record in their "bypass" field.
+BypassJob = namedtuple("BypassJob", "url probe_url headers technique label")
+
+
+def _last_segment(url):
+    """(prefix, name) of the last path segment, ignoring one trailing slash."""
+    trimmed = url[:-1] if url.endswith("/") else url
+    cut = trimmed.rfind("/") + 1
+    return url[:cut], trimmed[cut:]
+
+
+def bypass_candidates(url):
+    """(probe_url, extra_headers, technique, label) for every bypass trick on url."""
+    prefix, name = _last_segment(url)
+    rest = url[len(prefix) + len(name):]
+
+    path_tricks = [
+        ("dot", url + "."),
+        ("slash", url + "/"),
+    ]
+    if urlsplit(url).path.strip("/"):  # the site root has no segment to mangle
+        path_tricks += [
+            ("encoded-slash", f"{prefix}{name}%2f{rest}"),
+            ("segment-slash", f"{prefix}{name}/{rest}"),
+            ("dot-dot-semicolon", f"{prefix}{name}..;/{rest}"),
+            ("semicolon", f"{prefix}{name};/{rest}"),
+        ]
+
+    header_payloads = [
+        {"X-Original-URL": url},
+        {"X-Rewrite-URL": url},
+        {"X-Custom-IP-Authorization": "127.0.0.1"},
+        {"X-Forwarded-For": "127.0.0.1"},
+        {"X-Forwarded-Host": "127.0.0.1"},
+        {"Referer": url},
+    ]
+
+    # Path tricks, then header tricks
+    candidates = [(probe_url, None, f"path:{trick}", "path") for trick, probe_url in path_tricks]
+    for headers in header_payloads:
+        header = next(iter(headers))
+        candidates.append((url, headers, f"header:{header}", header))
+    return candidates
+
+
+# --------------------------------------------------------------------------- #
+# BypassTracker
+# --------------------------------------------------------------------------- #
+class BypassTracker:
+    """
+    Which bypass techniques are still worth sending, and where.
+
+    Outcomes are counted per (parent directory, technique) and per (host,
+    technique). A technique that failed PREFIX_FAILURES times under one
+    directory is skipped for the rest of that directory, so a directory
+    that is forbidden everywhere costs a few probes instead of twelve per
+    child; one that failed prune_after times on a host is dropped for the
+    whole host. A technique that worked once is never skipped there.
+    """
+
+    def __init__(self, prune_after: int = DEFAULT_PRUNE_AFTER, prefix_failures: int = PREFIX_FAILURES):
+        self.prune_after = prune_after
+        self.prefix_failures = prefix_failures
+        self._lock = threading.Lock()
+        self._failures = Counter()  # (scope, technique) -> failures
+        self._worked = set()  # (scope, technique) that succeeded at least once
+        self.pruned = []  # (host, technique), in pruning order
+        self.probes = 0
+        self.successes = 0
+        self.skipped = 0
+
+    @staticmethod
+    def _scopes(url):
+        return ("dir", directory_of(url.rstrip("/"))), ("host", urlsplit(url).netloc)
+
+    def _blocked(self, key, limit):
+        return key not in self._worked and self._failures[key] >= limit
+
+    def should_try(self, url, technique):
+        directory, host = self._scopes(url)
+        with self._lock:
+            if self._blocked((host, technique), self.prune_after) or self._blocked((directory, technique), self.prefix_failures):
+                self.skipped += 1
+                return False
+            return True
+
+    def record(self, url, technique, success):
+        directory, host = self._scopes(url)
+        with self._lock:
+            self.probes += 1
+            if success:
+                self.successes += 1
+                self._worked.update({(directory, technique), (host, technique)})
+                return
+            self._failures[directory, technique] += 1
+            self._failures[host, technique] += 1
+            if self._failures[host, technique] == self.prune_after and (host, technique) not in self._worked:
+                self.pruned.append((host[1], technique))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "probes": self.probes,
+                "successes": self.successes,
+                "skipped": self.skipped,
+                "pruned": list(self.pruned),
+            }
@@ -0,0 +1,133 @@
+import json
+import sqlite3
+import threading
+import zlib
+from collections import namedtuple
+
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_MAX_MB = 512
+BODY_CAP = 128 * 1024  # body bytes kept per response
+BATCH_SIZE = 256  # responses buffered before an INSERT
+EVICT_TO = 0.9  # an over-full cache drops its oldest responses down to this share
+COMPRESS_LEVEL = 1
+BUSY_TIMEOUT = 30.0  # seconds a shard process waits for another one's write
+
+# Roles: "probe" (a wordlist target; source = directory, detail = target),
+# "calibration" (source = directory, detail = target kind) and "bypass"
+# (source = the 403/401 URL, detail = the label results record)
+CachedResponse = namedtuple("CachedResponse", "role url variant source detail status location headers content")
+
+
+# --------------------------------------------------------------------------- #
+# ResponseCache
+# --------------------------------------------------------------------------- #
+class ResponseCache:
+    """
+    On-disk response cache (SQLite), keyed by URL and request variant (a
+    header bypass probes the same URL as the plain probe). Each entry keeps
+    the status, the headers and the body (cut at BODY_CAP bytes), both
+    zlib-compressed, plus what the engine needs to judge it again.
+
+    Writes are buffered and inserted in batches. Triggers keep the total
+    entry size in the file itself, so shard processes writing the same
+    cache share one budget: past max_bytes the oldest entries (by last
+    write) are dropped. A newer response to the same request replaces the
+    cached one.
+    """
+
+    def __init__(self, path, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stored = 0
+        self.evicted = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        # REPLACE only fires the delete trigger with recursive triggers on
+        self._db.execute("PRAGMA recursive_triggers = ON")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT, variant TEXT, role TEXT, source TEXT, detail TEXT,
+                status INTEGER, location TEXT, headers BLOB, body BLOB, size INTEGER,
+                PRIMARY KEY (url, variant)
+            );
+            CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER);
+            INSERT OR IGNORE INTO cache_size VALUES (0, 0);
+            CREATE TRIGGER IF NOT EXISTS responses_added AFTER INSERT ON responses
+                BEGIN UPDATE cache_size SET bytes = bytes + new.size; END;
+            CREATE TRIGGER IF NOT EXISTS responses_removed AFTER DELETE ON responses
+                BEGIN UPDATE cache_size SET bytes = bytes - old.size; END;
+            """
+        )
+
+    def put(self, role, url, variant, source, detail, status, location, headers, content):
+        headers = zlib.compress(json.dumps(list(headers.items()) if headers else []).encode(), COMPRESS_LEVEL)
+        body = zlib.compress((content or "").encode("utf-8")[:BODY_CAP], COMPRESS_LEVEL)
+        size = len(url) + len(source) + len(detail) + len(headers) + len(body)
+        with self._lock:
+            self._pending.append((url, variant, role, source, detail, status, location, headers, body, size))
+            self.stored += 1
+            if len(self._pending) < BATCH_SIZE:
+                return
+            rows, self._pending = self._pending, []
+        self._write(rows)
+
+    def flush(self):
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if rows:
+            self._write(rows)
+
+    def _write(self, rows):
+        with self._db_lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            total = self._db.execute("SELECT bytes FROM cache_size").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(total - int(self.max_bytes * EVICT_TO))
+
+    def _evict(self, excess):
+        """Drop the oldest entries holding at least `excess` bytes (inside the write transaction)."""
+        freed, last = 0, None
+        rows = self._db.execute("SELECT rowid, size FROM responses ORDER BY rowid")
+        for rowid, size in rows:
+            freed += size
+            last = rowid
+            if freed >= excess:
+                break
+        rows.close()
+        if last is not None:
+            self.evicted += self._db.execute("DELETE FROM responses WHERE rowid <= ?", (last,)).rowcount
+
+    def records(self, role):
+        """Cached responses of one role, oldest first (CachedResponse, decompressed)."""
+        self.flush()
+        # a connection of its own, so rows stream while others are written
+        db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        try:
+            query = (
+                "SELECT role, url, variant, source, detail, status, location, headers, body"
+                " FROM responses WHERE role = ? ORDER BY rowid"
+            )
+            for row in db.execute(query, (role,)):
+                headers = CaseInsensitiveDict(json.loads(zlib.decompress(row[7])))
+                content = zlib.decompress(row[8]).decode("utf-8", errors="ignore")
+                yield CachedResponse(*row[:7], headers, content)
+        finally:
+            db.close()
+
+    def stats(self):
+        """Responses stored / evicted by this process; entries and bytes of the whole file."""
+        self.flush()
+        with self._db_lock:
+            total = self._db.execute("SELECT bytes FROM cache_size").fetchone()[0]
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"stored": self.stored, "evicted": self.evicted, "entries": entries, "bytes": total}
+
+    def close(self):
+        self.flush()
+        with self._db_lock:
+            self._db.close()
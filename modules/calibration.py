@@ -0,0 +1,195 @@
+import hashlib
+import threading
+import uuid
+from collections import namedtuple
+from urllib.parse import urljoin
+
+# --------------------------------------------------------------------------- #
+# Fingerprints
+# --------------------------------------------------------------------------- #
+ResponseFingerprint = namedtuple("ResponseFingerprint", "status length words lines body_hash")
+
+DIRECTORY_KIND = "/"
+
+
+def body_hash(content):
+    return hashlib.sha1(content.encode("utf-8", "replace")).hexdigest()
+
+
+def fingerprint(status, content):
+    content = content or ""
+    return ResponseFingerprint(
+        status=status,
+        length=len(content),
+        words=len(content.split()),
+        lines=content.count("\n") + 1,
+        body_hash=body_hash(content),
+    )
+
+
+def target_kind(target):
+    """'/' for directory probes, else the extension ('php', 'bak', ...) or ''."""
+    if target.endswith("/"):
+        return DIRECTORY_KIND
+    name = target.rsplit("/", 1)[-1]
+    return name.rsplit(".", 1)[-1].lower() if "." in name else ""
+
+
+def directory_of(url):
+    """Parent directory URL of url (a directory URL's parent is itself)."""
+    if url.endswith("/"):
+        return url
+    return url[: url.rfind("/") + 1]
+
+
+def location_kind(url, location):
+    """What a redirect points at: DIRECTORY_KIND for "add a slash", else the absolute target (None: no redirect)."""
+    if not location:
+        return None
+    target = urljoin(url or "", location)
+    return DIRECTORY_KIND if url and target == url + "/" else target
+
+
+UNSTABLE = object()  # location kind that differed across calibration samples
+
+
+class Baseline:
+    """
+    What a wildcard response of one status looks like. Only fields that were
+    identical across all calibration samples are used for matching: with
+    the same kind of redirect (or none), the same body (hash), length or
+    word / line count. With no stable field at all (a fully dynamic
+    catch-all) the baseline is unusable and filters nothing: the status
+    alone would drop every real page that shares it.
+    """
+
+    __slots__ = ("status", "length", "words_lines", "body_hash", "location")
+
+    def __init__(self, samples, locations):
+        self.status = samples[0].status
+        self.length = _stable(s.length for s in samples)
+        self.words_lines = _stable((s.words, s.lines) for s in samples)
+        self.body_hash = _stable(s.body_hash for s in samples)
+        locations = set(locations)
+        self.location = locations.pop() if len(locations) == 1 else UNSTABLE
+
+    @property
+    def usable(self):
+        stable = self.length is not None or self.words_lines is not None or self.body_hash is not None
+        return stable and self.location is not UNSTABLE
+
+    def matches(self, content, location=None):
+        if location != self.location:
+            return False  # a redirect elsewhere is a real answer, whatever its body
+        if self.body_hash is not None and body_hash(content) == self.body_hash:
+            return True
+        if self.length is not None and len(content) == self.length:
+            return True
+        if self.words_lines is not None:
+            return (len(content.split()), content.count("\n") + 1) == self.words_lines
+        return False
+
+
+def _stable(values):
+    values = set(values)
+    return values.pop() if len(values) == 1 else None
+
+
+# --------------------------------------------------------------------------- #
+# Calibrator
+# --------------------------------------------------------------------------- #
+class Calibrator:
+    """
+    Soft-404 / wildcard detection.
+
+    For each directory the engine requests a few random paths per target kind
+    (directory + every extension), feeds the responses to `learn`, then calls
+    `finish`. Responses matching a learned baseline are wildcard noise and
+    `is_wildcard` reports them so they can be dropped before any follow-up.
+
+    A catch-all answers every random path alike, so a status only some of
+    a kind's probes got (one probe that happened to hit a real page) gives
+    no baseline.
+    """
+
+    def __init__(self, extensions, samples: int = 2, statuses=None):
+        self.kinds = [DIRECTORY_KIND] + [ext.lower() for ext in extensions]
+        self.samples = max(1, samples)
+        self.statuses = statuses  # only baseline statuses that could be reported
+
+        self._samples = {}     # directory -> kind -> [(ResponseFingerprint, location kind)]
+        self._baselines = {}   # directory -> kind -> {status: Baseline}
+        self._locks = {}
+        self._guard = threading.Lock()
+
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Calibration
+    # ------------------------------------------------------------------ #
+    def is_calibrated(self, directory):
+        return directory in self._baselines
+
+    def lock_for(self, directory):
+        with self._guard:
+            return self._locks.setdefault(directory, threading.Lock())
+
+    def probes(self, directory):
+        """(kind, url) pairs of random, almost certainly non-existent paths."""
+        probes = []
+        for kind in self.kinds:
+            for _ in range(self.samples):
+                token = uuid.uuid4().hex[:16]
+                name = f"{token}/" if kind == DIRECTORY_KIND else f"{token}.{kind}"
+                probes.append((kind, urljoin(directory, name)))
+        return probes
+
+    def learn(self, directory, kind, status, content, url=None, location=None):
+        if status is None:
+            return
+        with self._guard:
+            per_kind = self._samples.setdefault(directory, {})
+            per_kind.setdefault(kind, []).append((fingerprint(status, content), location_kind(url, location)))
+
+    def finish(self, directory):
+        with self._guard:
+            per_kind = self._samples.pop(directory, {})
+        baselines = {}
+        for kind, samples in per_kind.items():
+            statuses = {sample.status for sample, _ in samples}
+            if len(statuses) != 1:
+                continue  # not every probe got the same answer: no catch-all here
+            status = statuses.pop()
+            if self.statuses is not None and status not in self.statuses:
+                continue  # never reported anyway
+            baseline = Baseline([sample for sample, _ in samples], [location for _, location in samples])
+            if baseline.usable:
+                baselines[kind] = {status: baseline}
+        self._baselines[directory] = baselines
+
+    # ------------------------------------------------------------------ #
+    # Filtering
+    # ------------------------------------------------------------------ #
+    def has_baseline(self, directory, status):
+        """Could a `status` response in directory be wildcard noise? (i.e. is its body needed)"""
+        per_kind = self._baselines.get(directory)
+        return bool(per_kind) and any(status in by_status for by_status in per_kind.values())
+
+    def is_wildcard(self, directory, kind, status, content, url=None, location=None):
+        """True if (status, content, redirect) looks like this directory's wildcard answer."""
+        per_kind = self._baselines.get(directory)
+        if not per_kind:
+            return False
+        kinds = (kind,) if kind is not None else per_kind.keys()
+        location = location_kind(url, location)
+        for k in kinds:
+            baseline = per_kind.get(k, {}).get(status)
+            if baseline is not None and baseline.matches(content or "", location):
+                with self._dropped_lock:
+                    self.dropped += 1
+                return True
+        return False
+
+    def stats(self):
+        return {"directories": len(self._baselines), "dropped": self.dropped}
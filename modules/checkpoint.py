@@ -0,0 +1,84 @@
+import json
+import os
+import time
+
+CHECKPOINT_VERSION = 1
+JOURNAL_SUFFIX = ".visited"
+
+
+# --------------------------------------------------------------------------- #
+# Checkpointer
+# --------------------------------------------------------------------------- #
+class Checkpointer:
+    """
+    Periodic scan checkpoints for --resume.
+
+    Two files are kept side by side:
+
+      <path>          JSON snapshot: scan identity, wordlist cursor, pending
+                      recursion tasks, counters and results so far
+      <path>.visited  append-only journal of completed URLs, one per line
+
+    Only URLs finished since the previous checkpoint are appended, so a
+    checkpoint costs the same on the millionth request as on the first. The
+    journal is flushed before the snapshot is swapped in: every URL behind
+    the snapshot's cursor is always on disk.
+    """
+
+    def __init__(self, path, interval: float = 30.0):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.interval = interval
+        self.writes = 0
+        self._last = time.monotonic()
+        self._journal = None
+
+    def start(self, completed_urls=()):
+        """Open a fresh journal, seeded with URLs completed by an earlier run."""
+        tmp = f"{self.journal_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for url in completed_urls:
+                f.write(url + "\n")
+        os.replace(tmp, self.journal_path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def due(self):
+        return time.monotonic() - self._last >= self.interval
+
+    def write(self, state, completed_urls):
+        if completed_urls:
+            self._journal.write("\n".join(completed_urls) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+        state = dict(state, version=CHECKPOINT_VERSION, saved_at=time.time())
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+        self._last = time.monotonic()
+        self.writes += 1
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+def load_checkpoint(path):
+    """(state, completed_urls) of a checkpoint written by Checkpointer."""
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"unsupported checkpoint version {state.get('version')!r}")
+
+    completed = set()
+    journal_path = path + JOURNAL_SUFFIX
+    if os.path.exists(journal_path):
+        with open(journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                # a torn last line (crash mid-append) is never a whole URL
+                if line.endswith("\n"):
+                    completed.add(line[:-1])
+    return state, completed
@@ -0,0 +1,204 @@
+import json
+import re
+
+from modules.calibration import fingerprint
+
+HIGH_RISK = "🔥 High Risk"
+MEDIUM_RISK = "⚠️ Medium Risk"
+LOW_RISK = "ℹ️ Low Risk"
+SEVERITIES = {"high": HIGH_RISK, "medium": MEDIUM_RISK, "low": LOW_RISK}
+SEVERITY_RANK = {LOW_RISK: 0, MEDIUM_RISK: 1, HIGH_RISK: 2}
+
+# Path suffix -> severity (the first list that matches wins)
+DEFAULT_SUFFIXES = {
+    "high": [".bak", ".sql", ".env", ".config", ".php", ".ini"],
+    "medium": [".log", ".txt", ".zip"],
+}
+
+# Named content signatures: (name, regex, severity it raises a hit to or None,
+# anchors). Patterns are case-insensitive and multi-line (^ / $ match at every
+# line); (?-i:...) makes a part case-sensitive. Anchors are lower-case
+# literals of which a match must contain one: the regex only runs on bodies
+# that contain an anchor (no anchors: it always runs).
+DEFAULT_SIGNATURES = [
+    ("private-key", r"-----BEGIN (?:RSA |EC |DSA |OPENSSH |ENCRYPTED )?PRIVATE KEY-----", "high", ("private key-----",)),
+    ("git-metadata", r"^\[core\]\s+repositoryformatversion|^ref: refs/heads/", "high",
+     ("repositoryformatversion", "refs/heads/")),
+    ("env-file", r"^(?-i:(?:export\s+)?[A-Z][A-Z0-9_]*(?:KEY|SECRET|TOKEN|PASSWORD|PASSWD|DATABASE_URL))=", "high",
+     ("key=", "secret=", "token=", "passw", "_url=")),
+    ("sql-dump", r"^-- (?:MySQL|MariaDB) dump|^-- PostgreSQL database dump", "high", ("dump",)),
+    ("stack-trace", r"Traceback \(most recent call last\)|^\s+at [\w$.]+\([\w$]+\.java:\d+\)|<b>Fatal error</b>:"
+                    r"|Stack trace:|Server Error in '[^']*' Application", "medium",
+     ("traceback (most", ".java:", "fatal error", "stack trace:", "server error in")),
+    ("directory-listing", r"<title>Index of /|<title>Directory listing for /|\[To Parent Directory\]", "medium",
+     ("index of /", "listing for /", "parent directory]")),
+    ("login-form", r"<input[^>]+type\s*=\s*[\"']?password", None, ("password",)),
+]
+
+
+class Classification:
+    """
+    What the classifier says about one response: the include / exclude
+    verdict, the signatures found in its body, its severity and its
+    ResponseFingerprint. The fingerprint is computed on first use and kept.
+    """
+
+    __slots__ = ("accepted", "signatures", "severity", "status", "content", "_fingerprint")
+
+    def __init__(self, accepted, signatures, severity, status, content):
+        self.accepted = accepted
+        self.signatures = signatures
+        self.severity = severity
+        self.status = status
+        self.content = content
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = fingerprint(self.status, self.content)
+        return self._fingerprint
+
+
+def read_rules(path):
+    """The JSON content of a rule file; raises ValueError when it cannot be read."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read rules from {path}: {e}") from e
+
+
+def load_rules(path):
+    """(signatures, suffixes) from a JSON rule file; raises ValueError on a bad file."""
+    return parse_rules(read_rules(path), path)
+
+
+def parse_rules(data, path="rules"):
+    """(signatures, suffixes) from the content of a rule file (path names it in errors)."""
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object with 'signatures' and/or 'severity'")
+
+    signatures = []
+    for rule in data.get("signatures", []):
+        if not isinstance(rule, dict) or not rule.get("name") or not rule.get("pattern"):
+            raise ValueError(f"{path}: every signature needs a 'name' and a 'pattern'")
+        severity = rule.get("severity")
+        if severity is not None and severity not in SEVERITIES:
+            raise ValueError(f"{path}: unknown severity {severity!r} for {rule['name']} (high, medium or low)")
+        anchors = rule.get("anchors", [])
+        if not isinstance(anchors, list) or not all(isinstance(a, str) and a for a in anchors):
+            raise ValueError(f"{path}: 'anchors' of {rule['name']} must be a list of non-empty strings")
+        signatures.append((rule["name"], rule["pattern"], severity, tuple(a.lower() for a in anchors)))
+
+    suffixes = data.get("severity", {})
+    if not isinstance(suffixes, dict) or any(level not in SEVERITIES for level in suffixes):
+        raise ValueError(f"{path}: 'severity' maps high / medium / low to lists of path suffixes")
+    return signatures, {level: [s.lower() for s in values] for level, values in suffixes.items()}
+
+
+REGEX_SYNTAX = set(".^$*+?{}[]\\|()")
+
+
+def _compile(pattern, name, flags=re.IGNORECASE | re.MULTILINE):
+    """A plain word or phrase -> its lower-case form (a substring test is far cheaper
+    than a case-insensitive regex scan); anything else -> the compiled regex."""
+    if not REGEX_SYNTAX.intersection(pattern):
+        return pattern.lower()
+    try:
+        return re.compile(pattern, flags)
+    except re.error as e:
+        raise ValueError(f"Invalid pattern for {name}: {e}") from e
+
+
+def _found(matcher, content, lower):
+    if isinstance(matcher, str):
+        return matcher in lower
+    return matcher.search(content) is not None
+
+
+# --------------------------------------------------------------------------- #
+# ResponseClassifier
+# --------------------------------------------------------------------------- #
+class ResponseClassifier:
+    """
+    Decides about a response in one step: the include / exclude regex
+    verdict, the named content signatures it carries, its severity and its
+    fingerprint.
+
+    Everything is compiled once. Per body, one lower-cased copy serves the
+    signature anchors and every rule that is a plain word or phrase
+    (substring tests instead of case-insensitive regex scans); a signature
+    regex only runs when one of its anchors is present, so a typical page
+    runs none. Severity comes from the path suffix (one endswith per level),
+    raised by the signatures found. A rule file (see load_rules) adds
+    signatures and suffixes to the built-in ones; `rules` is the content of
+    one already read (what a distributed scan ships to its workers).
+    """
+
+    def __init__(self, include_regex=None, exclude_regex=None, rules_path=None, rules=None):
+        signatures = list(DEFAULT_SIGNATURES)
+        suffixes = {level: list(values) for level, values in DEFAULT_SUFFIXES.items()}
+        if rules_path:
+            rules = read_rules(rules_path)
+        if rules is not None:
+            extra_signatures, extra_suffixes = parse_rules(rules, rules_path or "rules")
+            signatures += extra_signatures
+            for level, values in extra_suffixes.items():
+                suffixes.setdefault(level, []).extend(values)
+
+        self.include = _compile(include_regex, "--include-regex", re.IGNORECASE) if include_regex else None
+        self.exclude = _compile(exclude_regex, "--exclude-regex", re.IGNORECASE) if exclude_regex else None
+        # (name, compiled, severity, anchors)
+        self._signatures = [
+            (name, _compile(pattern, name), SEVERITIES.get(severity), anchors)
+            for name, pattern, severity, anchors in signatures
+        ]
+        self._suffixes = [
+            (SEVERITIES[level], tuple(suffixes[level])) for level in ("high", "medium", "low") if suffixes.get(level)
+        ]
+
+    @property
+    def needs_body(self):
+        """Are there rules to run (so the body of every candidate hit must be read)?"""
+        return bool(self._signatures) or self.include is not None or self.exclude is not None
+
+    def path_severity(self, path):
+        lower = path.lower()
+        for severity, suffixes in self._suffixes:
+            if lower.endswith(suffixes):
+                return severity
+        return LOW_RISK
+
+    def signatures_in(self, content, lower=None):
+        """Names of the signatures found in content, and the highest severity they raise to (or None)."""
+        if lower is None:
+            lower = content.lower()
+        found, raised = [], None
+        for name, matcher, severity, anchors in self._signatures:
+            if anchors and not any(anchor in lower for anchor in anchors):
+                continue
+            if _found(matcher, content, lower):
+                found.append(name)
+                if severity is not None and (raised is None or SEVERITY_RANK[severity] > SEVERITY_RANK[raised]):
+                    raised = severity
+        return found, raised
+
+    def classify(self, path, status, content):
+        """Classification of a response to path (content None: no response)."""
+        accepted = content is not None
+        severity = self.path_severity(path)
+        signatures = []
+        if content:
+            lower = content.lower()
+            if self.include is not None and not _found(self.include, content, lower):
+                accepted = False
+            elif self.exclude is not None and _found(self.exclude, content, lower):
+                accepted = False
+            elif self._signatures:
+                signatures, raised = self.signatures_in(content, lower)
+                if raised is not None and SEVERITY_RANK[raised] > SEVERITY_RANK[severity]:
+                    severity = raised
+        elif self.include is not None:
+            accepted = False  # nothing to match
+        return Classification(accepted, signatures, severity, status, content)
@@ -1,503 +1,1481 @@
-import os
-import time
-import random
-import threading
-import queue
-import requests
-import re
-import json
-import csv
-import urllib3
-from urllib.parse import urljoin
-
-from utils.context import ScanContext
-from utils.logger import log_error, log_info
-
-from rich.console import Console, Group
-from rich.panel import Panel
-from rich.live import Live
-from rich.progress import Progress, BarColumn, TextColumn
-from rich.table import Table
-
-console = Console()
-
-# --------------------------------------------------------------------------- #
-# Globals / Defaults
-# --------------------------------------------------------------------------- #
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-    "Mozilla/5.0 (X11; Linux x86_64)",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)",
-    "Mozilla/5.0 (iPhone; CPU iPhone OS 15_0)",
-]
-
-DEFAULT_EXTENSIONS = ["php", "html", "bak", "txt", "zip", "asp", "aspx"]
-DEFAULT_INTERESTING_CODES = {200, 204, 301, 302, 307, 308, 401, 403, 405}
-
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-
-# --------------------------------------------------------------------------- #
-# UI helpers
-# --------------------------------------------------------------------------- #
-def format_status(status_code: int) -> str:
-    if 200 <= status_code < 300:
-        return f"[bold green]{status_code}[/bold green] ✅"
-    elif 300 <= status_code < 400:
-        return f"[bold blue]{status_code}[/bold blue] 🔵"
-    elif 400 <= status_code < 500:
-        return f"[bold yellow]{status_code}[/bold yellow] ⚠️"
-    else:
-        return f"[bold red]{status_code}[/bold red] 🔥"
-
-
-def get_severity(path: str) -> str:
-    high_risk = [".bak", ".sql", ".env", ".config", ".php", ".ini"]
-    medium_risk = [".log", ".txt", ".zip"]
-    lower = path.lower()
-    for ext in high_risk:
-        if lower.endswith(ext):
-            return "🔥 High Risk"
-    for ext in medium_risk:
-        if lower.endswith(ext):
-            return "⚠️ Medium Risk"
-    return "ℹ️ Low Risk"
-
-
-# --------------------------------------------------------------------------- #
-# ContentDiscoverer
-# --------------------------------------------------------------------------- #
-class ContentDiscoverer:
-    """
-    Rich-enabled, threaded web content discoverer.
-
-    Scans a target URL using a wordlist (and per-extension permutations),
-    displays live progress, collects interesting responses, attempts simple
-    bypasses on 403/401, and saves results in JSON / CSV / TXT formats.
-    """
-
-    def __init__(
-        self,
-        context: ScanContext,
-        threads: int = 30,
-        delay: float = 0.1,
-        status_filter=None,
-        extensions=None,
-        recursion: bool = True,
-        proxies=None,
-        profile: str = "balanced",
-        include_regex: str = None,
-        exclude_regex: str = None,
-        output_path: str = "scan_results",  # base filename, ext auto-added per format
-        formats=None,
-        verify_ssl: bool = True,
-        timeout: int = 10,
-        interesting_codes=None,
-    ):
-        self.context = context
-
-        # --- profile tuning ---
-        profile = (profile or "balanced").lower()
-        if profile == "stealth":
-            self.threads = min(threads, 10)
-            self.base_delay = max(delay, 1.5)
-        elif profile == "aggressive":
-            self.threads = max(threads, 100)
-            self.base_delay = max(delay, 0.01)
-        else:  # balanced
-            self.threads = threads
-            self.base_delay = delay
-
-        self.delay = self.base_delay
-        self.timeout = timeout
-        self.verify_ssl = verify_ssl
-        self.proxies = proxies
-        self.recursion = recursion
-
-        self.extensions = extensions or DEFAULT_EXTENSIONS
-        self.status_filter = status_filter or DEFAULT_INTERESTING_CODES
-        self.interesting_codes = interesting_codes or DEFAULT_INTERESTING_CODES
-
-        # Regex filters on response *content* (body)
-        self.include_regex = re.compile(include_regex, re.IGNORECASE) if include_regex else None
-        self.exclude_regex = re.compile(exclude_regex, re.IGNORECASE) if exclude_regex else None
-
-        # Work queue
-        self.task_queue = queue.Queue()
-        self.shutdown_event = threading.Event()
-
-        # Progress tracking
-        self.total_tasks_lock = threading.Lock()
-        self.total_tasks = 0
-        self.completed_tasks = 0
-
-        # For recursion and duplicate suppression
-        self.visited_lock = threading.Lock()
-        self.visited = set()
-
-        # UI state
-        self.ui_lock = threading.Lock()
-        self.displayed_urls = set()  # Track which URLs have been displayed
-
-        # Rich progress + table
-        self.progress_bar = Progress(
-            TextColumn("[cyan]Scanning...[/cyan]"),
-            BarColumn(),
-            TextColumn("{task.completed}/{task.total}")
-        )
-        self.result_table = Table(show_header=True, header_style="bold magenta")
-        self.result_table.add_column("Status", style="cyan", width=10)
-        self.result_table.add_column("URL", style="white")
-        self.result_table.add_column("Severity", style="yellow")
-
-        # Output selection
-        self.output_base = output_path  # may include extension; extensions added per format
-        if formats is None:
-            formats = ["json"]
-        if isinstance(formats, str):
-            formats = [fmt.strip().lower() for fmt in formats.split(",")]
-        self.formats = [f.lower() for f in formats]
-        if "all" in self.formats:
-            self.formats = ["json", "csv", "txt"]
-
-    # ------------------------------------------------------------------ #
-    # Wordlist
-    # ------------------------------------------------------------------ #
-    def load_wordlist(self, path):
-        if not os.path.exists(path):
-            raise FileNotFoundError(f"Wordlist not found: {path}")
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            return [line.strip().strip('/') for line in f if line.strip()]
-
-    # ------------------------------------------------------------------ #
-    # HTTP
-    # ------------------------------------------------------------------ #
-    def send_request(self, url, extra_headers=None):
-        headers = {
-            "User-Agent": random.choice(USER_AGENTS),
-            "Accept": "*/*",
-            "Connection": "close"
-        }
-        if extra_headers:
-            headers.update(extra_headers)
-        try:
-            response = requests.get(
-                url,
-                headers=headers,
-                timeout=self.timeout,
-                allow_redirects=True,
-                proxies=self.proxies,
-                verify=self.verify_ssl,
-            )
-            return response.status_code, response.text, url
-        except requests.RequestException as e:
-            log_error(f"Request error for {url}: {e}")
-            return None, None, url
-
-    # ------------------------------------------------------------------ #
-    # Bypass attempts (simple)
-    # ------------------------------------------------------------------ #
-    def try_bypass(self, url, status_code):
-        bypasses = []
-        base_path = url.split("/")[-2] if url.endswith("/") else url.split("/")[-1]
-
-        bypass_paths = [
-            url + ".",
-            url + "/",
-            url.replace(base_path, f"{base_path}%2f"),
-            url.replace(base_path, f"{base_path}/"),
-            url.replace(base_path, f"{base_path}..;/"),
-            url.replace(base_path, f"{base_path};/"),
-        ]
-
-        header_payloads = [
-            {"X-Original-URL": url},
-            {"X-Rewrite-URL": url},
-            {"X-Custom-IP-Authorization": "127.0.0.1"},
-            {"X-Forwarded-For": "127.0.0.1"},
-            {"X-Forwarded-Host": "127.0.0.1"},
-            {"Referer": url}
-        ]
-
-        # Path tricks
-        for trick_url in bypass_paths:
-            time.sleep(random.uniform(self.base_delay, self.base_delay + 0.5))
-            status, content, _ = self.send_request(trick_url)
-            if status and status not in (403, 401):
-                if self._content_filter(content):
-                    with self.ui_lock:
-                        if trick_url not in self.displayed_urls:
-                            self.result_table.add_row(format_status(status), trick_url, "Bypass Success")
-                            self.displayed_urls.add(trick_url)
-                    self.context.add_discovery_result({"url": trick_url, "status": status, "bypass": "path"})
-                    bypasses.append((trick_url, status))
-
-        # Header tricks
-        for headers in header_payloads:
-            headers["User-Agent"] = random.choice(USER_AGENTS)
-            try:
-                time.sleep(random.uniform(self.base_delay, self.base_delay + 0.5))
-                response = requests.get(url, headers=headers, timeout=self.timeout, verify=False, proxies=self.proxies)
-                if response.status_code not in (403, 401) and self._content_filter(response.text):
-                    with self.ui_lock:
-                        if url not in self.displayed_urls:
-                            self.result_table.add_row(format_status(response.status_code), url, "Header Bypass")
-                            self.displayed_urls.add(url)
-                    self.context.add_discovery_result({
-                        "url": url,
-                        "status": response.status_code,
-                        "bypass": list(headers.keys())[0]
-                    })
-                    bypasses.append((url, response.status_code))
-            except requests.RequestException as e:
-                log_error(f"Bypass header error for {url}: {e}")
-                continue
-
-        return bypasses
-
-    # ------------------------------------------------------------------ #
-    # Content filters
-    # ------------------------------------------------------------------ #
-    def _content_filter(self, content):
-        if content is None:
-            return False
-        if self.include_regex and not self.include_regex.search(content):
-            return False
-        if self.exclude_regex and self.exclude_regex.search(content):
-            return False
-        return True
-
-    # ------------------------------------------------------------------ #
-    # Worker thread
-    # ------------------------------------------------------------------ #
-    def _worker(self):
-        while not self.shutdown_event.is_set():
-            try:
-                base_url, path = self.task_queue.get(timeout=1)
-            except queue.Empty:
-                if self.shutdown_event.is_set():
-                    break
-                continue
-
-            try:
-                self._process_path(base_url, path)
-            except Exception as e:
-                log_error(f"Error processing {path}: {e}")
-            finally:
-                with self.total_tasks_lock:
-                    self.completed_tasks += 1
-                self.task_queue.task_done()
-
-    # ------------------------------------------------------------------ #
-    # Process a single path (plus extension fuzzing)
-    # ------------------------------------------------------------------ #
-    def _process_path(self, base_url, path):
-        targets = [path + "/"] + [f"{path}.{ext}" for ext in self.extensions]
-
-        for target in targets:
-            full_url = urljoin(base_url, target)
-
-            # skip if already scanned
-            with self.visited_lock:
-                if full_url in self.visited:
-                    continue
-                self.visited.add(full_url)
-
-            # request
-            time.sleep(random.uniform(self.base_delay, self.base_delay + 0.5))
-            status, content, url = self.send_request(full_url)
-
-            if status in self.status_filter and self._content_filter(content):
-                severity = get_severity(target)
-                with self.ui_lock:
-                    if full_url not in self.displayed_urls:
-                        self.result_table.add_row(format_status(status), full_url, severity)
-                        self.displayed_urls.add(full_url)
-
-                if status in (403, 401):
-                    self.try_bypass(full_url, status)
-
-                self.context.add_discovery_result({"url": full_url, "status": status, "severity": severity})
-
-                # recursion into directories
-                if self.recursion and target.endswith("/") and status != 404:
-                    with self.total_tasks_lock:
-                        self.total_tasks += 1
-                    self.task_queue.put((full_url, ""))
-
-    # ------------------------------------------------------------------ #
-    # Render current UI state
-    # ------------------------------------------------------------------ #
-    def _render_ui(self, task_id):
-        return Panel(
-            Group(self.progress_bar, self.result_table),
-            title=f"✅ Found: {len(self.context.get_all_discoveries())} | Progress",
-            border_style="cyan"
-        )
-
-    # ------------------------------------------------------------------ #
-    # Run scan
-    # ------------------------------------------------------------------ #
-    def run(self, base_url, wordlist_path):
-        try:
-            paths = self.load_wordlist(wordlist_path)
-        except FileNotFoundError as e:
-            log_error(str(e))
-            return
-
-        # enqueue tasks
-        for path in paths:
-            with self.total_tasks_lock:
-                self.total_tasks += 1
-            self.task_queue.put((base_url, path))
-
-        # create progress task
-        task_id = self.progress_bar.add_task("Scanning", total=self.total_tasks)
-
-        # start workers
-        threads = []
-        for _ in range(self.threads):
-            t = threading.Thread(target=self._worker, daemon=True)
-            t.start()
-            threads.append(t)
-
-        # live UI
-        with Live(self._render_ui(task_id), refresh_per_second=5, console=console):
-            try:
-                while True:
-                    with self.total_tasks_lock:
-                        completed = self.completed_tasks
-                        total = self.total_tasks
-                    self.progress_bar.update(task_id, completed=completed, total=total)
-
-                    if completed >= total and self.task_queue.empty():
-                        break
-                    time.sleep(0.5)
-            except KeyboardInterrupt:
-                self.shutdown_event.set()
-
-        # join workers
-        for t in threads:
-            t.join()
-
-        # save data
-        self._save_all_formats()
-
-    # ------------------------------------------------------------------ #
-    # Output filename helper
-    # ------------------------------------------------------------------ #
-    def _normalized_output_paths(self):
-        """
-        Build path per format. If output_base has an extension matching fmt, use it.
-        Else append .fmt
-        """
-        paths = {}
-        base = self.output_base
-        lower = base.lower()
-        for fmt in self.formats:
-            ext = f".{fmt}"
-            if lower.endswith(ext):
-                paths[fmt] = base
-            else:
-                paths[fmt] = base + ext
-        return paths
-
-    # ------------------------------------------------------------------ #
-    # Save results (multi-format)
-    # ------------------------------------------------------------------ #
-    def _save_all_formats(self):
-        try:
-            data = self.context.get_all_discoveries()
-        except Exception as e:
-            log_error(f"Failed to get discoveries from context: {e}")
-            return
-
-        if not data:
-            log_info("No results to save.")
-            return
-
-        paths = self._normalized_output_paths()
-
-        # JSON
-        if "json" in self.formats:
-            try:
-                with open(paths["json"], "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-                log_info(f"JSON results saved to {paths['json']}")
-            except Exception as e:
-                log_error(f"Failed to save JSON: {e}")
-
-        # CSV
-        if "csv" in self.formats:
-            try:
-                fieldnames = sorted({k for r in data for k in r.keys()})
-                with open(paths["csv"], "w", newline="", encoding="utf-8") as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(data)
-                log_info(f"CSV results saved to {paths['csv']}")
-            except Exception as e:
-                log_error(f"Failed to save CSV: {e}")
-
-        # TXT
-        if "txt" in self.formats:
-            try:
-                with open(paths["txt"], "w", encoding="utf-8") as f:
-                    for r in data:
-                        status = r.get("status", "?")
-                        url = r.get("url", "")
-                        severity = r.get("severity", "")
-                        f.write(f"{status}\t{url}\t{severity}\n")
-                log_info(f"TXT results saved to {paths['txt']}")
-            except Exception as e:
-                log_error(f"Failed to save TXT: {e}")
-
-
-# --------------------------------------------------------------------------- #
-# Standalone CLI (for quick testing of module directly)
-# --------------------------------------------------------------------------- #
-if __name__ == "__main__":
-    import argparse
-
-    parser = argparse.ArgumentParser(description="ContentDiscoverer (module test)")
-    parser.add_argument("url", help="Base URL to scan")
-    parser.add_argument("--wordlist", default="wordlists/common.txt", help="Path to wordlist file")
-    parser.add_argument("--threads", type=int, default=30, help="Number of concurrent threads")
-    parser.add_argument("--delay", type=float, default=0.1, help="Base delay between requests")
-    parser.add_argument("--profile", default="balanced", choices=["stealth", "balanced", "aggressive"], help="Scan profile")
-    parser.add_argument("--recursion", action="store_true", help="Enable recursive scanning")
-    parser.add_argument("--include-regex", default=None, help="Regex to include in response content")
-    parser.add_argument("--exclude-regex", default=None, help="Regex to exclude in response content")
-    parser.add_argument("--proxy", default=None, help="Proxy URL to use for requests")
-    parser.add_argument("-o", "--output", default="scan_results", help="Output base filename")
-    parser.add_argument("--format", default="json", help="Comma-separated formats: json,csv,txt or 'all'")
-    parser.add_argument("--no-verify", action="store_true", help="Disable SSL verification")
-    args = parser.parse_args()
-
-    # Build formats list
-    formats = [f.strip().lower() for f in args.format.split(",")]
-    if "all" in formats:
-        formats = ["json", "csv", "txt"]
-
-    # Build context (minimal)
-    ctx = ScanContext(target_url=args.url, wordlist_path=args.wordlist)
-    ctx.verify_ssl = not args.no_verify
-
-    discoverer = ContentDiscoverer(
-        context=ctx,
-        threads=args.threads,
-        delay=args.delay,
-        recursion=args.recursion,
-        proxies={"http": args.proxy, "https": args.proxy} if args.proxy else None,
-        profile=args.profile,
-        include_regex=args.include_regex,
-        exclude_regex=args.exclude_regex,
-        output_path=args.output,
-        formats=formats,
-        verify_ssl=ctx.verify_ssl,
-    )
-
-    console.print(f"[bold cyan]🚀 Starting {args.profile.upper()} scan on: {args.url}[/bold cyan]")
-    console.print(f"[bold green]📂 Using wordlist: {os.path.abspath(args.wordlist)}[/bold green]")
-
-    discoverer.run(args.url, args.wordlist)
+import os
+import asyncio
+import contextlib
+import time
+import random
+import threading
+import queue
+import collections
+import requests
+import urllib3
+from urllib.parse import urljoin
+
+from modules.baseline import DEFAULT_SAMPLE, ScanBaseline, validators_of, without_conditionals
+from modules.bypass import DEFAULT_PRUNE_AFTER, BypassJob, BypassTracker, bypass_candidates
+from modules.cache import DEFAULT_MAX_MB, ResponseCache
+from modules.calibration import Calibrator, directory_of, target_kind
+from modules.checkpoint import Checkpointer, load_checkpoint
+from modules.classifier import ResponseClassifier
+from modules.dedupe import DEFAULT_FP_RATE, make_url_set
+from modules.extensions import ExtensionPlanner
+from modules.metrics import DEFAULT_DUMP_INTERVAL, MetricsDumper, MetricsServer, ScanMetrics
+from modules.output import CONVERTERS, ResultWriter, convert_results, iter_results
+from modules.rate import governor_for_profile
+from modules.recursion import DEFAULT_MAX_DEPTH, RecursionScheduler, directory_signature, names_file
+from modules.scheduler import HostScheduler, host_of
+from modules.transport import (
+    DEFAULT_H2_CONNECTIONS,
+    DEFAULT_H2_STREAMS,
+    MAX_REDIRECTS,
+    REDIRECT_CODES,
+    Http2Transport,
+    HttpTransport,
+    ProbeResult,
+    RedirectCache,
+)
+from utils.context import ScanContext
+from utils.logger import log_error, log_info
+from modules.ui_live import ScanDashboard
+from utils.wordlist import SharedWordlist, stream_wordlist, wordlist_size
+
+from rich.console import Console, Group
+from rich.panel import Panel
+from rich.live import Live
+from rich.progress import Progress, BarColumn, TextColumn
+
+console = Console()
+
+# --------------------------------------------------------------------------- #
+# Globals / Defaults
+# --------------------------------------------------------------------------- #
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Mozilla/5.0 (X11; Linux x86_64)",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 15_0)",
+]
+
+DEFAULT_EXTENSIONS = ["php", "html", "bak", "txt", "zip", "asp", "aspx"]
+DEFAULT_INTERESTING_CODES = {200, 204, 301, 302, 307, 308, 401, 403, 405}
+
+# Probing: "get" always downloads the full body; "stream" reads the body only
+# when a filter/fingerprint needs it; "head" sends HEAD first (GET on demand).
+PROBE_MODES = ("get", "stream", "head")
+HEAD_UNSUPPORTED = {405, 501}
+DEFAULT_MAX_BODY = 512 * 1024
+DRAIN_LIMIT = 64 * 1024  # unread bodies up to this size are drained to keep the connection
+
+HEADLESS_PROGRESS_INTERVAL = 10.0  # seconds between progress lines with ui=False
+SCHEDULER_IDLE = 0.05  # seconds the feeder waits when every batch-scan host is at its cap
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+def bypass_worked(status):
+    """Did a bypass probe get through (2xx / 3xx)? A 404 or 5xx is no success."""
+    return status is not None and 200 <= status < 400
+
+
+def results_path_for(output_base):
+    """The streaming JSONL sink: output base with any format extension swapped for .jsonl."""
+    root, ext = os.path.splitext(output_base)
+    if ext.lower().lstrip(".") in set(CONVERTERS) | {"jsonl"}:
+        return root + ".jsonl"
+    return output_base + ".jsonl"
+
+
+def _result_key(result):
+    return tuple(sorted((key, tuple(value) if isinstance(value, list) else value) for key, value in result.items()))
+
+
+# --------------------------------------------------------------------------- #
+# ContentDiscoverer
+# --------------------------------------------------------------------------- #
+class ContentDiscoverer:
+    """
+    Rich-enabled, threaded web content discoverer.
+
+    Scans a target URL using a wordlist (and per-extension permutations),
+    displays live progress, collects interesting responses, attempts simple
+    bypasses on 403/401, and saves results in JSON / CSV / TXT formats.
+    """
+
+    def __init__(
+        self,
+        context: ScanContext,
+        threads: int = 30,
+        delay: float = None,
+        status_filter=None,
+        extensions=None,
+        extension_sample: int = 0,
+        recursion: bool = True,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        recursion_budget: int = None,
+        proxies=None,
+        profile: str = "balanced",
+        include_regex: str = None,
+        exclude_regex: str = None,
+        rules_path: str = None,
+        rules: dict = None,
+        output_path: str = "scan_results",  # base filename, ext auto-added per format
+        formats=None,
+        verify_ssl: bool = True,
+        timeout: int = 10,
+        interesting_codes=None,
+        pool_size: int = None,
+        session_mode: str = "thread",
+        http2: bool = False,
+        h2_connections: int = DEFAULT_H2_CONNECTIONS,
+        h2_streams: int = DEFAULT_H2_STREAMS,
+        queue_size: int = None,
+        calibrate: bool = True,
+        calibration_samples: int = 2,
+        rate: float = None,
+        max_rate: float = None,
+        probe_mode: str = "stream",
+        max_body: int = DEFAULT_MAX_BODY,
+        follow_redirects: bool = True,
+        checkpoint_path: str = None,
+        checkpoint_interval: float = 30.0,
+        resume_path: str = None,
+        dedupe: str = "exact",
+        dedupe_fp_rate: float = DEFAULT_FP_RATE,
+        ui: bool = True,
+        metrics_port: int = None,
+        metrics_path: str = None,
+        metrics_interval: float = DEFAULT_DUMP_INTERVAL,
+        bypass_threads: int = None,
+        bypass_prune_after: int = DEFAULT_PRUNE_AFTER,
+        per_host_concurrency: int = None,
+        baseline_path: str = None,
+        baseline_sample: float = DEFAULT_SAMPLE,
+        cache_path: str = None,
+        cache_max_mb: int = DEFAULT_MAX_MB,
+    ):
+        self.context = context
+
+        # Per-phase latency histograms and counters; optionally served on
+        # metrics_port (Prometheus text) and/or dumped to metrics_path (JSON)
+        self.metrics = ScanMetrics()
+        self.metrics_port = metrics_port
+        self.metrics_path = metrics_path
+        self.metrics_interval = metrics_interval
+        self.metrics_server = None
+        self.metrics_dumper = None
+
+        # --- profile tuning ---
+        profile = (profile or "balanced").lower()
+        if profile == "stealth":
+            self.threads = min(threads, 10)
+        elif profile == "aggressive":
+            self.threads = max(threads, 100)
+        else:  # balanced
+            self.threads = threads
+
+        # Pacing: one adaptive governor (token bucket + AIMD) for every request;
+        # batch scans (several targets) give every host a governor of its own
+        self.profile = profile
+        self.delay = delay
+        self._governor_settings = dict(profile=profile, threads=self.threads, delay=delay, rate=rate, max_rate=max_rate)
+        self.governor = governor_for_profile(**self._governor_settings)
+        self.host_governors = {}
+        self._host_governors_lock = threading.Lock()
+
+        # Batch scans: tasks of all targets come from a fair per-host scheduler
+        # (set up by run when given several targets)
+        self.per_host_concurrency = per_host_concurrency
+        self.scheduler = None
+
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.proxies = proxies
+
+        # Recursion: discovered directories are expanded with the word list
+        # from a priority scheduler (set up by run), down to max_depth levels
+        self.recursion = recursion
+        self.max_depth = max_depth
+        self.recursion_budget = recursion_budget
+        self.recursion_scheduler = None
+
+        if probe_mode not in PROBE_MODES:
+            raise ValueError(f"Unknown probe mode: {probe_mode}")
+        self.probe_mode = probe_mode
+        self.max_body = max_body
+
+        # Redirects are walked hop by hop: either recorded as-is (status +
+        # Location) or resolved through a per-scan cache of targets.
+        self.follow_redirects = follow_redirects
+        self.redirect_cache = RedirectCache()
+
+        # Pooled keep-alive transport shared by discovery, bypass and recursion;
+        # with http2, probes are multiplexed over a few h2 connections per host
+        # (hosts without h2 use the keep-alive transport)
+        transport_cls, transport_kwargs = HttpTransport, {}
+        if http2:
+            transport_cls = Http2Transport
+            transport_kwargs = dict(connections=h2_connections, max_streams=h2_streams)
+        self.transport = transport_cls(
+            pool_size=pool_size or self.threads,
+            session_mode=session_mode,
+            verify_ssl=verify_ssl,
+            proxies=proxies,
+            timeout=timeout,
+            metrics=self.metrics,
+            **transport_kwargs,
+        )
+
+        self.extensions = extensions or DEFAULT_EXTENSIONS
+
+        # Per-directory extension pruning from technology hints and hits
+        # (opt-in: extension_sample=0 always probes every extension)
+        self.extension_planner = ExtensionPlanner(self.extensions, extension_sample) if extension_sample else None
+        self.status_filter = status_filter or DEFAULT_INTERESTING_CODES
+        self.interesting_codes = interesting_codes or DEFAULT_INTERESTING_CODES
+
+        # Soft-404 / wildcard calibration (per scanned directory)
+        self.calibrator = (
+            Calibrator(self.extensions, samples=calibration_samples, statuses=self.status_filter)
+            if calibrate else None
+        )
+
+        # One-pass classification of response bodies: include/exclude regex
+        # verdict, content signatures (plus any from rules_path / rules), severity
+        self.classifier = ResponseClassifier(include_regex, exclude_regex, rules_path, rules)
+
+        # Incremental rescan: known hits are revalidated with conditional
+        # requests, past misses are sampled, and the saved formats hold the
+        # changes against the baseline instead of every result
+        self.baseline = ScanBaseline(baseline_path, baseline_sample) if baseline_path else None
+
+        # Optional on-disk cache of every response judged (probes, calibration,
+        # bypass), so `main.py replay` can filter the scan again offline
+        self.cache = ResponseCache(cache_path, cache_max_mb * 1024 * 1024) if cache_path else None
+
+        # Work queue: bounded, fed lazily from the wordlist. Recursion tasks
+        # that find it full wait in `overflow` instead of blocking a worker.
+        self.queue_size = queue_size or max(self.threads * 4, 100)
+        self.task_queue = queue.Queue(maxsize=self.queue_size)
+        self.overflow = collections.deque()
+        self.shutdown_event = threading.Event()
+        self.feed_done = threading.Event()
+
+        # 403/401 bypass stage: probes queued per technique, run by a smaller
+        # pool of its own (a minority share of the shared rate budget), deduped,
+        # and pruned per directory / host by the tracker
+        self.bypass_threads = max(1, bypass_threads or self.threads // 4)
+        self.bypass_queue = queue.Queue()
+        self.bypass_tracker = BypassTracker(prune_after=bypass_prune_after)
+        self.pending_bypass = collections.Counter()  # url -> queued probes (under state_lock)
+
+        # Progress tracking
+        self.total_tasks_lock = threading.Lock()
+        self.total_tasks = 0
+        self.completed_tasks = 0
+        self.estimated_tasks = 0
+
+        # For recursion and duplicate suppression: sharded sets of hashed
+        # URLs (exact) or Bloom filters, for both visited and displayed URLs
+        self.dedupe = dedupe
+        self.visited = make_url_set(dedupe, fp_rate=dedupe_fp_rate)
+        self.bypass_seen = make_url_set(dedupe, fp_rate=dedupe_fp_rate, capacity=1 << 14)
+
+        # Checkpoint / resume. Word tasks carry their wordlist index; the
+        # cursor is the low-water mark below which every word is finished.
+        # Completed URLs are journaled; the rest is snapshotted under state_lock.
+        self.checkpoint_path = checkpoint_path or resume_path
+        self.checkpoint_interval = checkpoint_interval
+        self.resume_path = resume_path
+        self.checkpointer = None
+        self.state_lock = threading.Lock()
+        self.word_cursor = 0
+        self._words_done = set()
+        self.pending_recursion = set()
+        self._completed_urls = []
+        self._restored_results = set()
+        self._scan_identity = None
+
+        # UI state: hits go to a bounded dashboard (Rich Live), or are printed
+        # as plain lines when ui=False (CI / batch runs)
+        self.ui = ui
+        self.displayed_urls = make_url_set(dedupe, fp_rate=dedupe_fp_rate, capacity=1 << 14)
+        self.dashboard = ScanDashboard()
+        self._last_progress_log = time.monotonic()
+
+        # Rich progress bar
+        self.progress_bar = Progress(
+            TextColumn("[cyan]Scanning...[/cyan]"),
+            BarColumn(),
+            TextColumn("{task.completed}/{task.total}")
+        )
+
+        # Output selection
+        self.output_base = output_path  # may include extension; extensions added per format
+        if formats is None:
+            formats = ["json"]
+        if isinstance(formats, str):
+            formats = [fmt.strip().lower() for fmt in formats.split(",")]
+        self.formats = [f.lower() for f in formats]
+        if "all" in self.formats:
+            self.formats = ["json", "csv", "txt"]
+
+        # Results stream to <base>.jsonl as they are found (opened by run);
+        # the formats above are converted from it when the scan ends.
+        self.results = None
+        self.saved = False  # did the scan end with output files written
+
+    # ------------------------------------------------------------------ #
+    # Wordlist
+    # ------------------------------------------------------------------ #
+    def open_wordlist(self, path):
+        return SharedWordlist(path)
+
+    def _plan(self, targets, wordlist_path):
+        """
+        Prepare run(): returns the word count. With several targets the word
+        list is opened once and shared by a HostScheduler (and by recursion);
+        words are read from disk as the cursors reach them, not loaded.
+        """
+        words = wordlist_size(wordlist_path)
+        self.estimated_tasks = words * len(targets)
+        if len(targets) > 1:
+            self.scheduler = HostScheduler(
+                targets, self.open_wordlist(wordlist_path), per_host=self.per_host_concurrency, workers=self._task_slots()
+            )
+        if self.recursion:
+            self.recursion_scheduler = RecursionScheduler(
+                self._recursion_words(wordlist_path), max_depth=self.max_depth, budget=self.recursion_budget
+            )
+        return words
+
+    def _recursion_words(self, wordlist_path):
+        if self.scheduler is not None:
+            return self.scheduler.words
+        return self.open_wordlist(wordlist_path)
+
+    def _task_slots(self):
+        """Tasks that can make progress at once (what the scheduler shares among hosts)."""
+        return self.threads
+
+    def _tasks(self, targets, wordlist_path, start=0):
+        """(base_url, word, index) tasks to feed; None means "wait, every host is busy"."""
+        if self.scheduler is None:
+            words = stream_wordlist(wordlist_path, start)
+            return ((targets[0], path, index) for index, path in enumerate(words, start))
+        self.scheduler.seek(start)
+        return iter(self.scheduler)
+
+    def _feed(self, tasks):
+        """Producer thread: stream tasks into the bounded queue (blocks when full)."""
+        try:
+            for task in tasks:
+                if task is None:
+                    if self.shutdown_event.wait(SCHEDULER_IDLE):
+                        return
+                    continue
+                base_url, path, index = task
+                with self.total_tasks_lock:
+                    self.total_tasks += 1
+                while True:
+                    self._drain_overflow()
+                    try:
+                        self.task_queue.put((base_url, path, index, time.perf_counter()), timeout=0.5)
+                        break
+                    except queue.Full:
+                        if self.shutdown_event.is_set():
+                            return
+        except Exception as e:
+            log_error(f"Wordlist feed failed: {e}")
+        finally:
+            self.feed_done.set()
+
+    # ------------------------------------------------------------------ #
+    # HTTP
+    # ------------------------------------------------------------------ #
+    def _request_headers(self, extra_headers=None):
+        headers = {
+            "User-Agent": random.choice(USER_AGENTS),
+            "Accept": "*/*",
+        }
+        if extra_headers:
+            headers.update(extra_headers)
+        return headers
+
+    def _governor_for(self, url):
+        if self.scheduler is None:
+            return self.governor
+        host = host_of(url)
+        governor = self.host_governors.get(host)
+        if governor is None:
+            with self._host_governors_lock:
+                governor = self.host_governors.get(host)
+                if governor is None:
+                    governor = self.host_governors[host] = governor_for_profile(**self._governor_settings)
+        return governor
+
+    def _next_delay(self, url):
+        wait = self._governor_for(url).reserve()
+        self.metrics.observe("pacing", wait)
+        return wait
+
+    def _body_matters(self, directory, status):
+        """Does classifying a `status` response in directory need its body?"""
+        if self.classifier.needs_body:
+            return True
+        return self.calibrator is not None and self.calibrator.has_baseline(directory, status)
+
+    @staticmethod
+    def _decode_body(raw, encoding):
+        return raw.decode(encoding or "utf-8", errors="replace")
+
+    def _read_capped(self, response):
+        """Read at most max_body bytes of a streamed response."""
+        chunks = []
+        size = 0
+        truncated = False
+        for chunk in response.iter_content(chunk_size=16384):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_body:
+                truncated = True
+                break
+        if truncated:
+            response.close()  # rest of the body is not wanted; drop the connection
+        return self._decode_body(b"".join(chunks)[: self.max_body], response.encoding)
+
+    @staticmethod
+    def _discard_body(response):
+        """Skip an unwanted body: drain small ones (connection stays pooled), close on large ones."""
+        length = response.headers.get("Content-Length")
+        if length is not None and length.isdigit() and int(length) <= DRAIN_LIMIT:
+            response.content
+        else:
+            response.close()
+
+    def send_request(self, url, extra_headers=None, want_body=None):
+        """
+        GET/HEAD url -> ProbeResult(status, content, url, location, headers).
+
+        With stream/head probing, want_body(status) is asked once headers
+        arrive; an unread body is returned as "". Bodies are capped at
+        max_body bytes. Followed redirects report the final status/content;
+        unfollowed ones report the 3xx and its Location.
+        """
+        headers = self._request_headers(extra_headers)
+        started = time.monotonic()
+        try:
+            status, content, location, response_headers = self._fetch(url, headers, self._hop_body_policy(want_body))
+            if location and self.follow_redirects:
+                status, content = self._resolve_redirect(urljoin(url, location), without_conditionals(headers))
+                location, response_headers = None, None
+        except requests.RequestException as e:
+            self._governor_for(url).record(error=True)
+            self.metrics.error(e)
+            log_error(f"Request error for {url}: {e}")
+            return ProbeResult(None, None, url, None)
+        self._governor_for(url).record(status, time.monotonic() - started)
+        self.metrics.count("responses", status)
+        return ProbeResult(status, content, url, location, response_headers)
+
+    def _hop_body_policy(self, want_body):
+        """When following redirects, the body of the 3xx hop itself is never needed."""
+        if not self.follow_redirects:
+            return want_body
+        return lambda s: s not in REDIRECT_CODES and (want_body is None or want_body(s))
+
+    def _fetch(self, url, headers, want_body):
+        """One hop (redirects not followed) -> (status, content, location, response headers)."""
+        if self.probe_mode == "get":
+            response = self.transport.get(url, headers=headers, allow_redirects=False)
+            self._observe_headers(url, response.headers)
+            status = response.status_code
+            return status, response.text, self._location(status, response.headers), response.headers
+
+        if self.probe_mode == "head" and want_body is not None:
+            response = self.transport.request("HEAD", url, headers=headers, allow_redirects=False)
+            response.close()
+            self._observe_headers(url, response.headers)
+            status = response.status_code
+            if status not in HEAD_UNSUPPORTED and not want_body(status):
+                return status, "", self._location(status, response.headers), response.headers
+            # body needed (or HEAD refused): fall through to a streamed GET
+
+        response = self.transport.get(url, headers=headers, allow_redirects=False, stream=True)
+        self._observe_headers(url, response.headers)
+        status = response.status_code
+        location = self._location(status, response.headers)
+        started = time.perf_counter()
+        try:
+            if want_body is not None and not want_body(status):
+                self._discard_body(response)
+                return status, "", location, response.headers
+            return status, self._read_capped(response), location, response.headers
+        finally:
+            self.metrics.observe("body", time.perf_counter() - started)
+
+    @staticmethod
+    def _location(status, headers):
+        return headers.get("Location") if status in REDIRECT_CODES else None
+
+    def _observe_headers(self, url, headers):
+        """Technology hints (X-Powered-By, Server, cookies) for extension pruning."""
+        if self.extension_planner is not None:
+            self.extension_planner.observe_headers(url, headers)
+
+    def _resolve_redirect(self, target, headers):
+        """Final (status, content) behind a redirect target, fetched at most once per scan."""
+        cached = self.redirect_cache.get(target)
+        if cached is not None:
+            return cached
+        with self.redirect_cache.lock_for(target):
+            cached = self.redirect_cache.get(target)
+            if cached is not None:
+                return cached
+            result = self._follow_chain(target, headers)
+            self.redirect_cache.put(target, result)
+            return result
+
+    def _follow_chain(self, target, headers):
+        status, content = None, None
+        for _ in range(MAX_REDIRECTS):
+            status, content, location, _ = self._fetch(target, headers, lambda s: s not in REDIRECT_CODES)
+            if not location:
+                break
+            target = urljoin(target, location)
+            cached = self.redirect_cache.get(target)
+            if cached is not None:
+                return cached
+        return status, content
+
+    # ------------------------------------------------------------------ #
+    # Bypass stage
+    # ------------------------------------------------------------------ #
+    def _queue_bypass(self, url):
+        """Queue the bypass probes for a 403/401 url that are not pruned or already sent."""
+        jobs = []
+        for probe_url, headers, technique, label in bypass_candidates(url):
+            if not self.bypass_tracker.should_try(url, technique):
+                continue
+            # path tricks can produce the same request (e.g. "slash" on a file)
+            if not self.bypass_seen.add(probe_url if headers is None else f"{technique} {probe_url}"):
+                continue
+            jobs.append(BypassJob(url, probe_url, headers, technique, label))
+        if not jobs:
+            return
+        with self.state_lock:
+            self.pending_bypass[url] += len(jobs)
+        for job in jobs:
+            self.bypass_queue.put_nowait(job)
+
+    def _bypass_done(self, job):
+        with self.state_lock:
+            self.pending_bypass[job.url] -= 1
+            if not self.pending_bypass[job.url]:
+                del self.pending_bypass[job.url]
+
+    def _bypass_idle(self):
+        with self.state_lock:
+            return not self.pending_bypass
+
+    def _bypass_want_body(self, job):
+        directory = directory_of(job.url.rstrip("/"))
+        return lambda s: bypass_worked(s) and self._body_matters(directory, s)
+
+    def _finish_bypass(self, job, status, content):
+        if status is None:
+            return  # transport error: says nothing about the technique
+        if self.baseline is not None:
+            self.baseline.check(job.probe_url)
+        directory = directory_of(job.url.rstrip("/"))
+        success = self._handle_bypass_response(directory, job.probe_url, job.label, status, content)
+        self.bypass_tracker.record(job.url, job.technique, success)
+
+    def _bypass_probe(self, job):
+        # re-checked here: failures recorded since the job was queued may prune it
+        if not self.bypass_tracker.should_try(job.url, job.technique):
+            return
+        started = time.perf_counter()
+        time.sleep(self._next_delay(job.probe_url))
+        response = self.send_request(job.probe_url, extra_headers=job.headers, want_body=self._bypass_want_body(job))
+        self._cache_response("bypass", job.url, job.label, response, variant=job.technique)
+        self._finish_bypass(job, response.status, response.content)
+        self.metrics.observe("bypass", time.perf_counter() - started)
+
+    def _bypass_worker(self):
+        while not self.shutdown_event.is_set():
+            try:
+                job = self.bypass_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                self._bypass_probe(job)
+            except Exception as e:
+                self.metrics.error(e)
+                log_error(f"Bypass probe failed for {job.probe_url}: {e}")
+            finally:
+                self._bypass_done(job)
+                self.bypass_queue.task_done()
+
+    def _handle_bypass_response(self, directory, probe_url, technique, status, content):
+        """Display and record a bypass probe that got through. Returns True on success."""
+        self.metrics.count("bypass_requests")
+        if not bypass_worked(status):
+            return False
+        if self.calibrator and self.calibrator.is_wildcard(directory, None, status, content, probe_url):
+            return False
+        verdict = self._classify(probe_url, status, content)
+        if not verdict.accepted:
+            return False
+        label = "Bypass Success" if technique == "path" else "Header Bypass"
+        self.metrics.count("bypass_hits")
+        self._display(probe_url, status, label)
+        result = {"url": probe_url, "status": status, "bypass": technique}
+        if verdict.signatures:
+            result["signatures"] = verdict.signatures
+        self._record_result(result)
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Response classification
+    # ------------------------------------------------------------------ #
+    def _classify(self, path, status, content):
+        started = time.perf_counter()
+        try:
+            return self.classifier.classify(path, status, content)
+        finally:
+            self.metrics.observe("content_filter", time.perf_counter() - started)
+
+    def _cache_response(self, role, source, detail, response, variant=""):
+        """Keep a response in the --cache file (not errors, not 304s: nothing to judge again)."""
+        if self.cache is not None and response.status not in (None, 304):
+            self.cache.put(
+                role, response.url, variant, source, detail,
+                response.status, response.location, response.headers, response.content,
+            )
+
+    # ------------------------------------------------------------------ #
+    # Shared result handling (used by every engine)
+    # ------------------------------------------------------------------ #
+    def _display(self, url, status, label, severity=None):
+        if self.displayed_urls.add(url):
+            self.dashboard.record(status, url, label, severity)
+
+    def _record_result(self, result):
+        if self.scheduler is not None:
+            result["host"] = host_of(result["url"])
+        # a URL in flight at the last checkpoint is probed again on resume
+        if self._restored_results and _result_key(result) in self._restored_results:
+            return
+        if self.scheduler is not None:
+            self.context.tag_result(result)
+        self.results.write(result)
+        self.context.add_discovery_result(result)
+
+    def _enqueue_task(self, base_url, path):
+        """Non-blocking enqueue (recursion); parks the task in overflow when the queue is full."""
+        with self.state_lock:
+            if (base_url, path) in self.pending_recursion:
+                return
+            self.pending_recursion.add((base_url, path))
+        self._put_task(base_url, path)
+
+    def _put_task(self, base_url, path):
+        with self.total_tasks_lock:
+            self.total_tasks += 1
+        if self.scheduler is not None:
+            self.scheduler.acquire(base_url)
+        task = (base_url, path, None, time.perf_counter())
+        try:
+            self.task_queue.put_nowait(task)
+        except (queue.Full, asyncio.QueueFull):
+            self.overflow.append(task)
+
+    def _drain_overflow(self):
+        while self.overflow:
+            try:
+                task = self.overflow.popleft()
+            except IndexError:
+                return
+            try:
+                self.task_queue.put_nowait(task)
+            except (queue.Full, asyncio.QueueFull):
+                self.overflow.appendleft(task)
+                return
+        if self.recursion_scheduler is not None:
+            self._feed_recursion()
+
+    def _feed_recursion(self):
+        """
+        Queue recursion tasks in priority order. They take at most half of
+        the queue, so the rest of the word list keeps moving as well.
+        """
+        while len(self.pending_recursion) < self.queue_size // 2 and not self.task_queue.full():
+            # taken and marked pending in one step, so a checkpoint sees it in one of the two
+            with self.state_lock:
+                task = self.recursion_scheduler.next_task()
+                if task is None:
+                    return
+                self.pending_recursion.add(task)
+            self._put_task(*task)
+
+    def _progress_state(self):
+        """(completed, total for display, finished?)"""
+        with self.total_tasks_lock:
+            completed = self.completed_tasks
+            total = self.total_tasks
+        fed = self.feed_done.is_set()
+        finished = fed and completed >= total and self.task_queue.empty() and self._bypass_idle()
+        if not fed:
+            total = max(total, self.estimated_tasks)
+        if self.recursion_scheduler is not None:
+            finished = finished and self.recursion_scheduler.idle
+            total += self.recursion_scheduler.remaining
+        return completed, total, finished
+
+    def _scan_directory(self, base_url):
+        """Directory URL that targets under base_url resolve into."""
+        return directory_of(urljoin(base_url, "_"))
+
+    def _calibration_needed(self, directory):
+        return self.calibrator is not None and not self.calibrator.is_calibrated(directory)
+
+    def _ensure_calibrated(self, directory):
+        """Learn the wildcard baseline of directory once, before its first probe."""
+        if not self._calibration_needed(directory):
+            return
+        with self.calibrator.lock_for(directory):
+            if self.calibrator.is_calibrated(directory):
+                return
+            for kind, probe_url in self.calibrator.probes(directory):
+                time.sleep(self._next_delay(probe_url))
+                response = self.send_request(probe_url)
+                self._cache_response("calibration", directory, kind, response)
+                self.calibrator.learn(directory, kind, response.status, response.content, response.url, response.location)
+            self.calibrator.finish(directory)
+
+    def _pending_targets(self, base_url, path):
+        """Expand a word into (target, full_url) pairs not scanned yet."""
+        directory = self._scan_directory(base_url)
+        extensions = self.extensions
+        if self.extension_planner is not None:
+            extensions = self.extension_planner.extensions_for(directory)
+        targets = [path + "/"] + [f"{path}.{ext}" for ext in extensions]
+        if self.baseline is not None:
+            targets, skipped = self.baseline.select(directory, path, targets, self.extensions)
+            if skipped:
+                self.metrics.count("baseline", "skipped", skipped)
+        pending = []
+        for target in targets:
+            full_url = urljoin(base_url, target)
+            if self.visited.add(full_url):
+                pending.append((target, full_url))
+        return pending
+
+    def _accept_response(self, directory, target, full_url, status, content, location=None):
+        """Apply status/wildcard/content filters and display a hit. Returns its Classification, or None."""
+        if status not in self.status_filter:
+            return None
+        if self.calibrator and self.calibrator.is_wildcard(
+            directory, target_kind(target), status, content, full_url, location
+        ):
+            return None
+        verdict = self._classify(target, status, content)
+        if not verdict.accepted:
+            return None
+        label = verdict.severity
+        if verdict.signatures:
+            label += f" [{', '.join(verdict.signatures)}]"
+        self._display(full_url, status, f"{label} → {location}" if location else label, verdict.severity)
+        return verdict
+
+    def _finish_hit(self, directory, target, full_url, status, verdict, location=None, headers=None):
+        """Record a hit and schedule recursion into directories."""
+        result = {"url": full_url, "status": status, "severity": verdict.severity}
+        if location:
+            result["location"] = location
+        if verdict.signatures:
+            result["signatures"] = verdict.signatures
+        validators = validators_of(headers) if headers is not None else None
+        if validators:
+            result.update(validators)
+        signature = directory_signature(verdict.fingerprint, location) if self._recurses_into(target, status) else None
+        self._record_hit(directory, target, full_url, result, signature)
+
+    def _record_hit(self, directory, target, full_url, result, signature=None):
+        """Record the hit of target, probed in directory (target may span several segments)."""
+        self.metrics.count("hits")
+        self._record_result(result)
+        if self.extension_planner is not None:
+            self.extension_planner.record_hit(directory, target, result["status"])
+        if self._recurses_into(target, result["status"]):
+            self.recursion_scheduler.add(full_url, directory, result["status"], signature)
+
+    def _probe_failed(self, full_url, error):
+        """A probe raised: logged, and the other targets of its word still go out."""
+        self.metrics.error(error)
+        log_error(f"Error probing {full_url}: {error}")
+
+    def _recurses_into(self, target, status):
+        return (
+            self.recursion_scheduler is not None
+            and target.endswith("/")
+            and status != 404
+            and not names_file(target)
+        )
+
+    # ------------------------------------------------------------------ #
+    # Incremental rescan (baseline)
+    # ------------------------------------------------------------------ #
+    def _conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since for a hit of the baseline scan, else None."""
+        if self.baseline is None:
+            return None
+        headers = self.baseline.conditional_headers(url)
+        if headers:
+            self.metrics.count("baseline", "revalidated")
+        return headers
+
+    def _not_modified(self, directory, target, full_url, status):
+        """
+        Note a probe of a known URL; on a 304 its baseline result is carried
+        forward (no body was sent). Returns True when the probe is handled.
+        """
+        if self.baseline is None or status is None:
+            return False
+        self.baseline.check(full_url)
+        previous = self.baseline.previous(full_url)
+        if status != 304 or previous is None:
+            return False
+        self.metrics.count("baseline", "not_modified")
+        result = {key: value for key, value in previous.items() if key != "host"}
+        self._display(full_url, result["status"], "unchanged", result.get("severity"))
+        validator = result.get("etag") or result.get("last_modified")
+        self._record_hit(directory, target, full_url, result, directory_signature(validator, result.get("location")))
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Checkpoint / resume
+    # ------------------------------------------------------------------ #
+    def _url_done(self, full_url):
+        """full_url and everything it triggered (bypass, recursion) is recorded."""
+        if self.checkpointer is not None:
+            with self.state_lock:
+                self._completed_urls.append(full_url)
+
+    def _complete_task(self, base_url, path, index):
+        if self.scheduler is not None:
+            self.scheduler.release(base_url)
+        with self.total_tasks_lock:
+            self.completed_tasks += 1
+        with self.state_lock:
+            if index is None:
+                self.pending_recursion.discard((base_url, path))
+                return
+            self._words_done.add(index)
+            while self.word_cursor in self._words_done:
+                self._words_done.remove(self.word_cursor)
+                self.word_cursor += 1
+
+    def _identity(self, targets, wordlist_path, words):
+        identity = {
+            "target": targets[0] if len(targets) == 1 else targets,
+            "wordlist": os.path.abspath(wordlist_path),
+            "words": words,
+            "extensions": list(self.extensions),
+        }
+        if self.baseline is not None:
+            identity["baseline"] = os.path.abspath(self.baseline.path)
+        return identity
+
+    def _restore_checkpoint(self, identity):
+        """
+        Load resume_path into this scan. Returns (wordlist index to feed
+        from, results recorded up to the checkpoint, completed URLs), or None.
+        """
+        try:
+            state, completed = load_checkpoint(self.resume_path)
+            results = list(iter_results(state["results_path"], state["results_offset"]))
+        except (OSError, ValueError, KeyError) as e:
+            log_error(f"Cannot resume from {self.resume_path}: {e}")
+            return None
+        if state.get("scan") != identity:
+            log_error(f"Checkpoint {self.resume_path} belongs to a different scan (target, wordlist, extensions or baseline changed)")
+            return None
+
+        for url in completed:
+            self.visited.add(url)
+            if self.baseline is not None:
+                self.baseline.check(url)
+
+        cursor = state["cursor"]
+        self.word_cursor = cursor
+        with self.total_tasks_lock:
+            self.total_tasks += cursor
+            self.completed_tasks += cursor
+        if self.recursion_scheduler is not None:
+            self.recursion_scheduler.restore(state.get("recursion", {}))
+        for base_url, path in state["pending"]:
+            self._enqueue_task(base_url, path)
+        for url in state.get("bypass", []):
+            self._queue_bypass(url)
+
+        log_info(
+            f"Resuming {self.resume_path}: {cursor}/{self.estimated_tasks} tasks done, "
+            f"{len(completed)} URLs completed, {len(state['pending'])} recursion tasks pending, "
+            f"{len(results)} results"
+        )
+        return cursor, results, completed
+
+    def _start_outputs(self, targets, wordlist_path, words):
+        """
+        Open the result sink and checkpoint files, restoring both when
+        resuming. Returns the task index to feed from, or None.
+        """
+        self._scan_identity = self._identity(targets, wordlist_path, words)
+        start, restored, completed = 0, [], ()
+        if self.resume_path:
+            resumed = self._restore_checkpoint(self._scan_identity)
+            if resumed is None:
+                return None
+            start, restored, completed = resumed
+
+        self.results = ResultWriter(self._results_path())
+        self.context.attach_results(self.results.read)
+        for result in restored:
+            if self.scheduler is not None:
+                self.context.tag_result(result)
+            self.results.write(result)
+            self.context.add_discovery_result(result)
+            self._restored_results.add(_result_key(result))
+
+        if self.checkpoint_path:
+            self.checkpointer = Checkpointer(self.checkpoint_path, self.checkpoint_interval)
+            self.checkpointer.start(completed)
+        return start
+
+    def _checkpoint(self, finished=False, force=True):
+        if self.checkpointer is None or not (force or self.checkpointer.due()):
+            return
+        # one consistent cut: nothing completes while the snapshot is taken
+        with self.state_lock:
+            completed_urls, self._completed_urls = self._completed_urls, []
+            state = {
+                "scan": self._scan_identity,
+                "cursor": self.word_cursor,
+                "pending": sorted(self.pending_recursion),
+                "recursion": self.recursion_scheduler.state() if self.recursion_scheduler is not None else {},
+                "bypass": sorted(self.pending_bypass),
+                "results_path": os.path.abspath(self.results.path),
+                "results_offset": self.results.flush(),
+                "results_count": self.results.count,
+                "finished": finished,
+            }
+        try:
+            self.checkpointer.write(state, completed_urls)
+        except OSError as e:
+            log_error(f"Checkpoint failed: {e}")
+
+    def _close_checkpoints(self, finished):
+        if self.checkpointer is None:
+            return
+        self._checkpoint(finished=finished)
+        self.checkpointer.close()
+        log_info(
+            f"Checkpoint: {self.checkpoint_path} ({self.checkpointer.writes} writes"
+            f"{', scan complete' if finished else f', resume with --resume {self.checkpoint_path}'})"
+        )
+
+    # ------------------------------------------------------------------ #
+    # Metrics exposure
+    # ------------------------------------------------------------------ #
+    def _start_metrics(self):
+        if self.metrics_port is not None:
+            try:
+                self.metrics_server = MetricsServer(self.metrics, self.metrics_port).start()
+                log_info(f"Metrics: serving {self.metrics_server.url}")
+            except OSError as e:
+                log_error(f"Cannot serve metrics on port {self.metrics_port}: {e}")
+        if self.metrics_path:
+            self.metrics_dumper = MetricsDumper(self.metrics, self.metrics_path, self.metrics_interval)
+
+    def _poll_metrics(self, force=False):
+        if self.metrics_dumper is None:
+            return
+        try:
+            self.metrics_dumper.poll(force)
+        except OSError as e:
+            log_error(f"Metrics dump failed: {e}")
+
+    def _stop_metrics(self):
+        self._poll_metrics(force=True)
+        if self.metrics_dumper is not None:
+            log_info(f"Metrics written to {self.metrics_path}")
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+
+    # ------------------------------------------------------------------ #
+    # Worker thread
+    # ------------------------------------------------------------------ #
+    def _worker(self):
+        while not self.shutdown_event.is_set():
+            try:
+                base_url, path, index, queued = self.task_queue.get(timeout=1)
+            except queue.Empty:
+                if self.shutdown_event.is_set():
+                    break
+                continue
+
+            self.metrics.observe("queue_wait", time.perf_counter() - queued)
+            try:
+                self._process_path(base_url, path)
+            except Exception as e:
+                self.metrics.error(e)
+                log_error(f"Error processing {path}: {e}")
+            finally:
+                self._complete_task(base_url, path, index)
+                self._drain_overflow()
+                self.task_queue.task_done()
+
+    # ------------------------------------------------------------------ #
+    # Process a single path (plus extension fuzzing)
+    # ------------------------------------------------------------------ #
+    def _probe(self, directory, target, full_url):
+        time.sleep(self._next_delay(full_url))
+        response = self.send_request(
+            full_url,
+            extra_headers=self._conditional_headers(full_url),
+            want_body=lambda s: s in self.status_filter and self._body_matters(directory, s),
+        )
+        self._cache_response("probe", directory, target, response)
+        status, content, _, location, headers = response
+        if self._not_modified(directory, target, full_url, status):
+            return
+
+        verdict = self._accept_response(directory, target, full_url, status, content, location)
+        if verdict is None:
+            return
+
+        if status in (403, 401):
+            self._queue_bypass(full_url)
+
+        self._finish_hit(directory, target, full_url, status, verdict, location, headers)
+
+    def _process_path(self, base_url, path):
+        directory = self._scan_directory(base_url)
+        pending = self._pending_targets(base_url, path)
+        if pending:
+            self._ensure_calibrated(directory)
+
+        for target, full_url in pending:
+            try:
+                self._probe(directory, target, full_url)
+            except Exception as e:
+                self._probe_failed(full_url, e)
+                continue
+            self._url_done(full_url)
+
+    # ------------------------------------------------------------------ #
+    # Render current UI state
+    # ------------------------------------------------------------------ #
+    def _render_ui(self, task_id):
+        started = time.perf_counter()
+        panel = Panel(
+            Group(self.progress_bar, self.dashboard.render()),
+            title=f"✅ Found: {self.results.count} | Progress",
+            border_style="cyan"
+        )
+        self.metrics.observe("ui", time.perf_counter() - started)
+        return panel
+
+    def _live_view(self, task_id):
+        """Rich Live panel, rebuilt on every refresh (bounded), or nothing when headless."""
+        if not self.ui:
+            return contextlib.nullcontext()
+        return Live(get_renderable=lambda: self._render_ui(task_id), refresh_per_second=5, console=console)
+
+    def _update_view(self, task_id, completed, total, final=False):
+        self.progress_bar.update(task_id, completed=completed, total=total)
+        if self.ui:
+            return
+        self._print_hits()
+        now = time.monotonic()
+        if final or now - self._last_progress_log >= HEADLESS_PROGRESS_INTERVAL:
+            self._last_progress_log = now
+            log_info(f"Progress: {completed}/{total} tasks, {self.results.count} results")
+
+    def _print_hits(self):
+        for status, url, label, _ in self.dashboard.drain():
+            print(f"{status}\t{url}\t{label}", flush=True)
+
+    # ------------------------------------------------------------------ #
+    # Run scan
+    # ------------------------------------------------------------------ #
+    def run(self, base_url, wordlist_path):
+        """Scan base_url, or a list of targets sharing one wordlist and worker pool."""
+        if not os.path.exists(wordlist_path):
+            log_error(f"Wordlist not found: {wordlist_path}")
+            return
+
+        # progress total comes from a cheap line count; words are streamed
+        targets = [base_url] if isinstance(base_url, str) else list(base_url)
+        words = self._plan(targets, wordlist_path)
+        start = self._start_outputs(targets, wordlist_path, words)
+        if start is None:
+            return
+        task_id = self.progress_bar.add_task("Scanning", total=self.estimated_tasks)
+        self._start_metrics()
+
+        feeder = threading.Thread(target=self._feed, args=(self._tasks(targets, wordlist_path, start),), daemon=True)
+        feeder.start()
+
+        # start workers (discovery, then the bypass stage)
+        threads = []
+        for _ in range(self.threads):
+            t = threading.Thread(target=self._worker, daemon=True)
+            t.start()
+            threads.append(t)
+        for _ in range(self.bypass_threads):
+            t = threading.Thread(target=self._bypass_worker, daemon=True)
+            t.start()
+            threads.append(t)
+
+        # live UI
+        finished = False
+        with self._live_view(task_id):
+            try:
+                while True:
+                    completed, total, finished = self._progress_state()
+                    self._update_view(task_id, completed, total)
+
+                    if finished:
+                        break
+                    self._drain_overflow()
+                    self.results.poll()
+                    self._checkpoint(force=False)
+                    self._poll_metrics()
+                    time.sleep(0.5)
+            except KeyboardInterrupt:
+                pass
+            finally:
+                # release idle workers (normal finish or interrupt)
+                self.shutdown_event.set()
+
+        # join workers
+        for t in threads + [feeder]:
+            t.join()
+        self._update_view(task_id, *self._progress_state()[:2], final=True)
+
+        self._close_checkpoints(finished)
+        self._report_stats()
+        self._stop_metrics()
+        self.transport.close()
+
+        # save data
+        self._save_all_formats()
+
+    def replay(self, cache):
+        """
+        Judge the responses of an earlier scan's --cache again with this
+        discoverer's filters (status codes, calibration, include / exclude
+        regex, rules), without sending a request: calibration samples
+        first, then every probe, then the bypass probes of the 403/401
+        hits that are still results. Hits are printed as plain lines; the
+        results are saved like run saves them.
+        """
+        started = time.perf_counter()
+        self.results = ResultWriter(self._results_path())
+        self.context.attach_results(self.results.read)
+        replayed = 0
+
+        if self.calibrator is not None:
+            directories = set()
+            for record in cache.records("calibration"):
+                self.calibrator.learn(
+                    record.source, record.detail, record.status, record.content, record.url, record.location
+                )
+                directories.add(record.source)
+                replayed += 1
+            for directory in directories:
+                self.calibrator.finish(directory)
+
+        blocked = set()  # 403/401 hits whose bypass probes count
+        for record in cache.records("probe"):
+            replayed += 1
+            verdict = self._accept_response(
+                record.source, record.detail, record.url, record.status, record.content, record.location
+            )
+            if verdict is not None:
+                if record.status in (403, 401):
+                    blocked.add(record.url)
+                self._finish_hit(record.source, record.detail, record.url, record.status, verdict, record.location, record.headers)
+                self._print_hits()
+
+        for record in cache.records("bypass"):
+            replayed += 1
+            if record.source in blocked:
+                directory = directory_of(record.source.rstrip("/"))
+                self._handle_bypass_response(directory, record.url, record.detail, record.status, record.content)
+                self._print_hits()
+
+        log_info(f"Replay: {replayed} cached responses from {cache.path} in {time.perf_counter() - started:.1f}s")
+        self._report_calibration_stats()
+        self._report_result_stats()
+        self.transport.close()
+        self._save_all_formats()
+
+    # ------------------------------------------------------------------ #
+    # End-of-scan report
+    # ------------------------------------------------------------------ #
+    def _report_stats(self):
+        self._report_transport_stats()
+        self._report_dedupe_stats()
+        self._report_redirect_stats()
+        self._report_bypass_stats()
+        self._report_rate_stats()
+        self._report_calibration_stats()
+        self._report_recursion_stats()
+        self._report_extension_stats()
+        self._report_baseline_stats()
+        self._report_cache_stats()
+        self._report_result_stats()
+        self._report_host_stats()
+        self._report_metrics()
+
+    def _report_redirect_stats(self):
+        stats = self.redirect_cache.stats()
+        if stats["fetches"]:
+            log_info(
+                f"Redirects: {stats['fetches']} targets fetched, "
+                f"{stats['hits']} redirects served from cache"
+            )
+
+    def _report_bypass_stats(self):
+        stats = self.bypass_tracker.stats()
+        if not stats["probes"] and not stats["skipped"]:
+            return
+        log_info(
+            f"Bypass: {stats['probes']} probes, {stats['successes']} succeeded, "
+            f"{stats['skipped']} skipped (failing technique for the directory or host)"
+        )
+        for host, technique in stats["pruned"]:
+            log_info(f"Bypass: {technique} pruned on {host} after {self.bypass_tracker.prune_after} failures")
+
+    def _report_dedupe_stats(self):
+        stats = self.visited.stats()
+        detail = f"{stats['kind']}, {stats['bytes'] / 1024:.0f} KiB"
+        if stats["fp_rate"]:
+            detail += f", fp ≤ {stats['fp_rate']:g}"
+        log_info(f"Dedupe: {stats['entries']} URLs tracked ({detail})")
+
+    def _report_rate_stats(self):
+        if self.host_governors:
+            stats = {host: governor.stats() for host, governor in self.host_governors.items()}
+            throttled = sorted((s["backoffs"], host) for host, s in stats.items() if s["backoffs"])[-3:]
+            most = ", ".join(f"{host} {backoffs}" for backoffs, host in reversed(throttled))
+            log_info(
+                f"Rate: {len(stats)} hosts, {sum(s['rate'] for s in stats.values()):.1f} req/s combined at end, "
+                f"{sum(s['backoffs'] for s in stats.values())} backoffs" + (f" (most: {most})" if most else "")
+            )
+            return
+        stats = self.governor.stats()
+        log_info(
+            f"Rate: {stats['rate']:.1f} req/s at end (peak {stats['peak_rate']:.1f}), "
+            f"{stats['backoffs']} backoffs"
+        )
+
+    def _report_result_stats(self):
+        if not self.context.count:
+            return
+        statuses = ", ".join(f"{status} ×{count}" for status, count in sorted(self.context.results_by_status.items(), key=str))
+        log_info(f"Results: {self.context.count} ({statuses})")
+
+    def _report_host_stats(self):
+        if len(self.context.targets) < 2:
+            return
+        by_host = self.context.results_by_host
+        top = ", ".join(f"{host} {count}" for host, count in by_host.most_common(10))
+        log_info(f"Hosts: {len(self.context.targets)} targets, {len(by_host)} with results" + (f" ({top})" if top else ""))
+
+    def _report_calibration_stats(self):
+        if self.calibrator is None:
+            return
+        stats = self.calibrator.stats()
+        log_info(
+            f"Calibration: {stats['directories']} directories baselined, "
+            f"{stats['dropped']} wildcard responses dropped"
+        )
+
+    def _report_recursion_stats(self):
+        if self.recursion_scheduler is None:
+            return
+        stats = self.recursion_scheduler.stats()
+        log_info(
+            f"Recursion: {stats['directories']} directories scheduled, "
+            f"{stats['skipped']} skipped beyond depth {self.max_depth}"
+            + (f", {stats['queued']} left unscanned" if stats["queued"] else "")
+        )
+
+    def _report_extension_stats(self):
+        if self.extension_planner is None:
+            return
+        stats = self.extension_planner.stats()
+        detected = ", ".join(stats["technologies"][:10])
+        log_info(
+            f"Extensions: {stats['skipped']} probes skipped, {stats['pruned']} directories pruned"
+            + (f" (detected: {detected})" if detected else "")
+        )
+
+    def _report_baseline_stats(self):
+        if self.baseline is None:
+            return
+        counts = self.metrics.counters().get("baseline", {})
+        log_info(
+            f"Baseline: {len(self.baseline)} known results from {self.baseline.path}, "
+            f"{counts.get('revalidated', 0)} revalidated ({counts.get('not_modified', 0)} not modified), "
+            f"{counts.get('skipped', 0)} probes of past misses skipped"
+        )
+
+    def _report_cache_stats(self):
+        if self.cache is None:
+            return
+        stats = self.cache.stats()
+        log_info(
+            f"Cache: {stats['stored']} responses stored in {self.cache.path} "
+            f"({stats['entries']} entries, {stats['bytes'] / 1024 / 1024:.1f} MiB, {stats['evicted']} evicted)"
+        )
+
+    def _report_metrics(self):
+        lines = self.metrics.report_lines()
+        if lines:
+            log_info("Metrics:\n  " + "\n  ".join(lines))
+
+    def _report_transport_stats(self):
+        stats = self.transport.stats()
+        log_info(
+            f"Transport: {stats['requests']} requests over {stats['connections']} connections "
+            f"({stats['reused']} reused, {stats['reuse_ratio']:.1%} reuse, {self.transport.session_mode} sessions)"
+        )
+        if "http2" in stats:
+            fallback = f"; HTTP/1.1 fallback for {', '.join(stats['h1_hosts'])}" if stats["h1_hosts"] else ""
+            log_info(f"HTTP/2: {stats['http2']} of {stats['requests']} requests multiplexed over h2{fallback}")
+
+    # ------------------------------------------------------------------ #
+    # Output filename helpers
+    # ------------------------------------------------------------------ #
+    def _results_path(self):
+        return results_path_for(self.output_base)
+
+    def _changes_path(self):
+        """<base>.changes.jsonl next to the result file."""
+        return self._results_path()[: -len(".jsonl")] + ".changes.jsonl"
+
+    def _normalized_output_paths(self):
+        """
+        Build path per format. If output_base has an extension matching fmt, use it.
+        Else append .fmt
+        """
+        paths = {}
+        base = self.output_base
+        lower = base.lower()
+        for fmt in self.formats:
+            ext = f".{fmt}"
+            if lower.endswith(ext):
+                paths[fmt] = base
+            else:
+                paths[fmt] = base + ext
+        return paths
+
+    # ------------------------------------------------------------------ #
+    # Save results (multi-format)
+    # ------------------------------------------------------------------ #
+    def _save_all_formats(self):
+        self.context.close()  # flushes an SQLite result store; queries still work
+        if self.cache is not None:
+            self.cache.close()
+        if self.results is None:
+            return
+        self.results.close()
+
+        if self.results.count:
+            log_info(f"JSONL results streamed to {self.results.path}")
+        source = self.results if self.baseline is None else self._write_changes()
+        if not source.count:
+            log_info("No results to save." if self.baseline is None else "No changes since the baseline.")
+            return
+
+        self.saved = True
+        paths = self._normalized_output_paths()
+        errors = convert_results(source.path, paths, fields=list(source.fields))
+        for fmt, path in paths.items():
+            if fmt in errors:
+                log_error(f"Failed to save {fmt.upper()}: {errors[fmt]}")
+            elif fmt in CONVERTERS:
+                log_info(f"{fmt.upper()} results saved to {path}")
+
+    def _write_changes(self):
+        """
+        Diff the results against the baseline into <base>.changes.jsonl
+        (what the --format files are converted from). Returns its writer.
+        """
+        changes = ResultWriter(self._changes_path())
+        try:
+            for change in self.baseline.diff(iter_results(self.results.path)):
+                changes.write(change)
+        finally:
+            changes.close()
+        counts = self.baseline.changes
+        log_info(
+            f"Changes since the baseline: {counts['new']} new, {counts['changed']} changed, {counts['gone']} gone "
+            f"({counts['unchanged']} unchanged, {counts['unchecked']} not probed again) -> {changes.path}"
+        )
+        return changes
+
+
+# --------------------------------------------------------------------------- #
+# Standalone CLI (for quick testing of module directly)
+# --------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ContentDiscoverer (module test)")
+    parser.add_argument("url", help="Base URL to scan")
+    parser.add_argument("--wordlist", default="wordlists/common.txt", help="Path to wordlist file")
+    parser.add_argument("--threads", type=int, default=30, help="Number of concurrent threads")
+    parser.add_argument("--delay", type=float, default=None, help="Per-thread delay; caps the rate at threads/delay")
+    parser.add_argument("--profile", default="balanced", choices=["stealth", "balanced", "aggressive"], help="Scan profile")
+    parser.add_argument("--recursion", action="store_true", help="Enable recursive scanning")
+    parser.add_argument("--include-regex", default=None, help="Regex to include in response content")
+    parser.add_argument("--exclude-regex", default=None, help="Regex to exclude in response content")
+    parser.add_argument("--proxy", default=None, help="Proxy URL to use for requests")
+    parser.add_argument("-o", "--output", default="scan_results", help="Output base filename")
+    parser.add_argument("--format", default="json", help="Comma-separated formats: json,csv,txt or 'all'")
+    parser.add_argument("--no-verify", action="store_true", help="Disable SSL verification")
+    args = parser.parse_args()
+
+    # Build formats list
+    formats = [f.strip().lower() for f in args.format.split(",")]
+    if "all" in formats:
+        formats = ["json", "csv", "txt"]
+
+    # Build context (minimal)
+    ctx = ScanContext(target_url=args.url, wordlist_path=args.wordlist)
+    ctx.verify_ssl = not args.no_verify
+
+    discoverer = ContentDiscoverer(
+        context=ctx,
+        threads=args.threads,
+        delay=args.delay,
+        recursion=args.recursion,
+        proxies={"http": args.proxy, "https": args.proxy} if args.proxy else None,
+        profile=args.profile,
+        include_regex=args.include_regex,
+        exclude_regex=args.exclude_regex,
+        output_path=args.output,
+        formats=formats,
+        verify_ssl=ctx.verify_ssl,
+    )
+
+    console.print(f"[bold cyan]🚀 Starting {args.profile.upper()} scan on: {args.url}[/bold cyan]")
+    console.print(f"[bold green]📂 Using wordlist: {os.path.abspath(args.wordlist)}[/bold green]")
+
+    discoverer.run(args.url, args.wordlist)
@@ -0,0 +1,375 @@
+import hashlib
+import math
+import multiprocessing
+import threading
+from array import array
+
+DEDUPE_KINDS = ("exact", "bloom")
+DEFAULT_SHARDS = 64
+DEFAULT_FP_RATE = 0.0001
+DEFAULT_CAPACITY = 1 << 20
+
+
+def _digest(url):
+    digest = hashlib.blake2b(url.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+# --------------------------------------------------------------------------- #
+# Exact (hashed) URL set
+# --------------------------------------------------------------------------- #
+class _KeyTable:
+    """Open-addressing table of non-zero 64-bit keys packed in an array('Q')."""
+
+    __slots__ = ("slots", "mask", "count")
+
+    def __init__(self, size=1024):
+        self.slots = array("Q", bytes(8 * size))
+        self.mask = size - 1
+        self.count = 0
+
+    def _find(self, key):
+        slots, mask = self.slots, self.mask
+        i = key & mask
+        while slots[i] and slots[i] != key:
+            i = (i + 1) & mask
+        return i
+
+    def __contains__(self, key):
+        return self.slots[self._find(key)] == key
+
+    def add(self, key):
+        i = self._find(key)
+        if self.slots[i] == key:
+            return False
+        self.slots[i] = key
+        self.count += 1
+        if self.count * 10 > len(self.slots) * 7:
+            self._grow()
+        return True
+
+    def _grow(self):
+        old = self.slots
+        self.slots = array("Q", bytes(16 * len(old)))
+        self.mask = len(self.slots) - 1
+        for key in old:
+            if key:
+                self.slots[self._find(key)] = key
+
+
+class HashedUrlSet:
+    """
+    Thread-safe URL set that stores a 64-bit digest per URL instead of the
+    string, in `shards` independently locked open-addressing tables
+    (~12 bytes per URL, whatever its length).
+
+    A collision needs ~4 billion URLs before it becomes likely, so this is
+    exact for any realistic scan.
+    """
+
+    kind = "exact"
+
+    def __init__(self, shards: int = DEFAULT_SHARDS):
+        self._shards = [_KeyTable() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    @staticmethod
+    def _key(url):
+        key, spread = _digest(url)
+        return key or 1, spread  # 0 marks an empty slot
+
+    def add(self, url):
+        """Insert url. Returns True if it was not present (test-and-set)."""
+        key, spread = self._key(url)
+        shard = spread % len(self._shards)
+        with self._locks[shard]:
+            return self._shards[shard].add(key)
+
+    def __contains__(self, url):
+        key, spread = self._key(url)
+        shard = spread % len(self._shards)
+        with self._locks[shard]:
+            return key in self._shards[shard]
+
+    def __len__(self):
+        return sum(table.count for table in self._shards)
+
+    def stats(self):
+        return {
+            "kind": self.kind,
+            "entries": len(self),
+            "fp_rate": 0.0,
+            "bytes": sum(table.slots.itemsize * len(table.slots) for table in self._shards),
+        }
+
+
+# --------------------------------------------------------------------------- #
+# Probabilistic URL set (scalable Bloom filter)
+# --------------------------------------------------------------------------- #
+_LCG_MULTIPLIER = 6364136223846793005
+_MASK64 = (1 << 64) - 1
+
+
+def _bloom_positions(h1, h2, hashes, size):
+    """
+    Bit positions of one URL: a 64-bit LCG seeded with h1 (increment h2).
+    Plain double hashing (h1 + i * h2) gives every URL an arithmetic
+    progression, and in small layers those overlap often enough to
+    multiply the false-positive rate.
+    """
+    positions = []
+    x = h1
+    for _ in range(hashes):
+        x = (x * _LCG_MULTIPLIER + h2) & _MASK64
+        positions.append((x >> 16) % size)
+    return positions
+
+
+def _bloom_shape(capacity, fp_rate):
+    """(bits, hash functions) of a Bloom filter holding capacity items at fp_rate."""
+    size = max(64, int(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+    return size, max(1, round(size / capacity * math.log(2)))
+
+
+class _BloomLayer:
+    __slots__ = ("bits", "size", "hashes", "capacity", "fp_rate", "count")
+
+    def __init__(self, capacity, fp_rate):
+        self.capacity = max(1, capacity)
+        self.fp_rate = fp_rate
+        self.size, self.hashes = _bloom_shape(self.capacity, fp_rate)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, h1, h2):
+        return _bloom_positions(h1, h2, self.hashes, self.size)
+
+    def __contains__(self, hashes):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(*hashes))
+
+    def add(self, hashes):
+        """Set url's bits. Returns True if at least one was clear (url was new)."""
+        bits = self.bits
+        new = False
+        for pos in self._positions(*hashes):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+
+class BloomUrlSet:
+    """
+    Sharded, scalable Bloom filter.
+
+    Memory is a few bytes per URL whatever its length. A false positive
+    makes an unseen URL look visited (it is skipped), with probability at
+    most fp_rate: each shard starts with one layer sized for its part of
+    `capacity` at fp_rate / 2 and, once full, adds a twice-as-large layer
+    at half the false-positive rate of the previous one.
+    """
+
+    kind = "bloom"
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, fp_rate: float = DEFAULT_FP_RATE, shards: int = DEFAULT_SHARDS):
+        if not 0 < fp_rate < 1:
+            raise ValueError(f"fp_rate must be between 0 and 1, got {fp_rate}")
+        self.fp_rate = fp_rate
+        per_shard = max(1, capacity // shards)
+        self._shards = [[_BloomLayer(per_shard, fp_rate / 2)] for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def add(self, url):
+        h1, h2 = _digest(url)
+        hashes = (h1, h2 | 1)
+        shard = h2 % len(self._shards)
+        with self._locks[shard]:
+            layers = self._shards[shard]
+            if any(hashes in layer for layer in layers[:-1]):
+                return False
+            current = layers[-1]
+            if not current.add(hashes):
+                return False
+            if current.count >= current.capacity:
+                layers.append(_BloomLayer(current.capacity * 2, current.fp_rate / 2))
+            return True
+
+    def __contains__(self, url):
+        h1, h2 = _digest(url)
+        hashes = (h1, h2 | 1)
+        return any(hashes in layer for layer in self._shards[h2 % len(self._shards)])
+
+    def __len__(self):
+        return sum(layer.count for layers in self._shards for layer in layers)
+
+    def stats(self):
+        return {
+            "kind": self.kind,
+            "entries": len(self),
+            "fp_rate": self.fp_rate,
+            "bytes": sum(len(layer.bits) for layers in self._shards for layer in layers),
+        }
+
+
+# --------------------------------------------------------------------------- #
+# URL sets shared between processes (--processes)
+# --------------------------------------------------------------------------- #
+class _SharedShards:
+    """
+    Fixed-size shard tables in one shared-memory array, each with its own
+    process-shared lock and entry count. The set is handed to worker
+    processes when they are spawned. Tables cannot grow once shared, so a
+    URL landing in a full shard goes to a per-process overflow set instead
+    (exact within that process, no longer seen by the others).
+    """
+
+    def __init__(self, typecode, shard_size, shards, mp_context=None):
+        ctx = mp_context or multiprocessing.get_context()
+        self._typecode = typecode
+        self._shard_size = shard_size
+        self._data = ctx.RawArray(typecode, shard_size * shards)
+        self._counts = ctx.RawArray("q", shards)
+        self._locks = [ctx.Lock() for _ in range(shards)]
+        self._attach()
+
+    def _attach(self):
+        self._view = memoryview(self._data).cast("B").cast(self._typecode)
+        self._overflow = None  # created on the first spill
+        self._overflow_lock = threading.Lock()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in ("_view", "_overflow", "_overflow_lock"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._attach()
+
+    def _spill(self, url):
+        if self._overflow is None:
+            with self._overflow_lock:
+                if self._overflow is None:
+                    self._overflow = self._new_overflow()
+        return self._overflow.add(url)
+
+    def _in_overflow(self, url):
+        return self._overflow is not None and url in self._overflow
+
+    def __len__(self):
+        return sum(self._counts) + (len(self._overflow) if self._overflow is not None else 0)
+
+    def stats(self):
+        overflow = self._overflow.stats()["bytes"] if self._overflow is not None else 0
+        return {
+            "kind": f"shared {self.kind}",
+            "entries": len(self),
+            "fp_rate": getattr(self, "fp_rate", 0.0),
+            "bytes": self._view.nbytes + overflow,
+        }
+
+
+class SharedUrlSet(_SharedShards):
+    """HashedUrlSet in shared memory: every process of a sharded scan sees every URL."""
+
+    kind = "exact"
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, shards: int = DEFAULT_SHARDS, mp_context=None):
+        size = 1 << max(10, (capacity * 10 // 7 // shards).bit_length())
+        self._limit = size * 9 // 10  # keeps every probe sequence short (and finite)
+        super().__init__("Q", size, shards, mp_context)
+
+    def _new_overflow(self):
+        return HashedUrlSet(shards=len(self._locks))
+
+    def _slot(self, key, shard):
+        """Index of key in shard's table, or of the empty slot where it would go."""
+        keys, mask, base = self._view, self._shard_size - 1, shard * self._shard_size
+        i = key & mask
+        while keys[base + i] and keys[base + i] != key:
+            i = (i + 1) & mask
+        return base + i
+
+    def add(self, url):
+        key, spread = HashedUrlSet._key(url)
+        shard = spread % len(self._locks)
+        with self._locks[shard]:
+            slot = self._slot(key, shard)
+            if self._view[slot] == key:
+                return False
+            if self._counts[shard] < self._limit:
+                self._view[slot] = key
+                self._counts[shard] += 1
+                return True
+        return self._spill(url)
+
+    def __contains__(self, url):
+        key, spread = HashedUrlSet._key(url)
+        shard = spread % len(self._locks)
+        with self._locks[shard]:
+            if self._view[self._slot(key, shard)] == key:
+                return True
+        return self._in_overflow(url)
+
+
+class SharedBloomUrlSet(_SharedShards):
+    """One Bloom layer per shard in shared memory; a full shard spills into a per-process BloomUrlSet."""
+
+    kind = "bloom"
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, fp_rate: float = DEFAULT_FP_RATE, shards: int = DEFAULT_SHARDS, mp_context=None):
+        if not 0 < fp_rate < 1:
+            raise ValueError(f"fp_rate must be between 0 and 1, got {fp_rate}")
+        self.fp_rate = fp_rate
+        self._capacity = max(1, capacity // shards)
+        self._bits, self._hashes = _bloom_shape(self._capacity, fp_rate / 2)
+        super().__init__("B", (self._bits + 7) // 8, shards, mp_context)
+
+    def _new_overflow(self):
+        return BloomUrlSet(capacity=self._capacity * len(self._locks), fp_rate=self.fp_rate / 2, shards=len(self._locks))
+
+    def _positions(self, h1, h2, shard):
+        base = shard * self._shard_size * 8
+        return [base + pos for pos in _bloom_positions(h1, h2, self._hashes, self._bits)]
+
+    def add(self, url):
+        h1, h2 = _digest(url)
+        shard = h2 % len(self._locks)
+        bits = self._view
+        positions = self._positions(h1, h2 | 1, shard)
+        with self._locks[shard]:
+            if all(bits[pos >> 3] & (1 << (pos & 7)) for pos in positions):
+                return False
+            if self._counts[shard] < self._capacity:
+                for pos in positions:
+                    bits[pos >> 3] |= 1 << (pos & 7)
+                self._counts[shard] += 1
+                return True
+        return self._spill(url)
+
+    def __contains__(self, url):
+        h1, h2 = _digest(url)
+        bits = self._view
+        positions = self._positions(h1, h2 | 1, h2 % len(self._locks))
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in positions) or self._in_overflow(url)
+
+
+def make_shared_url_set(kind: str = "exact", fp_rate: float = DEFAULT_FP_RATE, capacity: int = DEFAULT_CAPACITY, mp_context=None):
+    if kind == "exact":
+        return SharedUrlSet(capacity=capacity, mp_context=mp_context)
+    if kind == "bloom":
+        return SharedBloomUrlSet(capacity=capacity, fp_rate=fp_rate, mp_context=mp_context)
+    raise ValueError(f"Unknown dedupe kind: {kind}")
+
+
+def make_url_set(kind: str = "exact", fp_rate: float = DEFAULT_FP_RATE, capacity: int = DEFAULT_CAPACITY, shards: int = DEFAULT_SHARDS):
+    if kind == "exact":
+        return HashedUrlSet(shards=shards)
+    if kind == "bloom":
+        return BloomUrlSet(capacity=capacity, fp_rate=fp_rate, shards=shards)
+    raise ValueError(f"Unknown dedupe kind: {kind}")
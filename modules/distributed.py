@@ -0,0 +1,658 @@
+import _thread
+import contextlib
+import hmac
+import itertools
+import json
+import os
+import queue
+import secrets
+import socket
+import socketserver
+import threading
+import time
+from collections import deque, namedtuple
+from urllib.parse import urljoin
+
+from modules.baseline import result_identity, split_target
+from modules.classifier import read_rules
+from modules.output import ResultWriter
+from modules.rate import governor_for_profile
+from modules.scheduler import host_of
+from modules.sharding import SHARD_OVERRIDES, Shard, ShardAsyncContentDiscoverer, ShardContentDiscoverer, ShardedScan
+from utils.context import ScanContext
+from utils.logger import log_error, log_info
+
+DEFAULT_LEASE_SIZE = 64  # tasks (word or recursion task) per lease
+DEFAULT_LEASE_TIMEOUT = 30.0  # seconds without word from a worker before its leases are re-issued
+CONNECT_TIMEOUT = 10.0
+MAX_IDLE_WAITS = 20  # an idle worker asks for a lease again after up to this many feeder waits (~1s)
+TOKEN_ENV = "PATHHUNTER_TOKEN"  # shared secret of the coordinator and its workers
+
+# Wire format: one JSON line per message, [kind, worker id, *payload], and
+# one JSON object in reply. Kinds: join, lease, complete, results,
+# directory, progress, ping, failed, done. A connection must start with a
+# join carrying the coordinator's token, or it is refused with an "error"
+# reply. Any reply may carry "stop": the coordinator was interrupted and
+# the worker should stop too.
+Lease = namedtuple("Lease", "worker tasks")
+
+
+def parse_address(text):
+    """("host", port) from "host:port" ("[::1]:7070" for IPv6, ":7070" for loopback); raises ValueError."""
+    host, sep, port = text.rpartition(":")
+    if not sep or not port.isdigit() or int(port) > 65535:
+        raise ValueError(f"expected HOST:PORT, got {text!r}")
+    return host.strip("[]") or "127.0.0.1", int(port)
+
+
+def _hashable(value):
+    """JSON lists back to tuples (a recursion signature is a Counter key)."""
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+# --------------------------------------------------------------------------- #
+# Worker side
+# --------------------------------------------------------------------------- #
+class CoordinatorLink:
+    """
+    A worker's connection to the coordinator. Stands in for the shard link
+    (`put`), so the shard engines send results, hits and progress over TCP.
+    Calls are serialized: one message, then its reply. A lost connection or
+    a "stop" reply interrupts the worker's main thread once.
+    """
+
+    def __init__(self, address, timeout: float = CONNECT_TIMEOUT):
+        self.address = address
+        self._sock = socket.create_connection(address, timeout=timeout)
+        self._sock.settimeout(None)
+        self._file = self._sock.makefile("rwb")
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.lost = False
+
+    def call(self, kind, *payload):
+        with self._lock:
+            if self.lost:
+                raise ConnectionError("coordinator connection lost")
+            try:
+                self._file.write(json.dumps([kind, *payload]).encode("utf-8") + b"\n")
+                self._file.flush()
+                line = self._file.readline()
+                if not line:
+                    raise ConnectionError("coordinator closed the connection")
+                reply = json.loads(line)
+            except (OSError, ValueError) as e:
+                self.lost = True
+                log_error(f"Lost the coordinator at {self.address[0]}:{self.address[1]}: {e}")
+                self._stop()
+                raise ConnectionError(str(e)) from e
+        if reply.get("stop"):
+            self._stop()
+        return reply
+
+    def put(self, message):
+        self.call(*message)
+
+    def _stop(self):
+        if not self._stopped.is_set():
+            self._stopped.set()
+            _thread.interrupt_main()
+
+    def leave(self, worker, stats):
+        """Send the worker's final stats and disconnect (a "stop" in the reply no longer interrupts)."""
+        self._stopped.set()
+        try:
+            self.call("done", worker, stats)
+        except ConnectionError:
+            pass
+        self.close()
+
+    def close(self):
+        try:
+            self._file.close()
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class _RemoteRecursion:
+    """The worker's recursion scheduler: directories found go to the coordinator, which schedules them."""
+
+    idle = True
+    remaining = 0
+
+    def __init__(self, link, worker):
+        self.link = link
+        self.worker = worker
+
+    def add(self, directory, parent, status, signature=None):
+        self.link.call("directory", self.worker, directory, parent, status, signature)
+        return True
+
+    def next_task(self):
+        return None
+
+    def stats(self):
+        return {"directories": 0, "queued": 0, "skipped": 0}
+
+
+class _WorkerEngine:
+    """
+    Engine mixin for a worker process: tasks are leased from the coordinator
+    instead of read from a word list, and a lease is reported complete once
+    its tasks are done and the bypass stage has drained (so nothing a lease
+    triggered is lost with the worker). Results and hits travel like a
+    shard's; directories found go to the coordinator's recursion queue.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lease_of = {}  # task index -> lease id
+        self._open_leases = {}  # lease id -> tasks not done yet
+        self._done_leases = []
+
+    def _plan(self, targets, wordlist_path):
+        # the coordinator owns the word list, recursion queue and host fairness
+        if self.recursion:
+            self.recursion_scheduler = _RemoteRecursion(self.link, self.shard.index)
+        if len(targets) > 1:
+            self.host_governors = {host_of(t): governor_for_profile(**self._governor_settings) for t in targets}
+        return 0
+
+    def _governor_for(self, url):
+        return self.host_governors.get(host_of(url), self.governor)
+
+    def _tasks(self, targets, wordlist_path, start=0):
+        index = itertools.count()
+        idle = 0
+        while not self.shutdown_event.is_set():
+            reply = self.link.call("lease", self.shard.index)
+            if self.extension_planner is not None:
+                # every worker's hits steer extension pruning, as in one local scan
+                for directory, target, status in reply.get("hits", ()):
+                    self.extension_planner.record_hit(directory, target, status)
+            if reply.get("done"):
+                return
+            if not reply.get("tasks"):
+                # nothing to lease right now: the feeder waits, longer each time, and asks again
+                idle = min(2 * idle or 1, MAX_IDLE_WAITS)
+                for _ in range(idle):
+                    yield None
+                continue
+            idle = 0
+            with self.state_lock:
+                self._open_leases[reply["lease"]] = len(reply["tasks"])
+            for base_url, path in reply["tasks"]:
+                i = next(index)
+                with self.state_lock:
+                    self._lease_of[i] = reply["lease"]
+                yield base_url, path, i
+
+    def _complete_task(self, base_url, path, index):
+        with self.total_tasks_lock:
+            self.completed_tasks += 1
+        with self.state_lock:
+            lease = self._lease_of.pop(index)
+            self._open_leases[lease] -= 1
+            if not self._open_leases[lease]:
+                del self._open_leases[lease]
+                self._done_leases.append(lease)
+
+    def _report_leases(self):
+        with self.state_lock:
+            done, self._done_leases = self._done_leases, []
+        if not done:
+            return
+        if not self._bypass_idle():
+            with self.state_lock:
+                self._done_leases[:0] = done
+            return
+        # taken before the flush, so every result of these leases is sent ahead of them
+        self.results.flush()
+        self.link.call("complete", self.shard.index, done)
+
+    def _update_view(self, task_id, completed, total, final=False):
+        if not self.link.lost:
+            self._report_leases()
+            super()._update_view(task_id, completed, total, final)
+
+
+class WorkerContentDiscoverer(_WorkerEngine, ShardContentDiscoverer):
+    pass
+
+
+class WorkerAsyncContentDiscoverer(_WorkerEngine, ShardAsyncContentDiscoverer):
+    pass
+
+
+WORKER_ENGINES = {"thread": WorkerContentDiscoverer, "async": WorkerAsyncContentDiscoverer}
+
+
+def _heartbeat(link, worker, interval):
+    while not link.lost:
+        time.sleep(interval)
+        try:
+            link.call("ping", worker)
+        except ConnectionError:
+            return
+
+
+def run_worker(address, token):
+    """Join the coordinator at address (with its token) and scan what it leases until the scan is done."""
+    try:
+        link = CoordinatorLink(address)
+        config = link.call("join", None, token)
+    except (OSError, ConnectionError) as e:
+        log_error(f"Cannot join the coordinator at {address[0]}:{address[1]}: {e}")
+        return
+    if "error" in config:
+        log_error(f"The coordinator at {address[0]}:{address[1]} refused to let this worker join: {config['error']}")
+        link.close()
+        return
+
+    worker, targets = config["worker"], config["targets"]
+    discoverer = None
+    stats = {}
+    try:
+        context = ScanContext(target_url=targets[0], wordlist_path=None, targets=targets)
+        discoverer = WORKER_ENGINES[config["engine"]](
+            context=context, shard=Shard(worker, 1, targets, False), link=link,
+            **dict(config["options"], **SHARD_OVERRIDES),
+        )
+        log_info(f"Worker {worker}: joined {address[0]}:{address[1]} ({config['engine']} engine)")
+        threading.Thread(target=_heartbeat, args=(link, worker, config["lease_timeout"] / 3), daemon=True).start()
+        # tasks come from leases: the word list path only has to exist
+        discoverer.run(targets[0] if len(targets) == 1 else targets, os.devnull)
+        stats = discoverer.final_stats
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        # reported, so the coordinator does not wait for a worker that is gone
+        log_error(f"Worker {worker}: {e}")
+        with contextlib.suppress(ConnectionError):
+            link.call("failed", worker, f"{type(e).__name__}: {e}", discoverer is None)
+    finally:
+        try:
+            if discoverer is not None and discoverer.results is not None:
+                discoverer.results.close()
+        except ConnectionError:
+            pass
+        link.leave(worker, stats)
+    log_info(f"Worker {worker}: finished")
+
+
+# --------------------------------------------------------------------------- #
+# Coordinator side
+# --------------------------------------------------------------------------- #
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        scan = self.server.scan
+        try:
+            line = self.rfile.readline()
+            if not line:
+                return  # connected and left (a port check)
+            if not scan._admit(line):
+                log_error(f"Refused a worker from {self.client_address[0]}: wrong or missing token")
+                self.wfile.write(json.dumps({"error": "wrong or missing token"}).encode("utf-8") + b"\n")
+                return
+        except OSError:
+            return
+        worker = scan._connect(self.client_address)
+        try:
+            self.wfile.write(json.dumps(scan._dispatch(worker, "join", [])).encode("utf-8") + b"\n")
+            for line in self.rfile:
+                kind, _, *payload = json.loads(line)
+                reply = scan._dispatch(worker, kind, payload)
+                self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+        except (OSError, ValueError) as e:
+            log_error(f"Worker {worker}: {e}")
+        finally:
+            scan._disconnect(worker)
+
+
+class _CoordinatorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class DistributedScan(ShardedScan):
+    """
+    One scan spread over worker processes on any number of machines
+    (--coordinator, `main.py worker`).
+
+    The coordinator sends no probes. It owns the word list cursor (and the
+    HostScheduler of a batch scan), the recursion queue, task-level dedupe
+    and the results; workers connect over TCP, lease batches of tasks,
+    scan them with their own engine and stream results back. A lease
+    belongs to its worker until it reports it complete: when the worker
+    disconnects or is silent for lease_timeout seconds, its tasks are
+    leased again (results sent twice are written once).
+
+    A worker joins with the shared token (a random one is made when none
+    is given). Options are shipped in the join reply, with the content of a
+    rule file rather than its path. A worker that fails to set up its
+    engine stops the scan: every other worker gets the same options.
+
+    `discoverer` is the engine built in this process, as with ShardedScan:
+    it holds the results, live view, metrics and end report.
+    """
+
+    def __init__(self, discoverer, address, options: dict, lease_size: int = DEFAULT_LEASE_SIZE,
+                 lease_timeout: float = DEFAULT_LEASE_TIMEOUT, token: str = None):
+        super().__init__(discoverer, 1, options)
+        self.address = address
+        self.token = token or secrets.token_urlsafe(16)
+        self._token_generated = not token
+        self.lease_size = max(1, lease_size)
+        self.lease_timeout = lease_timeout
+
+        self._lock = threading.Lock()
+        self._inbox = queue.Queue()  # (kind, worker, payload) for the main thread
+        self._words = None  # task iterator over the word list
+        self._words_done = False
+        self._retry = deque()  # tasks of lost leases
+        self._leases = {}  # lease id -> Lease
+        self._lease_ids = itertools.count(1)
+        self._worker_ids = itertools.count(1)
+        self._workers = {}  # worker id -> last message (monotonic)
+        self._hits = []  # [directory, target, status] of every wordlist hit, passed on to the workers
+        self._hits_sent = {}  # worker id -> hits it has been sent
+        self._joined = 0
+        self._reissued = 0
+        self._stopping = False
+        self._config = None
+
+    # ------------------------------------------------------------------ #
+    # Task source (under _lock)
+    # ------------------------------------------------------------------ #
+    def _next_word_task(self):
+        """Next new (base_url, path) of the word list, or None (exhausted, or every host at its cap)."""
+        discoverer = self.discoverer
+        while not self._words_done:
+            try:
+                task = next(self._words)
+            except StopIteration:
+                self._words_done = True
+                discoverer.feed_done.set()
+                return None
+            if task is None:
+                return None
+            base_url, path, _ = task
+            with discoverer.total_tasks_lock:
+                discoverer.total_tasks += 1
+            if discoverer.visited.add(urljoin(base_url, path)):
+                return base_url, path
+            self._finish_task(base_url)  # duplicate word
+        return None
+
+    def _next_recursion_task(self):
+        discoverer = self.discoverer
+        while discoverer.recursion_scheduler is not None:
+            task = discoverer.recursion_scheduler.next_task()
+            if task is None:
+                return None
+            base_url, path = task
+            with discoverer.total_tasks_lock:
+                discoverer.total_tasks += 1
+            if discoverer.scheduler is not None:
+                discoverer.scheduler.acquire(base_url)
+            if discoverer.visited.add(urljoin(base_url, path)):
+                return base_url, path
+            self._finish_task(base_url)
+        return None
+
+    def _finish_task(self, base_url):
+        discoverer = self.discoverer
+        if discoverer.scheduler is not None:
+            discoverer.scheduler.release(base_url)
+        with discoverer.total_tasks_lock:
+            discoverer.completed_tasks += 1
+
+    def _fill_lease(self):
+        """Tasks for a new lease: lost ones first, then recursion (up to half) and words."""
+        tasks = []
+        while self._retry and len(tasks) < self.lease_size:
+            tasks.append(self._retry.popleft())
+        sources = (self._next_recursion_task, self._next_word_task, self._next_recursion_task)
+        limits = (self.lease_size // 2, self.lease_size, self.lease_size)
+        for source, limit in zip(sources, limits):
+            while len(tasks) < limit:
+                task = source()
+                if task is None:
+                    break
+                tasks.append(task)
+        return tasks
+
+    def _finished(self):
+        recursion = self.discoverer.recursion_scheduler
+        return (
+            self._words_done and not self._retry and not self._leases
+            and (recursion is None or recursion.idle)
+        )
+
+    def _release_leases(self, worker):
+        """Put the tasks of worker's open leases back in line for other workers. Returns how many."""
+        released = 0
+        for lease_id, lease in list(self._leases.items()):
+            if lease.worker == worker:
+                del self._leases[lease_id]
+                self._retry.extend(lease.tasks)
+                released += len(lease.tasks)
+        if self._stopping:
+            return 0  # a stopped scan hands nothing out again
+        self._reissued += released
+        return released
+
+    # ------------------------------------------------------------------ #
+    # Protocol (server threads)
+    # ------------------------------------------------------------------ #
+    def _admit(self, line):
+        """Is line a join with the scan's token?"""
+        try:
+            kind, _, token = json.loads(line)
+        except (TypeError, ValueError):
+            return False
+        return kind == "join" and isinstance(token, str) and hmac.compare_digest(token, self.token)
+
+    def _connect(self, client_address):
+        with self._lock:
+            worker = next(self._worker_ids)
+            self._workers[worker] = time.monotonic()
+            self._joined += 1
+            self._resize_scheduler()
+        log_info(f"Worker {worker} connected from {client_address[0]}")
+        return worker
+
+    def _disconnect(self, worker):
+        with self._lock:
+            self._workers.pop(worker, None)
+            released = self._release_leases(worker)
+            self._resize_scheduler()
+        if released:
+            log_error(f"Worker {worker} disconnected, re-issuing {released} leased tasks")
+
+    def _resize_scheduler(self):
+        # a batch scan's per-host share counts the threads of every worker
+        if self.discoverer.scheduler is not None:
+            self.discoverer.scheduler.workers = self.discoverer.threads * max(1, len(self._workers))
+
+    def _dispatch(self, worker, kind, payload):
+        reply = {}
+        with self._lock:
+            self._workers[worker] = time.monotonic()
+            if kind == "join":
+                reply = dict(self._config, worker=worker)
+            elif kind == "lease":
+                reply["hits"] = self._hits[self._hits_sent.get(worker, 0):]
+                self._hits_sent[worker] = len(self._hits)
+                tasks = [] if self._stopping else self._fill_lease()
+                if tasks:
+                    lease_id = next(self._lease_ids)
+                    self._leases[lease_id] = Lease(worker, tasks)
+                    reply.update(lease=lease_id, tasks=tasks)
+                elif self._stopping or self._finished():
+                    reply["done"] = True
+            elif kind == "complete":
+                for lease_id in payload[0]:
+                    lease = self._leases.get(lease_id)
+                    if lease is not None and lease.worker == worker:
+                        del self._leases[lease_id]
+                        for base_url, _ in lease.tasks:
+                            self._finish_task(base_url)
+            elif kind == "directory":
+                directory, parent, status, signature = payload
+                if self.discoverer.recursion_scheduler is not None:
+                    self.discoverer.recursion_scheduler.add(directory, parent, status, _hashable(signature))
+            elif kind in ("results", "progress", "failed", "done"):
+                self._inbox.put((kind, worker, payload))
+            if self._stopping:
+                reply["stop"] = True
+        return reply
+
+    def _expire_leases(self):
+        now = time.monotonic()
+        with self._lock:
+            for worker, seen in list(self._workers.items()):
+                if now - seen > self.lease_timeout:
+                    del self._workers[worker]
+                    released = self._release_leases(worker)
+                    log_error(f"Worker {worker}: silent for {self.lease_timeout:g}s, re-issuing {released} leased tasks")
+
+    # ------------------------------------------------------------------ #
+    # Run
+    # ------------------------------------------------------------------ #
+    def run(self, base_url, wordlist_path):
+        discoverer = self.discoverer
+        if not os.path.exists(wordlist_path):
+            log_error(f"Wordlist not found: {wordlist_path}")
+            return
+
+        targets = [base_url] if isinstance(base_url, str) else list(base_url)
+        discoverer._plan(targets, wordlist_path)
+        self._words = discoverer._tasks(targets, wordlist_path)
+        # a rule file is read here: its path means nothing on the workers' machines
+        options = dict(self.options, **SHARD_OVERRIDES)
+        rules_path = options.pop("rules_path", None)
+        if rules_path:
+            try:
+                options["rules"] = read_rules(rules_path)
+            except ValueError as e:
+                log_error(str(e))
+                return
+        self._config = {
+            "engine": self.engine,
+            "targets": targets,
+            "options": options,
+            "lease_timeout": self.lease_timeout,
+        }
+        try:
+            server = _CoordinatorServer(self.address, _WorkerHandler)
+        except OSError as e:
+            log_error(f"Cannot listen on {self.address[0]}:{self.address[1]}: {e}")
+            return
+        server.scan = self
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        discoverer.results = ResultWriter(discoverer._results_path())
+        discoverer.context.attach_results(discoverer.results.read)
+        task_id = discoverer.progress_bar.add_task("Scanning", total=discoverer.estimated_tasks)
+        discoverer._start_metrics()
+        host, port = server.server_address[:2]
+        log_info(f"Coordinator: listening on {host}:{port}, start workers with: python main.py worker HOST:{port}")
+        if self._token_generated:
+            log_info(f"Coordinator: workers join with {TOKEN_ENV}={self.token} (or --token)")
+
+        try:
+            stats = self._collect(task_id, batch=len(targets) > 1)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        with self._lock:
+            unfinished = not self._finished()
+        if stats:
+            recursion_scheduler = discoverer.recursion_scheduler
+            self._adopt_stats(stats, host_shards=True)
+            discoverer.recursion_scheduler = recursion_scheduler  # scheduled here, not by the workers
+            if discoverer.extension_planner is not None:
+                # workers on the same hosts detect the same technologies
+                planner = discoverer.extension_planner.stats()
+                planner["technologies"] = sorted(set(planner["technologies"]))
+            discoverer._report_stats()
+        log_info(
+            f"Workers: {self._joined} joined, {len(stats)} reported, {self._reissued} tasks re-issued from lost leases"
+        )
+        if unfinished:
+            log_error("Scan stopped before every task was done")
+        discoverer._stop_metrics()
+        discoverer._save_all_formats()
+
+    def _collect(self, task_id, batch):
+        """Record what the workers send until the scan is done and every worker has left. Returns {worker: stats}."""
+        discoverer = self.discoverer
+        snapshots = {}  # worker -> last metrics snapshot merged
+        stats = {}
+        written = set()  # result identities (a re-issued lease may send a result again)
+
+        def merge_metrics(worker, snapshot):
+            discoverer.metrics.merge(snapshot, snapshots.get(worker))
+            snapshots[worker] = snapshot
+
+        with discoverer._live_view(task_id):
+            while True:
+                try:
+                    try:
+                        kind, worker, payload = self._inbox.get(timeout=0.5)
+                    except queue.Empty:
+                        kind = None
+
+                    if kind == "results":
+                        for result in payload[0]:
+                            key = result_identity(result)
+                            if key in written:
+                                continue
+                            written.add(key)
+                            if batch:
+                                discoverer.context.tag_result(result)
+                            discoverer.results.write(result)
+                            discoverer.context.add_discovery_result(result)
+                            if not result.get("bypass"):
+                                with self._lock:
+                                    self._hits.append((*split_target(result["url"]), result["status"]))
+                    elif kind == "progress":
+                        _, _, hits, snapshot = payload
+                        for status, url, label, severity in hits:
+                            discoverer._display(url, status, label, severity)
+                        merge_metrics(worker, snapshot)
+                    elif kind == "failed":
+                        error, setup = payload
+                        log_error(f"Worker {worker} failed: {error}")
+                        if setup:
+                            with self._lock:
+                                self._stopping = True
+                            log_error("Coordinator: stopping, the scan options fail on the workers")
+                    elif kind == "done" and payload[0]:
+                        stats[worker] = payload[0]
+                        merge_metrics(worker, payload[0]["metrics"])
+
+                    self._expire_leases()
+                    completed, total, _ = discoverer._progress_state()
+                    discoverer._update_view(task_id, completed, total)
+                    discoverer.results.poll()
+                    discoverer._poll_metrics()
+                    with self._lock:
+                        over = not self._workers and (self._stopping or (self._joined and self._finished()))
+                    if over and self._inbox.empty():
+                        break
+                except KeyboardInterrupt:
+                    if self._stopping:  # second Ctrl-C: stop waiting for the workers
+                        break
+                    with self._lock:
+                        self._stopping = True
+                    log_info("Coordinator: stopping the workers (Ctrl-C again to stop waiting)")
+
+        completed, total, _ = discoverer._progress_state()
+        discoverer._update_view(task_id, completed, total, final=True)
+        return stats
@@ -0,0 +1,137 @@
+import threading
+from collections import Counter
+
+from modules.calibration import target_kind
+from modules.scheduler import host_of
+
+DEFAULT_EXTENSION_SAMPLE = 50  # words per directory probed with every extension (pruning is opt-in)
+HEADER_SAMPLE = 20  # responses per host inspected for technology hints
+
+# Server-side extensions that only make sense on one technology stack;
+# anything else (html, txt, bak, zip, ...) is stack-neutral
+TECH_EXTENSIONS = {
+    "php": {"php", "php3", "php4", "php5", "phtml", "inc"},
+    "asp": {"asp", "aspx", "ashx", "asmx", "axd", "config"},
+    "java": {"jsp", "jspx", "do", "action"},
+}
+
+# (header, lower-case substring, technology); the first match wins
+HEADER_HINTS = [
+    ("X-Powered-By", "php", "php"),
+    ("X-Powered-By", "asp.net", "asp"),
+    ("X-Powered-By", "servlet", "java"),
+    ("X-Powered-By", "jsp", "java"),
+    ("X-AspNet-Version", "", "asp"),
+    ("X-AspNetMvc-Version", "", "asp"),
+    ("Server", "microsoft-iis", "asp"),
+    ("Server", "php", "php"),
+    ("Server", "tomcat", "java"),
+    ("Server", "jetty", "java"),
+    ("Set-Cookie", "phpsessid", "php"),
+    ("Set-Cookie", "asp.net_sessionid", "asp"),
+    ("Set-Cookie", "aspsessionid", "asp"),
+    ("Set-Cookie", "jsessionid", "java"),
+]
+
+
+def detect_technology(headers):
+    """Technology named by response headers ('php', 'asp', 'java'), or None."""
+    for header, needle, tech in HEADER_HINTS:
+        value = headers.get(header)
+        if value is not None and needle in value.lower():
+            return tech
+    return None
+
+
+def technology_of(extension):
+    for tech, extensions in TECH_EXTENSIONS.items():
+        if extension in extensions:
+            return tech
+    return None
+
+
+# --------------------------------------------------------------------------- #
+# ExtensionPlanner
+# --------------------------------------------------------------------------- #
+class ExtensionPlanner:
+    """
+    Chooses the extensions a word is expanded with, per directory.
+
+    A host's technology comes from response headers (X-Powered-By, Server,
+    session cookies) or from a 2xx hit on one of its extensions (a 403
+    says nothing about what runs there). Once it is known, server-side
+    extensions of other stacks are dropped at once (no .php on IIS).
+    While it is not, every directory probes its first `sample` words with
+    all server-side extensions, then keeps only those that hit in the
+    directory or elsewhere on the host. Stack-neutral extensions (html,
+    txt, bak, zip, ...) are never dropped.
+    """
+
+    def __init__(self, extensions, sample: int = DEFAULT_EXTENSION_SAMPLE):
+        self.extensions = list(extensions)
+        self.sample = sample
+        self._stacks = {extension: technology_of(extension) for extension in self.extensions}
+        self._technology = {}  # host -> tech
+        self._inspected = Counter()  # host -> responses looked at for hints
+        self._host_hits = {}  # host -> extensions with a hit
+        self._directories = {}  # directory -> [words planned, extensions with a hit]
+        self._lock = threading.Lock()
+        self.skipped = 0  # extension probes not sent
+        self.pruned = 0  # directories past their sample (down to what hit there or on the host)
+
+    def observe_headers(self, url, headers):
+        host = host_of(url)
+        with self._lock:
+            if host in self._technology or self._inspected[host] >= HEADER_SAMPLE:
+                return
+            self._inspected[host] += 1
+        tech = detect_technology(headers)
+        if tech is not None:
+            with self._lock:
+                self._technology.setdefault(host, tech)
+
+    def record_hit(self, directory, target, status):
+        """A probe for target (word + extension) in directory was reported with status."""
+        extension = target_kind(target)
+        if extension not in self.extensions:
+            return
+        host = host_of(directory)
+        with self._lock:
+            self._host_hits.setdefault(host, set()).add(extension)
+            state = self._directories.get(directory)
+            if state is not None:
+                state[1].add(extension)
+            tech = technology_of(extension)
+            if tech is not None and 200 <= status < 300:
+                self._technology.setdefault(host, tech)
+
+    def extensions_for(self, directory):
+        """Extensions to expand the next word in directory with."""
+        host = host_of(directory)
+        with self._lock:
+            state = self._directories.setdefault(directory, [0, set()])
+            state[0] += 1
+            tech = self._technology.get(host)
+            host_hits = self._host_hits.get(host, ())
+            sampling = state[0] <= self.sample
+            if state[0] == self.sample + 1:
+                self.pruned += 1
+            kept = []
+            for extension, stack in self._stacks.items():
+                if stack is None or extension in state[1] or extension in host_hits:
+                    kept.append(extension)
+                elif tech is not None:
+                    if stack == tech:
+                        kept.append(extension)
+                elif sampling:
+                    kept.append(extension)
+            self.skipped += len(self.extensions) - len(kept)
+            return kept
+
+    def stats(self):
+        with self._lock:
+            return {
+                "skipped": self.skipped,
+                "pruned": self.pruned,
+                "technologies": sorted(f"{host} {tech}" for host, tech in self._technology.items()),
+            }
@@ -0,0 +1,280 @@
+import bisect
+import collections
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Timed phases of a scan:
+#   pacing          wait handed out by the rate governor (before each request)
+#   queue_wait      task enqueued -> picked up by a worker
+#   connect         DNS + TCP (+ TLS) for a new connection
+#   ttfb            request sent -> response headers (minus connect)
+#   body            reading (or draining) the response body
+#   content_filter  response classification of a body (filters, signatures, severity)
+#   bypass          whole bypass round for one 401/403
+#   ui              building one frame of the live view
+PHASES = ("pacing", "queue_wait", "connect", "ttfb", "body", "content_filter", "bypass", "ui")
+
+# Upper bounds (seconds) of the histogram buckets: 100µs doubling up to ~52s
+BUCKETS = tuple(0.0001 * 2 ** i for i in range(20))
+
+METRICS_PREFIX = "pathhunter"
+DEFAULT_DUMP_INTERVAL = 10.0
+
+
+# --------------------------------------------------------------------------- #
+# Histogram
+# --------------------------------------------------------------------------- #
+class Histogram:
+    """Fixed-bucket latency histogram (cumulative, Prometheus-style on export)."""
+
+    __slots__ = ("counts", "sum", "count", "max", "_lock")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+            if seconds > self.max:
+                self.max = seconds
+
+    def _copy(self):
+        with self._lock:
+            return list(self.counts), self.count, self.sum, self.max
+
+    @staticmethod
+    def _quantile(counts, total, largest, q):
+        """Linear interpolation inside the bucket holding the q-th sample."""
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for i, n in enumerate(counts):
+            if n and seen + n >= rank:
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else largest
+                return min(largest, lower + (upper - lower) * (rank - seen) / n)
+            seen += n
+        return largest
+
+    def merge(self, stats, previous=None):
+        """Add another histogram's snapshot, minus `previous` (an earlier snapshot of the same one)."""
+        before = previous or {"buckets": [0] * len(self.counts), "count": 0, "sum": 0.0}
+        with self._lock:
+            for i, (n, old) in enumerate(zip(stats["buckets"], before["buckets"])):
+                self.counts[i] += n - old
+            self.count += stats["count"] - before["count"]
+            self.sum += stats["sum"] - before["sum"]
+            self.max = max(self.max, stats["max"])
+
+    def quantile(self, q):
+        counts, total, _, largest = self._copy()
+        return self._quantile(counts, total, largest, q)
+
+    def snapshot(self):
+        counts, total, seconds, largest = self._copy()
+        return {
+            "count": total,
+            "sum": seconds,
+            "max": largest,
+            "p50": self._quantile(counts, total, largest, 0.50),
+            "p95": self._quantile(counts, total, largest, 0.95),
+            "p99": self._quantile(counts, total, largest, 0.99),
+            "buckets": counts,
+        }
+
+
+# --------------------------------------------------------------------------- #
+# ScanMetrics
+# --------------------------------------------------------------------------- #
+class ScanMetrics:
+    """
+    Counters and per-phase latency histograms for one scan.
+
+    Engines call `observe(phase, seconds)` on the hot path (a bisect and a
+    per-phase lock) and `count` / `error` for events. `snapshot` (JSON),
+    `prometheus` (text exposition format) and `report_lines` (end of scan)
+    read it back at any time, also mid-scan.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self._counters = collections.Counter()  # (name, label or None) -> n
+        self._lock = threading.Lock()
+
+    def observe(self, phase, seconds):
+        self.phases[phase].observe(seconds)
+
+    def count(self, name, label=None, n=1):
+        with self._lock:
+            self._counters[name, label] += n
+
+    def error(self, exc):
+        """Count an exception by class (ConnectTimeout, ClientOSError, ...)."""
+        self.count("errors", type(exc).__name__)
+
+    def counters(self):
+        """{name: n} for plain counters, {name: {label: n}} for labelled ones."""
+        with self._lock:
+            items = list(self._counters.items())
+        out = {}
+        for (name, label), n in sorted(items, key=lambda item: (item[0][0], str(item[0][1]))):
+            if label is None:
+                out[name] = n
+            else:
+                out.setdefault(name, {})[str(label)] = n
+        return out
+
+    def merge(self, snapshot, previous=None):
+        """
+        Add the snapshot of another process's metrics. With previous (the
+        last snapshot merged from that process) only the difference is
+        added, so a live source can be merged again and again.
+        """
+        before = previous or {"counters": {}, "phases": {}}
+        for name, value in snapshot["counters"].items():
+            old = before["counters"].get(name)
+            if isinstance(value, dict):
+                for label, n in value.items():
+                    self.count(name, label, n - (old or {}).get(label, 0))
+            else:
+                self.count(name, n=value - (old or 0))
+        for phase, stats in snapshot["phases"].items():
+            self.phases[phase].merge(stats, before["phases"].get(phase))
+
+    # ------------------------------------------------------------------ #
+    # Export
+    # ------------------------------------------------------------------ #
+    def snapshot(self):
+        return {
+            "started": self.started,
+            "elapsed_s": round(time.time() - self.started, 3),
+            "counters": self.counters(),
+            "buckets": list(BUCKETS),
+            "phases": {phase: histogram.snapshot() for phase, histogram in self.phases.items()},
+        }
+
+    def prometheus(self):
+        """Prometheus text exposition (version 0.0.4)."""
+        lines = []
+        for name, value in self.counters().items():
+            metric = f"{METRICS_PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            if isinstance(value, dict):
+                label = "class" if name == "errors" else "status" if name == "responses" else "label"
+                lines += [f'{metric}{{{label}="{key}"}} {n}' for key, n in value.items()]
+            else:
+                lines.append(f"{metric} {value}")
+
+        metric = f"{METRICS_PREFIX}_phase_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        for phase, histogram in self.phases.items():
+            counts, total, seconds, _ = histogram._copy()
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{phase="{phase}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{phase="{phase}",le="+Inf"}} {total}')
+            lines.append(f'{metric}_sum{{phase="{phase}"}} {seconds:.6f}')
+            lines.append(f'{metric}_count{{phase="{phase}"}} {total}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Atomically write the JSON snapshot to path."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+
+    def report_lines(self):
+        """Human-readable end-of-scan summary, one line per phase / counter family."""
+        lines = []
+        for phase, histogram in self.phases.items():
+            stats = histogram.snapshot()
+            if not stats["count"]:
+                continue
+            lines.append(
+                f"{phase:<14} n={stats['count']:<7} total {stats['sum']:.2f}s  "
+                f"p50 {stats['p50'] * 1000:.1f}ms  p95 {stats['p95'] * 1000:.1f}ms  "
+                f"p99 {stats['p99'] * 1000:.1f}ms  max {stats['max'] * 1000:.1f}ms"
+            )
+        for name, value in self.counters().items():
+            if isinstance(value, dict):
+                value = ", ".join(f"{key} {n}" for key, n in sorted(value.items(), key=lambda kv: -kv[1]))
+            lines.append(f"{name}: {value}")
+        return lines
+
+
+# --------------------------------------------------------------------------- #
+# Live exposition
+# --------------------------------------------------------------------------- #
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        metrics = self.server.metrics
+        path = self.path.split("?", 1)[0]
+        if path in ("/", "/metrics"):
+            body, content_type = metrics.prometheus().encode(), "text/plain; version=0.0.4"
+        elif path == "/metrics.json":
+            body, content_type = json.dumps(metrics.snapshot()).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    """Serves /metrics (Prometheus text) and /metrics.json on a background thread."""
+
+    def __init__(self, metrics: ScanMetrics, port: int, host: str = "127.0.0.1"):
+        self._server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self._server.daemon_threads = True
+        self._server.metrics = metrics
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class MetricsDumper:
+    """Periodic JSON dumps of a ScanMetrics to path (call `poll` from a progress loop)."""
+
+    def __init__(self, metrics: ScanMetrics, path, interval: float = DEFAULT_DUMP_INTERVAL):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._last = time.monotonic()
+
+    def poll(self, force=False):
+        if not force and time.monotonic() - self._last < self.interval:
+            return
+        self._last = time.monotonic()
+        self.metrics.dump(self.path)
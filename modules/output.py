@@ -0,0 +1,160 @@
+import csv
+import json
+import os
+import textwrap
+import threading
+import time
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+
+# --------------------------------------------------------------------------- #
+# Streaming result sink
+# --------------------------------------------------------------------------- #
+class ResultWriter:
+    """
+    Append-only JSONL result sink.
+
+    Each result becomes one line as soon as it is found. Lines are buffered
+    and written in batches (every `batch_size` results, or after
+    `flush_interval` seconds via `poll`), so memory stays bounded, a crash
+    loses at most one batch, and other tools can `tail -f` the file mid-scan.
+    """
+
+    def __init__(self, path, batch_size: int = DEFAULT_BATCH_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.fields = {}  # every key seen, in first-seen order (CSV header without a rescan)
+
+        self._lock = threading.Lock()
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._file = open(path, "wb")
+
+    def write(self, result):
+        line = json.dumps(result, ensure_ascii=False) + "\n"
+        with self._lock:
+            for key in result:
+                self.fields.setdefault(key, None)
+            self._pending.append(line)
+            self.count += 1
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def poll(self):
+        """Flush a partial batch once it is flush_interval old."""
+        if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write out buffered results. Returns the file size (a resume offset)."""
+        with self._lock:
+            self._flush_locked()
+            return self._file.tell()
+
+    def _flush_locked(self):
+        if self._pending:
+            self._file.write("".join(self._pending).encode("utf-8"))
+            self._pending = []
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def read(self):
+        """Every result written so far, streamed from the file (pending lines are flushed first)."""
+        with self._lock:
+            if not self._file.closed:
+                self._flush_locked()
+        return iter_results(self.path)
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_locked()
+            self._file.close()
+
+
+def iter_results(path, limit=None):
+    """Yield results from a JSONL file (only the first `limit` bytes, if given)."""
+    with open(path, "rb") as f:
+        position = 0
+        for line in f:
+            position += len(line)
+            if limit is not None and position > limit:
+                break
+            if line.strip():
+                yield json.loads(line)
+
+
+def result_fields(path):
+    fields = {}
+    for result in iter_results(path):
+        for key in result:
+            fields.setdefault(key, None)
+    return list(fields)
+
+
+# --------------------------------------------------------------------------- #
+# Conversion (JSONL -> json / csv / txt)
+# --------------------------------------------------------------------------- #
+def write_json(source, dest):
+    """Stream a JSON array, formatted like json.dump(..., indent=2)."""
+    with open(dest, "w", encoding="utf-8") as f:
+        first = True
+        for result in iter_results(source):
+            f.write("[\n" if first else ",\n")
+            f.write(textwrap.indent(json.dumps(result, indent=2), "  "))
+            first = False
+        f.write("[]" if first else "\n]")
+
+
+def write_csv(source, dest, fields=None):
+    fieldnames = sorted(fields if fields is not None else result_fields(source))
+    with open(dest, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for result in iter_results(source):
+            # lists (content signatures) become one ";"-separated cell
+            writer.writerow({key: ";".join(value) if isinstance(value, list) else value for key, value in result.items()})
+
+
+def write_txt(source, dest):
+    with open(dest, "w", encoding="utf-8") as f:
+        for r in iter_results(source):
+            status = r.get("status", "?")
+            url = r.get("url", "")
+            severity = r.get("severity", "")
+            signatures = ",".join(r.get("signatures", []))
+            line = f"{status}\t{url}\t{severity}\t{signatures}" if signatures else f"{status}\t{url}\t{severity}"
+            # changes against a --baseline scan lead with new / changed / gone
+            f.write(f"{r['change']}\t{line}\n" if "change" in r else line + "\n")
+
+
+CONVERTERS = {
+    "json": write_json,
+    "csv": write_csv,
+    "txt": write_txt,
+}
+
+
+def convert_results(source, paths, fields=None):
+    """
+    Write every format in paths ({fmt: dest}) from the JSONL file source.
+    Returns {fmt: error} for formats that failed.
+    """
+    errors = {}
+    for fmt, dest in paths.items():
+        converter = CONVERTERS.get(fmt)
+        if converter is None or os.path.abspath(dest) == os.path.abspath(source):
+            continue
+        try:
+            if fmt == "csv":
+                converter(source, dest, fields)
+            else:
+                converter(source, dest)
+        except Exception as e:
+            errors[fmt] = e
+    return errors
@@ -0,0 +1,175 @@
+import multiprocessing
+import random
+import threading
+import time
+
+# --------------------------------------------------------------------------- #
+# Profiles -> governor settings (requests/second)
+# --------------------------------------------------------------------------- #
+PROFILE_RATES = {
+    "stealth": {"rate": 3.0, "min_rate": 0.5, "max_rate": 6.0, "jitter": 0.5},
+    "balanced": {"rate": 30.0, "min_rate": 2.0, "max_rate": 300.0, "jitter": 0.0},
+    "aggressive": {"rate": 200.0, "min_rate": 10.0, "max_rate": 5000.0, "jitter": 0.0},
+}
+
+CONGESTION_CODES = {429, 503}
+
+
+# --------------------------------------------------------------------------- #
+# RateGovernor
+# --------------------------------------------------------------------------- #
+class RateGovernor:
+    """
+    Central token-bucket rate limiter with AIMD adjustment.
+
+    Every probe calls `reserve()` (returns how long to wait before sending)
+    and reports back through `record()`. 429/503, timeouts/connection errors
+    and rising latency cut the rate multiplicatively (at most once per
+    window); a healthy window raises it additively, up to max_rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float = 1.0,
+        max_rate: float = None,
+        burst: float = None,
+        increase: float = None,
+        decrease: float = 0.5,
+        latency_factor: float = 3.0,
+        jitter: float = 0.0,
+        window: float = 1.0,
+    ):
+        self.max_rate = max_rate or rate
+        self.min_rate = min(min_rate, self.max_rate)
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+        self.burst = burst or max(1.0, self.rate / 10)
+        self.increase = increase or max(0.5, self.rate / 10)
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.jitter = jitter
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._last_increase = self._last_refill
+
+        self._latency_fast = None
+        self._latency_slow = None
+        self._samples = 0
+
+        self.backoffs = 0
+        self.peak_rate = self.rate
+
+    # ------------------------------------------------------------------ #
+    # Pacing
+    # ------------------------------------------------------------------ #
+    def reserve(self):
+        """Take one token; returns the seconds to wait before sending."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if self.jitter:
+            wait += random.uniform(0, self.jitter / self.rate)
+        return wait
+
+    # ------------------------------------------------------------------ #
+    # Feedback
+    # ------------------------------------------------------------------ #
+    def record(self, status=None, latency=None, error=False):
+        with self._lock:
+            now = time.monotonic()
+            congested = error or status in CONGESTION_CODES
+            if latency is not None and not congested:
+                congested = self._latency_rising(latency)
+
+            if congested:
+                if now - self._last_decrease >= self.window:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self._last_decrease = now
+                    self._last_increase = now
+                    self.backoffs += 1
+            elif now - self._last_increase >= self.window:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                self._last_increase = now
+                self.peak_rate = max(self.peak_rate, self.rate)
+
+    def _latency_rising(self, latency):
+        """Fast EWMA vs slow (healthy) EWMA; True when the target is slowing down."""
+        self._samples += 1
+        if self._latency_fast is None:
+            self._latency_fast = self._latency_slow = latency
+            return False
+        self._latency_fast += 0.2 * (latency - self._latency_fast)
+        rising = self._samples > 20 and self._latency_fast > self.latency_factor * self._latency_slow
+        # the healthy baseline still drifts (slowly) so a permanent shift is eventually accepted
+        self._latency_slow += (0.002 if rising else 0.02) * (latency - self._latency_slow)
+        return rising
+
+    def stats(self):
+        return {
+            "rate": self.rate,
+            "peak_rate": self.peak_rate,
+            "backoffs": self.backoffs,
+            "latency": self._latency_slow,
+        }
+
+
+# --------------------------------------------------------------------------- #
+# SharedRateGovernor
+# --------------------------------------------------------------------------- #
+def _shared(index):
+    """Attribute stored in slot `index` of the governor's shared state array."""
+    return property(lambda self: self._state[index], lambda self, value: self._state.__setitem__(index, value))
+
+
+class SharedRateGovernor(RateGovernor):
+    """
+    RateGovernor whose token bucket and AIMD rate live in shared memory,
+    behind a process-shared lock, so all processes of a sharded scan draw
+    from one budget and one process's backoff slows them all. Latency
+    baselines stay per process.
+    """
+
+    rate = _shared(0)
+    peak_rate = _shared(1)
+    backoffs = _shared(2)
+    _tokens = _shared(3)
+    _last_refill = _shared(4)
+    _last_decrease = _shared(5)
+    _last_increase = _shared(6)
+
+    def __init__(self, *args, mp_context=None, **kwargs):
+        ctx = mp_context or multiprocessing.get_context()
+        self._state = ctx.RawArray("d", 7)
+        super().__init__(*args, **kwargs)
+        self._lock = ctx.Lock()
+
+    def stats(self):
+        stats = super().stats()
+        stats["backoffs"] = int(stats["backoffs"])
+        return stats
+
+
+def governor_for_profile(profile, threads, delay=None, rate=None, max_rate=None, mp_context=None):
+    """
+    Build a governor from a traffic profile. `rate` / `max_rate` override the
+    profile; a legacy per-thread `delay` caps the rate at threads / delay.
+    With mp_context the governor is shared by processes of that context.
+    """
+    settings = dict(PROFILE_RATES.get(profile, PROFILE_RATES["balanced"]))
+    if rate:
+        settings["rate"] = rate
+        settings["max_rate"] = max(settings["max_rate"], rate)
+    if max_rate:
+        settings["max_rate"] = max_rate
+    if delay:
+        settings["max_rate"] = min(settings["max_rate"], threads / delay)
+    if mp_context is not None:
+        return SharedRateGovernor(mp_context=mp_context, **settings)
+    return RateGovernor(**settings)
@@ -0,0 +1,125 @@
+import heapq
+import itertools
+import threading
+from collections import Counter
+
+DEFAULT_MAX_DEPTH = 3
+
+# Order of discovered directories with the same depth: a readable one before
+# a redirect, before one behind auth, before a forbidden one
+STATUS_RANK = {200: 0, 204: 0, 301: 1, 302: 1, 307: 1, 308: 1, 401: 2, 403: 3}
+OTHER_RANK = 4
+
+
+def directory_signature(response, location=None):
+    """What makes two directory hits (ResponseFingerprints) look alike: a shared 403 page, the same login redirect."""
+    return response, location
+
+
+def names_file(target):
+    """
+    True when a "dir/" target names a file rather than a directory: a
+    dot-name anywhere in it (.rhosts/, .git/config/) or an extension on its
+    last segment (security.txt/). A server answering those with a non-404
+    is no sign of a directory worth expanding.
+    """
+    segments = target.strip("/").split("/")
+    return any(segment.startswith(".") for segment in segments) or "." in segments[-1]
+
+
+# --------------------------------------------------------------------------- #
+# RecursionScheduler
+# --------------------------------------------------------------------------- #
+class RecursionScheduler:
+    """
+    Priority source of recursion tasks. Every directory found by the scan is
+    expanded with the word list (a SharedWordlist; its first `budget` words
+    when given), down to max_depth levels below the scanned target.
+
+    Directories are served shallow first, then by signal: a 200 before a
+    401/403, and a response unlike the directory hits seen so far before
+    one repeating a common fingerprint (a catch-all 403 page, a login
+    redirect). The highest-priority directory hands out its words one task
+    at a time; the engine decides how many of them are queued at once.
+    """
+
+    def __init__(self, words, max_depth: int = DEFAULT_MAX_DEPTH, budget: int = None):
+        self.words = words
+        self.max_depth = max_depth
+        self.budget = min(len(words), budget) if budget else len(words)
+        self._heap = []  # [(depth, rank, repeats, order), directory, cursor]
+        self._depths = {}  # every directory scheduled so far -> depth
+        self._signatures = Counter()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self.remaining = 0  # tasks not handed out yet
+        self.skipped = 0  # directories beyond max_depth
+
+    @property
+    def idle(self):
+        return not self._heap
+
+    def depth_of(self, directory):
+        """Levels below the scanned target (a target itself is 0)."""
+        return self._depths.get(directory, 0)
+
+    def add(self, directory, parent, status, signature=None):
+        """
+        Schedule directory, found by scanning parent. A word with slashes
+        finds a directory several segments below parent, and each of them
+        counts towards max_depth. Returns False when it is known, too deep
+        or outside parent (a "../" word).
+        """
+        with self._lock:
+            if directory in self._depths or not directory.startswith(parent):
+                return False
+            depth = self._depths.get(parent, 0) + directory[len(parent):].strip("/").count("/") + 1
+            if self.max_depth is not None and depth > self.max_depth:
+                self.skipped += 1
+                return False
+            self._depths[directory] = depth
+            repeats = self._signatures[signature]
+            self._signatures[signature] += 1
+            self._push((depth, STATUS_RANK.get(status, OTHER_RANK), repeats, next(self._order)), directory, 0)
+            return True
+
+    def _push(self, key, directory, cursor):
+        if cursor < self.budget:
+            heapq.heappush(self._heap, [key, directory, cursor])
+            self.remaining += self.budget - cursor
+
+    def next_task(self):
+        """(directory, word) of the highest-priority directory, or None when idle."""
+        with self._lock:
+            if not self._heap:
+                return None
+            entry = self._heap[0]
+            _, directory, cursor = entry
+            entry[2] += 1  # the key is untouched, so the heap stays valid
+            word = self.words.word(cursor, directory)
+            if entry[2] >= self.budget:
+                heapq.heappop(self._heap)
+                self.words.release(directory)
+            self.remaining -= 1
+            return directory, word
+
+    # ------------------------------------------------------------------ #
+    # Checkpoint state
+    # ------------------------------------------------------------------ #
+    def state(self):
+        with self._lock:
+            return {
+                "depths": dict(self._depths),
+                "queue": [[list(key), directory, cursor] for key, directory, cursor in self._heap],
+            }
+
+    def restore(self, state):
+        with self._lock:
+            self._depths.update(state.get("depths", {}))
+            for key, directory, cursor in state.get("queue", []):
+                self._push(tuple(key), directory, cursor)
+            self._order = itertools.count(max((key[3] + 1 for key, _, _ in self._heap), default=0))
+
+    def stats(self):
+        with self._lock:
+            return {"directories": len(self._depths), "queued": len(self._heap), "skipped": self.skipped}
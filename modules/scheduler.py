@@ -0,0 +1,82 @@
+import threading
+from collections import Counter, deque
+from urllib.parse import urlsplit
+
+
+def host_of(url):
+    return urlsplit(url).netloc.lower()
+
+
+# --------------------------------------------------------------------------- #
+# HostScheduler
+# --------------------------------------------------------------------------- #
+class HostScheduler:
+    """
+    Fair task source for a batch (multi-target) scan.
+
+    Every target walks the same word list (a SharedWordlist) with its own cursor.
+    Targets are served round-robin, and a host that already has its cap of
+    tasks queued or running is skipped until one of them completes, so a
+    slow or throttled server ties up at most that many workers while the
+    other hosts keep the shared pool busy. The cap is per_host when given,
+    else an even share of `workers` among the targets that still have
+    words left (so the last slow host gets the whole pool).
+
+    Task indexes interleave the targets (word * len(targets) + target), so
+    the engine's checkpoint cursor still marks a prefix of finished work.
+    """
+
+    def __init__(self, targets, words, per_host: int = None, workers: int = 1):
+        self.targets = list(targets)
+        self.words = words
+        self.per_host = per_host
+        self.workers = max(1, workers)
+        self._hosts = [host_of(target) for target in self.targets]
+        self._active = Counter()
+        self._lock = threading.Lock()
+        self.seek(0)
+
+    def seek(self, start):
+        """Skip every task whose index is below start (resume)."""
+        count = len(self.targets)
+        with self._lock:
+            self._cursors = [max(0, (start - i + count - 1) // count) for i in range(count)]
+            self._ring = deque(i for i in range(count) if self._cursors[i] < len(self.words))
+
+    @property
+    def finished(self):
+        return not self._ring
+
+    def next_task(self):
+        """(base_url, word, index) for the next host with a free slot, or None."""
+        with self._lock:
+            cap = self.per_host or -(-self.workers // max(1, len(self._ring)))
+            for _ in range(len(self._ring)):
+                i = self._ring[0]
+                self._ring.rotate(-1)
+                host = self._hosts[i]
+                if self._active[host] >= cap:
+                    continue
+                word = self._cursors[i]
+                self._cursors[i] += 1
+                if self._cursors[i] >= len(self.words):
+                    self._ring.pop()  # just rotated to the end
+                self._active[host] += 1
+                return self.targets[i], self.words.word(word, i), word * len(self.targets) + i
+            return None
+
+    def __iter__(self):
+        """Yield tasks; None means every host with work left is at its cap (wait, then retry)."""
+        while not self.finished:
+            yield self.next_task()
+
+    def acquire(self, url):
+        """Count a task created outside the scheduler (recursion) against its host."""
+        with self._lock:
+            self._active[host_of(url)] += 1
+
+    def release(self, url):
+        host = host_of(url)
+        with self._lock:
+            if self._active[host] > 0:
+                self._active[host] -= 1
@@ -0,0 +1,418 @@
+import _thread
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from collections import namedtuple
+
+from modules.async_engine import AsyncContentDiscoverer
+from modules.content_discoverer import ContentDiscoverer
+from modules.dedupe import DEFAULT_CAPACITY, DEFAULT_FP_RATE, make_shared_url_set
+from modules.output import DEFAULT_BATCH_SIZE, DEFAULT_FLUSH_INTERVAL, ResultWriter
+from modules.rate import governor_for_profile
+from modules.scheduler import host_of
+from utils.context import ScanContext
+from utils.logger import log_error, log_info
+from utils.wordlist import SharedWordlist, wordlist_size
+
+# Shard `index` of `count`: its targets, and whether it takes every count-th
+# word of the list (word shards) or the whole list (host shards)
+Shard = namedtuple("Shard", "index count targets words")
+
+# Engine settings a shard process never takes over from the coordinator
+SHARD_OVERRIDES = dict(ui=False, checkpoint_path=None, resume_path=None, metrics_port=None, metrics_path=None)
+
+
+# --------------------------------------------------------------------------- #
+# Shard side (worker processes)
+# --------------------------------------------------------------------------- #
+class ShardResultSink:
+    """ResultWriter stand-in in a shard process: results go to the coordinator in batches."""
+
+    def __init__(self, link, shard, batch_size: int = DEFAULT_BATCH_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.link = link
+        self.shard = shard
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.count = 0
+
+        self._lock = threading.Lock()
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def write(self, result):
+        with self._lock:
+            self._pending.append(result)
+            self.count += 1
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def poll(self):
+        if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+            return self.count
+
+    def _flush_locked(self):
+        if self._pending:
+            self.link.put(("results", self.shard, self._pending))
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+
+class _ShardEngine:
+    """
+    Engine mixin for one shard in a worker process. The shard scans its part
+    of the work like a normal run, but results, hits, progress and metrics
+    go to the coordinator over `link` instead of being written and shown.
+    """
+
+    def __init__(self, *args, shard: Shard, link, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shard = shard
+        self.link = link
+        self.final_stats = {}
+
+    def open_wordlist(self, path):
+        if self.shard.words:
+            return SharedWordlist(path, self.shard.index, self.shard.count)
+        return super().open_wordlist(path)
+
+    def _plan(self, targets, wordlist_path):
+        words = super()._plan(targets, wordlist_path)
+        if self.shard.words:
+            self.estimated_tasks = len(range(self.shard.index, words, self.shard.count)) * len(targets)
+        return words
+
+    def _recursion_words(self, wordlist_path):
+        # recursion is not split: the shard that finds a directory scans all of it
+        if self.scheduler is not None and not self.shard.words:
+            return self.scheduler.words
+        return super().open_wordlist(wordlist_path)
+
+    def _tasks(self, targets, wordlist_path, start=0):
+        tasks = super()._tasks(targets, wordlist_path, start)
+        if self.scheduler is not None or not self.shard.words:
+            return tasks
+        # every count-th word, renumbered so the shard's own indexes stay contiguous
+        index, count = self.shard.index, self.shard.count
+        return ((base_url, path, i // count) for base_url, path, i in tasks if i % count == index)
+
+    def _start_outputs(self, targets, wordlist_path, words):
+        self.results = ShardResultSink(self.link, self.shard.index)
+        return 0
+
+    def _probe(self, directory, target, full_url):
+        # a shard keeps no checkpoint, so an interrupted task need not finish its paced probes
+        if not self.shutdown_event.is_set():
+            super()._probe(directory, target, full_url)
+
+    def _update_view(self, task_id, completed, total, final=False):
+        self.link.put(("progress", self.shard.index, completed, total, self.dashboard.drain(), self.metrics.snapshot()))
+
+    def _report_stats(self):
+        # the coordinator reports for all shards (taken before run closes the transport)
+        self.final_stats = self.shard_stats()
+
+    def _save_all_formats(self):
+        if self.results is not None:
+            self.results.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def shard_stats(self):
+        """What the coordinator's end report needs from this shard."""
+        governors = self.host_governors or {host_of(self.shard.targets[0]): self.governor}
+        return {
+            "transport": self.transport.stats(),
+            "dedupe": self.visited.stats(),
+            "redirects": self.redirect_cache.stats(),
+            "bypass": self.bypass_tracker.stats(),
+            "calibration": self.calibrator.stats() if self.calibrator is not None else None,
+            "recursion": self.recursion_scheduler.stats() if self.recursion_scheduler is not None else None,
+            "extensions": self.extension_planner.stats() if self.extension_planner is not None else None,
+            "rate": {host: governor.stats() for host, governor in governors.items()},
+            "metrics": self.metrics.snapshot(),
+            "baseline": sorted(self.baseline.checked) if self.baseline is not None else None,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+
+class ShardContentDiscoverer(_ShardEngine, ContentDiscoverer):
+    pass
+
+
+class ShardAsyncContentDiscoverer(_ShardEngine, AsyncContentDiscoverer):
+    pass
+
+
+SHARD_ENGINES = {"thread": ShardContentDiscoverer, "async": ShardAsyncContentDiscoverer}
+
+
+def _interrupt_handler(stopping):
+    """
+    SIGINT in a shard: the terminal's Ctrl-C is left to the coordinator, which
+    stops shards through an Event. Only a local flag is read here: the shared
+    Event takes a cross-process lock, which a signal handler must not.
+    """
+
+    def handler(signum, frame):
+        if stopping.is_set():
+            signal.signal(signal.SIGINT, signal.SIG_IGN)  # interrupt once
+            raise KeyboardInterrupt
+
+    return handler
+
+
+def _interrupt_when(stop, stopping):
+    stop.wait()
+    stopping.set()
+    _thread.interrupt_main()
+
+
+def _shard_main(engine, shard, options, wordlist_path, link, stop, visited, governors):
+    """Entry point of a shard process."""
+    stopping = threading.Event()
+    signal.signal(signal.SIGINT, _interrupt_handler(stopping))
+    threading.Thread(target=_interrupt_when, args=(stop, stopping), daemon=True).start()
+
+    stats = {}
+    discoverer = None
+    try:
+        context = ScanContext(target_url=shard.targets[0], wordlist_path=wordlist_path, targets=shard.targets)
+        discoverer = SHARD_ENGINES[engine](context=context, shard=shard, link=link, **options)
+        if visited is not None:
+            discoverer.visited = visited
+        if governors:
+            discoverer.governor = governors[host_of(shard.targets[0])]
+            discoverer.host_governors.update(governors)
+        discoverer.run(shard.targets[0] if len(shard.targets) == 1 else list(shard.targets), wordlist_path)
+        stats = discoverer.final_stats
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        log_error(f"Shard {shard.index + 1}/{shard.count} failed: {e}")
+    finally:
+        if discoverer is not None and discoverer.results is not None:
+            discoverer.results.close()
+        link.put(("done", shard.index, stats))
+
+
+# --------------------------------------------------------------------------- #
+# Coordinator side
+# --------------------------------------------------------------------------- #
+class _Report:
+    """Stands in for an engine component in the end report: stats() returns the shards' totals."""
+
+    def __init__(self, stats, **attributes):
+        self._stats = stats
+        self.__dict__.update(attributes)
+
+    def stats(self):
+        return self._stats
+
+
+def _sum_stats(items):
+    """Add up per-shard stats dicts: counts are summed, lists joined, anything else kept from the first."""
+    total = {}
+    for stats in items:
+        for key, value in stats.items():
+            if key not in total:
+                total[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                total[key] += value
+            elif isinstance(value, int) and not isinstance(value, bool):
+                total[key] += value
+    return total
+
+
+class ShardedScan:
+    """
+    One scan spread over several worker processes (--processes), each
+    running its own engine, so TLS, decoding and regex filtering are not
+    bound to one interpreter lock.
+
+    With at least as many hosts as processes, every process gets its own
+    hosts, so their visited URLs and rate governors never overlap. Otherwise
+    every process takes every count-th word of the list on all targets, and
+    the processes share the visited-URL set and each host's rate governor
+    through shared memory, so the configured rate stays a global budget.
+
+    `discoverer` is the engine built in this process. It is not run; it
+    owns the one result sink, ScanContext, live view, metrics endpoints and
+    end report, fed with what the shards send back.
+    """
+
+    def __init__(self, discoverer: ContentDiscoverer, processes: int, options: dict):
+        self.discoverer = discoverer
+        self.processes = max(1, processes)
+        self.options = options
+        self.engine = "async" if isinstance(discoverer, AsyncContentDiscoverer) else "thread"
+
+    def _plan(self, targets, wordlist_path, ctx):
+        """(shards, shared visited set or None, shared governors by host)"""
+        discoverer = self.discoverer
+        words = wordlist_size(wordlist_path)
+        discoverer.estimated_tasks = words * len(targets)
+        count = self.processes
+        by_host = {}
+        for target in targets:
+            by_host.setdefault(host_of(target), []).append(target)
+        if len(by_host) >= count:
+            hosts = list(by_host.values())
+            return [Shard(i, count, sum(hosts[i::count], []), False) for i in range(count)], None, {}
+
+        capacity = max(DEFAULT_CAPACITY, 2 * discoverer.estimated_tasks * (1 + len(discoverer.extensions)))
+        visited = make_shared_url_set(
+            self.options.get("dedupe", "exact"),
+            fp_rate=self.options.get("dedupe_fp_rate", DEFAULT_FP_RATE),
+            capacity=capacity,
+            mp_context=ctx,
+        )
+        # the rate settings describe the whole scan: a --delay cap counts every process's threads
+        settings = dict(discoverer._governor_settings, threads=discoverer.threads * count)
+        governors = {host_of(target): governor_for_profile(**settings, mp_context=ctx) for target in targets}
+
+        discoverer.visited = visited
+        discoverer.governor = governors[host_of(targets[0])]
+        if len(targets) > 1:
+            discoverer.host_governors = dict(governors)
+        return [Shard(i, count, targets, True) for i in range(count)], visited, governors
+
+    def run(self, base_url, wordlist_path):
+        discoverer = self.discoverer
+        if not os.path.exists(wordlist_path):
+            log_error(f"Wordlist not found: {wordlist_path}")
+            return
+
+        targets = [base_url] if isinstance(base_url, str) else list(base_url)
+        ctx = multiprocessing.get_context("spawn")
+        shards, visited, governors = self._plan(targets, wordlist_path, ctx)
+        link = ctx.Queue()
+        stop = ctx.Event()
+        options = dict(self.options, **SHARD_OVERRIDES)
+        processes = [
+            ctx.Process(
+                target=_shard_main,
+                args=(self.engine, shard, options, wordlist_path, link, stop, visited, governors),
+                name=f"pathhunter-shard-{shard.index + 1}",
+                daemon=True,
+            )
+            for shard in shards
+        ]
+
+        discoverer.results = ResultWriter(discoverer._results_path())
+        discoverer.context.attach_results(discoverer.results.read)
+        task_id = discoverer.progress_bar.add_task("Scanning", total=discoverer.estimated_tasks)
+        discoverer._start_metrics()
+        for process in processes:
+            process.start()
+        split = "hosts" if visited is None else "words (shared dedupe and rate budget)"
+        log_info(f"Processes: {len(processes)} shards, split by {split}")
+
+        stats = self._collect(link, stop, processes, task_id, batch=len(targets) > 1)
+        for process in processes:
+            process.join()
+
+        if stats:
+            self._adopt_stats(stats, host_shards=visited is None)
+            discoverer._report_stats()
+        if len(stats) < len(processes):
+            log_error(f"{len(processes) - len(stats)} of {len(processes)} shards did not finish")
+        discoverer._stop_metrics()
+        discoverer._save_all_formats()
+
+    def _collect(self, link, stop, processes, task_id, batch):
+        """Record what the shards send until every one is done (or gone). Returns {shard: stats}."""
+        discoverer = self.discoverer
+        progress = {}  # shard -> (completed, total)
+        snapshots = {}  # shard -> last metrics snapshot merged
+        stats = {}
+
+        def merge_metrics(shard, snapshot):
+            discoverer.metrics.merge(snapshot, snapshots.get(shard))
+            snapshots[shard] = snapshot
+
+        with discoverer._live_view(task_id):
+            while len(stats) < len(processes):
+                try:
+                    try:
+                        kind, shard, *payload = link.get(timeout=0.5)
+                    except queue.Empty:
+                        if not any(process.is_alive() for process in processes) and link.empty():
+                            break  # a shard died without reporting
+                        kind = None
+
+                    if kind == "results":
+                        for result in payload[0]:
+                            if batch:
+                                discoverer.context.tag_result(result)
+                            discoverer.results.write(result)
+                            discoverer.context.add_discovery_result(result)
+                    elif kind == "progress":
+                        completed, total, hits, snapshot = payload
+                        progress[shard] = (completed, total)
+                        for hit in hits:
+                            discoverer.dashboard.record(*hit)
+                        merge_metrics(shard, snapshot)
+                    elif kind == "done":
+                        stats[shard] = payload[0]
+                        if payload[0]:
+                            merge_metrics(shard, payload[0]["metrics"])
+
+                    completed = sum(done for done, _ in progress.values())
+                    total = max(sum(total for _, total in progress.values()), discoverer.estimated_tasks)
+                    discoverer._update_view(task_id, completed, total)
+                    discoverer.results.poll()
+                    discoverer._poll_metrics()
+                except KeyboardInterrupt:
+                    if stop.is_set():  # second Ctrl-C: stop waiting for the shards
+                        for process in processes:
+                            process.terminate()
+                        break
+                    stop.set()
+
+        completed = sum(done for done, _ in progress.values())
+        discoverer._update_view(task_id, completed, sum(total for _, total in progress.values()), final=True)
+        return {shard: shard_stats for shard, shard_stats in stats.items() if shard_stats}
+
+    def _adopt_stats(self, stats, host_shards):
+        """Swap the coordinator engine's (unused) components for the shards' totals before reporting."""
+        discoverer = self.discoverer
+        shards = list(stats.values())
+
+        transport = _sum_stats(s["transport"] for s in shards)
+        transport["reuse_ratio"] = transport["reused"] / transport["requests"] if transport["requests"] else 0.0
+        session_mode = discoverer.transport.session_mode
+        discoverer.transport.close()
+        discoverer.transport = _Report(transport, session_mode=session_mode)
+        discoverer.redirect_cache = _Report(_sum_stats(s["redirects"] for s in shards))
+        discoverer.bypass_tracker = _Report(
+            _sum_stats(s["bypass"] for s in shards), prune_after=discoverer.bypass_tracker.prune_after
+        )
+        if discoverer.calibrator is not None:
+            discoverer.calibrator = _Report(_sum_stats(s["calibration"] for s in shards))
+        if discoverer.recursion:
+            discoverer.recursion_scheduler = _Report(_sum_stats(s["recursion"] for s in shards))
+        if discoverer.extension_planner is not None:
+            discoverer.extension_planner = _Report(_sum_stats(s["extensions"] for s in shards))
+        if discoverer.baseline is not None:
+            # known URLs probed again by any shard (only those can be reported gone)
+            for s in shards:
+                discoverer.baseline.checked.update(s["baseline"] or ())
+        if discoverer.cache is not None:
+            # the shards wrote the same file: entries and size are read from it
+            discoverer.cache.stored = sum(s["cache"]["stored"] for s in shards)
+            discoverer.cache.evicted = sum(s["cache"]["evicted"] for s in shards)
+        if host_shards:
+            # word shards share these with the coordinator already
+            discoverer.visited = _Report(_sum_stats(s["dedupe"] for s in shards))
+            discoverer.host_governors = {host: _Report(rate) for s in shards for host, rate in s["rate"].items()}
@@ -0,0 +1,514 @@
+import asyncio
+import contextlib
+import importlib.util
+import itertools
+import ssl
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.certs import where as ca_bundle
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, requote_uri
+from urllib3.poolmanager import pool_classes_by_scheme
+
+try:
+    import httpcore
+except ImportError:  # optional: only needed for the HTTP/2 transport
+    httpcore = None
+
+# --------------------------------------------------------------------------- #
+# Defaults
+# --------------------------------------------------------------------------- #
+SESSION_MODES = ("thread", "shared")
+DEFAULT_HOST_POOLS = 10
+DEFAULT_H2_CONNECTIONS = 2  # HTTP/2 connections per host
+DEFAULT_H2_STREAMS = 100  # concurrent streams per HTTP/2 connection
+
+
+def http2_available():
+    """Is the HTTP/2 transport usable (httpcore with its h2 extra installed)?"""
+    return httpcore is not None and importlib.util.find_spec("h2") is not None
+
+
+def _timed_pool_classes(on_connect):
+    """urllib3 pool classes whose connections report connect() time (DNS, TCP, TLS) to on_connect."""
+
+    def timed(connection_cls):
+        class TimedConnection(connection_cls):
+            def connect(self):
+                started = time.perf_counter()
+                super().connect()
+                on_connect(time.perf_counter() - started)
+
+        return TimedConnection
+
+    return {
+        scheme: type(pool_cls.__name__, (pool_cls,), {"ConnectionCls": timed(pool_cls.ConnectionCls)})
+        for scheme, pool_cls in pool_classes_by_scheme.items()
+    }
+
+
+# --------------------------------------------------------------------------- #
+# HttpTransport
+# --------------------------------------------------------------------------- #
+class HttpTransport:
+    """
+    Pooled keep-alive HTTP transport used by every scanning path.
+
+    Connections (and the TLS sessions on top of them) stay open between
+    probes instead of being torn down after each request.
+
+    session_mode="thread"  -> one requests.Session per worker thread
+    session_mode="shared"  -> all threads share one Session / connection pool
+
+    With `metrics` (a ScanMetrics), every request feeds the connect and
+    ttfb phases, and the body phase when it is not streamed.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 30,
+        session_mode: str = "thread",
+        verify_ssl: bool = True,
+        proxies=None,
+        timeout: int = 10,
+        max_retries: int = 0,
+        host_pools: int = DEFAULT_HOST_POOLS,
+        metrics=None,
+    ):
+        if session_mode not in SESSION_MODES:
+            raise ValueError(f"Unknown session mode: {session_mode}")
+
+        self.pool_size = max(1, pool_size)
+        self.session_mode = session_mode
+        self.verify_ssl = verify_ssl
+        self.proxies = proxies
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.host_pools = host_pools
+        self.metrics = metrics
+        self._pool_classes = _timed_pool_classes(self._connected) if metrics is not None else None
+
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._requests_sent = 0
+
+        self._shared = self._new_session() if session_mode == "shared" else None
+
+    # ------------------------------------------------------------------ #
+    # Sessions
+    # ------------------------------------------------------------------ #
+    def _new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.host_pools,
+            pool_maxsize=self.pool_size,
+            max_retries=self.max_retries,
+        )
+        if self._pool_classes is not None:
+            adapter.poolmanager.pool_classes_by_scheme = self._pool_classes
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.verify = self.verify_ssl
+        if self.proxies:
+            session.proxies.update(self.proxies)
+
+        with self._sessions_lock:
+            self._sessions.append(session)
+        return session
+
+    @property
+    def session(self):
+        if self._shared is not None:
+            return self._shared
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._new_session()
+            self._local.session = session
+        return session
+
+    # ------------------------------------------------------------------ #
+    # Requests
+    # ------------------------------------------------------------------ #
+    def request(self, method, url, headers=None, allow_redirects=True, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        # per request: requests lets REQUESTS_CA_BUNDLE override session.verify=False
+        kwargs.setdefault("verify", self.verify_ssl)
+        with self._stats_lock:
+            self._requests_sent += 1
+        if self.metrics is None:
+            return self.session.request(method, url, headers=headers, allow_redirects=allow_redirects, **kwargs)
+
+        self._local.connect_time = 0.0
+        started = time.perf_counter()
+        response = self.session.request(method, url, headers=headers, allow_redirects=allow_redirects, **kwargs)
+        self._observe(response, time.perf_counter() - started, kwargs.get("stream", False))
+        return response
+
+    def _connected(self, seconds):
+        self._local.connect_time = getattr(self._local, "connect_time", 0.0) + seconds
+
+    def _observe(self, response, seconds, streamed):
+        # response.elapsed stops when the headers are parsed (before the body)
+        headers_at = response.elapsed.total_seconds()
+        connect = self._local.connect_time
+        self.metrics.count("requests")
+        if connect:
+            self.metrics.observe("connect", connect)
+        self.metrics.observe("ttfb", max(0.0, headers_at - connect))
+        if not streamed:
+            self.metrics.observe("body", max(0.0, seconds - headers_at))
+
+    def get(self, url, headers=None, allow_redirects=True, **kwargs):
+        return self.request("GET", url, headers=headers, allow_redirects=allow_redirects, **kwargs)
+
+    # ------------------------------------------------------------------ #
+    # Stats / teardown
+    # ------------------------------------------------------------------ #
+    def _iter_pools(self):
+        with self._sessions_lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            for adapter in {id(a): a for a in session.adapters.values()}.values():
+                managers = [adapter.poolmanager] + list(adapter.proxy_manager.values())
+                for manager in managers:
+                    for key in list(manager.pools.keys()):
+                        pool = manager.pools.get(key)
+                        if pool is not None:
+                            yield pool
+
+    def stats(self):
+        """
+        Connection reuse numbers. `connections` counts sockets actually
+        opened; every request beyond that rode an existing keep-alive
+        connection.
+        """
+        with self._stats_lock:
+            sent = self._requests_sent
+        opened = sum(pool.num_connections for pool in self._iter_pools())
+        reused = max(sent - opened, 0)
+        return {
+            "requests": sent,
+            "connections": opened,
+            "reused": reused,
+            "reuse_ratio": (reused / sent) if sent else 0.0,
+            "sessions": len(self._sessions),
+        }
+
+    def close(self):
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+
+# --------------------------------------------------------------------------- #
+# Http2Transport
+# --------------------------------------------------------------------------- #
+class _H2Response:
+    """
+    An httpcore response behind the part of the requests.Response interface
+    the engine uses; its body is read through the transport's event loop.
+    Closing it (or reading the body to the end) frees its stream.
+    """
+
+    def __init__(self, response, url, call, release):
+        self._response = response
+        self._call = call
+        self._release = release
+        self.url = url
+        self.status_code = response.status
+        self.http_version = response.extensions.get("http_version", b"HTTP/1.1").decode("ascii")
+        self.headers = CaseInsensitiveDict()
+        for name, value in response.headers:
+            name, value = name.decode("latin-1"), value.decode("latin-1")
+            self.headers[name] = f"{self.headers[name]}, {value}" if name in self.headers else value
+        # same rule as requests: the charset, else ISO-8859-1 for text/*
+        self.encoding = get_encoding_from_headers(self.headers)
+
+    def iter_content(self, chunk_size=16384):
+        # chunks come as the frames arrive; chunk_size is not enforced
+        chunks = self._response.aiter_stream()
+        try:
+            while True:
+                try:
+                    yield self._call(_next_chunk(chunks))
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.close()
+
+    @property
+    def content(self):
+        try:
+            return self._call(self._response.aread())
+        finally:
+            self.close()
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def close(self):
+        if self._release is not None:
+            release, self._release = self._release, None
+            try:
+                self._call(self._response.aclose())
+            finally:
+                release()
+
+
+async def _next_chunk(chunks):
+    return await chunks.__anext__()
+
+
+def _translate(error):
+    """httpcore error -> the requests exception the engine handles."""
+    if isinstance(error, httpcore.TimeoutException):
+        return requests.Timeout(str(error))
+    if isinstance(error, (httpcore.NetworkError, httpcore.ProtocolError, httpcore.ProxyError, OSError)):
+        return requests.ConnectionError(str(error) or type(error).__name__)
+    return requests.RequestException(str(error) or type(error).__name__)
+
+
+def _ssl_context(verify_ssl):
+    context = ssl.create_default_context(cafile=ca_bundle())
+    if not verify_ssl:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+class Http2Transport:
+    """
+    HTTP/2 transport: many concurrent probes multiplexed as streams over a
+    few TLS connections per host, instead of one request per connection.
+
+    `connections` pools are used round-robin, each holding one connection
+    per host and at most `max_streams` streams in flight on it. All h2 I/O
+    runs on one event loop thread of the transport; worker threads hand
+    their requests to it and wait. h2 is negotiated through ALPN: a host
+    that answers over HTTP/1.1 (and every http:// URL) goes to a wrapped
+    HttpTransport for the rest of the scan. Takes the same requests as
+    HttpTransport and returns responses with the same interface; paths are
+    sent exactly as given (no dot-segment cleanup), as bypass probes need.
+    """
+
+    def __init__(
+        self,
+        connections: int = DEFAULT_H2_CONNECTIONS,
+        max_streams: int = DEFAULT_H2_STREAMS,
+        verify_ssl: bool = True,
+        proxies=None,
+        timeout: int = 10,
+        metrics=None,
+        **fallback,
+    ):
+        if not http2_available():
+            raise RuntimeError("the HTTP/2 transport needs httpcore with HTTP/2 support: pip install 'httpcore[http2]'")
+
+        self.connections = max(1, connections)
+        self.max_streams = max(1, max_streams)
+        self.verify_ssl = verify_ssl
+        self.timeout = timeout
+        self.metrics = metrics
+        self.fallback = HttpTransport(verify_ssl=verify_ssl, proxies=proxies, timeout=timeout, metrics=metrics, **fallback)
+        self.session_mode = self.fallback.session_mode
+
+        proxy = (proxies or {}).get("https")
+        self._pools = [
+            httpcore.AsyncConnectionPool(
+                ssl_context=_ssl_context(verify_ssl),
+                proxy=httpcore.Proxy(proxy) if proxy else None,
+                max_connections=None,
+                http2=True,
+            )
+            for _ in range(self.connections)
+        ]
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="http2-transport", daemon=True)
+        self._thread.start()
+
+        self._turn = itertools.count()
+        self._streams = {}  # (pool index, host) -> semaphore of free streams
+        self._h1_hosts = set()  # hosts that did not negotiate h2
+        self._lock = threading.Lock()
+        self._requests_sent = 0
+        self._h2_requests = 0
+        self._connections_opened = 0
+
+    def _call(self, coroutine):
+        """Run coroutine on the transport's loop and wait for it; httpcore errors become requests errors."""
+        try:
+            return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+        except (StopAsyncIteration, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            if isinstance(e, requests.RequestException):
+                raise
+            raise _translate(e) from e
+
+    # ------------------------------------------------------------------ #
+    # Requests
+    # ------------------------------------------------------------------ #
+    def request(self, method, url, headers=None, allow_redirects=True, **kwargs):
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        if parts.scheme != "https" and host not in self._h1_hosts:
+            with self._lock:
+                self._h1_hosts.add(host)  # no h2 without TLS (ALPN)
+        # the engine walks redirects itself; anything else is left to requests
+        if allow_redirects or host in self._h1_hosts:
+            return self.fallback.request(method, url, headers=headers, allow_redirects=allow_redirects, **kwargs)
+
+        index = next(self._turn) % self.connections
+        streams = self._stream_slots(index, host)
+        streams.acquire()
+        timing = {"connect": 0.0}
+        started = time.perf_counter()
+        try:
+            response = self._call(self._send(self._pools[index], method, parts, headers, kwargs.get("timeout", self.timeout), timing))
+        except BaseException:
+            streams.release()
+            raise
+        headers_at = time.perf_counter() - started
+        wrapped = _H2Response(response, url, self._call, streams.release)
+        with self._lock:
+            self._requests_sent += 1
+            if wrapped.http_version == "HTTP/2":
+                self._h2_requests += 1
+            else:
+                self._h1_hosts.add(host)
+
+        if not kwargs.get("stream", False):
+            wrapped.content  # read now; frees the stream
+        if self.metrics is not None:
+            self._observe(timing["connect"], headers_at, time.perf_counter() - started, kwargs.get("stream", False))
+        return wrapped
+
+    def get(self, url, headers=None, allow_redirects=True, **kwargs):
+        return self.request("GET", url, headers=headers, allow_redirects=allow_redirects, **kwargs)
+
+    async def _send(self, pool, method, parts, headers, timeout, timing):
+        async def trace(event, info):
+            # only the request that opens a connection sees these
+            if event == "connection.connect_tcp.started":
+                timing["started"] = time.perf_counter()
+            elif event == "connection.connect_tcp.complete":
+                with self._lock:
+                    self._connections_opened += 1
+            elif event == "connection.start_tls.complete":
+                timing["connect"] = time.perf_counter() - timing["started"]
+
+        fields = [("Host", parts.netloc)] + [(name, value) for name, value in (headers or {}).items() if name.lower() != "host"]
+        # quoted as requests does it, but dot segments are kept
+        target = requote_uri((parts.path or "/") + (f"?{parts.query}" if parts.query else ""))
+        request = httpcore.Request(
+            method,
+            httpcore.URL(scheme="https", host=parts.hostname, port=parts.port or 443, target=target),
+            headers=fields,
+            extensions={"timeout": dict.fromkeys(("connect", "read", "write", "pool"), timeout), "trace": trace},
+        )
+        return await pool.handle_async_request(request)
+
+    def _stream_slots(self, index, host):
+        key = (index, host)
+        streams = self._streams.get(key)
+        if streams is None:
+            with self._lock:
+                streams = self._streams.setdefault(key, threading.BoundedSemaphore(self.max_streams))
+        return streams
+
+    def _observe(self, connect, headers_at, seconds, streamed):
+        self.metrics.count("requests")
+        if connect:
+            self.metrics.observe("connect", connect)
+        self.metrics.observe("ttfb", max(0.0, headers_at - connect))
+        if not streamed:
+            self.metrics.observe("body", max(0.0, seconds - headers_at))
+
+    # ------------------------------------------------------------------ #
+    # Stats / teardown
+    # ------------------------------------------------------------------ #
+    def stats(self):
+        """HttpTransport's numbers for both protocols, plus the requests sent over h2."""
+        fallback = self.fallback.stats()
+        with self._lock:
+            sent = self._requests_sent + fallback["requests"]
+            opened = self._connections_opened + fallback["connections"]
+            http2 = self._h2_requests
+            h1_hosts = sorted(self._h1_hosts)
+        reused = max(sent - opened, 0)
+        return {
+            "requests": sent,
+            "connections": opened,
+            "reused": reused,
+            "reuse_ratio": (reused / sent) if sent else 0.0,
+            "sessions": fallback["sessions"] + len(self._pools),
+            "http2": http2,
+            "h1_hosts": h1_hosts,
+        }
+
+    def close(self):
+        self.fallback.close()
+        if self._loop.is_closed():
+            return
+        for pool in self._pools:
+            with contextlib.suppress(Exception):
+                self._call(pool.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+# --------------------------------------------------------------------------- #
+# Probe results / redirect cache
+# --------------------------------------------------------------------------- #
+# headers: of the probed URL's own response (None when a redirect was followed)
+ProbeResult = namedtuple("ProbeResult", "status content url location headers", defaults=(None,))
+
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+
+
+class RedirectCache:
+    """
+    Per-scan cache of resolved redirect targets: Location URL -> final
+    (status, content). Thousands of paths redirecting to the same /login cost
+    one fetch; striped locks coalesce concurrent first fetches of a target.
+    """
+
+    def __init__(self, max_entries: int = 4096, stripes: int = 64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._guard = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self.hits = 0
+        self.fetches = 0
+
+    def lock_for(self, url):
+        return self._stripes[hash(url) % len(self._stripes)]
+
+    def get(self, url):
+        with self._guard:
+            result = self._entries.get(url)
+            if result is not None:
+                self.hits += 1
+            return result
+
+    def put(self, url, result):
+        with self._guard:
+            self.fetches += 1
+            self._entries[url] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        return {"targets": len(self._entries), "fetches": self.fetches, "hits": self.hits}
@@ -1,35 +1,106 @@
-from rich.live import Live
-from rich.table import Table
-from rich.console import Console
-from time import sleep
-
-console = Console()
-
-def live_scan_display(get_status_func, total_tasks):
-    """
-    Displays a live updating table for scan progress.
-
-    Args:
-        get_status_func: A callback function that returns a list of dicts with keys:
-                         'status', 'url', 'severity' representing current scan results.
-        total_tasks: Total number of scan tasks (for progress).
-    """
-    with Live(refresh_per_second=4, console=console, transient=False) as live:
-        while True:
-            data = get_status_func()  # Get latest scan results
-
-            table = Table(title=f"Scanning... {len(data)}/{total_tasks} tasks completed")
-            table.add_column("Status", justify="center")
-            table.add_column("URL", overflow="fold")
-            table.add_column("Severity", justify="center")
-
-            for item in data:
-                table.add_row(str(item["status"]), item["url"], item["severity"])
-
-            live.update(table)
-
-            # Break condition when scanning done (can be controlled externally)
-            if len(data) >= total_tasks:
-                break
-
-            sleep(0.25)  # refresh interval
+import collections
+import threading
+
+from rich.live import Live
+from rich.table import Table
+from rich.console import Console, Group
+from rich.text import Text
+from time import sleep
+
+console = Console()
+
+
+def format_status(status_code: int) -> str:
+    if 200 <= status_code < 300:
+        return f"[bold green]{status_code}[/bold green] ✅"
+    elif 300 <= status_code < 400:
+        return f"[bold blue]{status_code}[/bold blue] 🔵"
+    elif 400 <= status_code < 500:
+        return f"[bold yellow]{status_code}[/bold yellow] ⚠️"
+    else:
+        return f"[bold red]{status_code}[/bold red] 🔥"
+
+def live_scan_display(get_status_func, total_tasks):
+    """
+    Displays a live updating table for scan progress.
+
+    Args:
+        get_status_func: A callback function that returns a list of dicts with keys:
+                         'status', 'url', 'severity' representing current scan results.
+        total_tasks: Total number of scan tasks (for progress).
+    """
+    with Live(refresh_per_second=4, console=console, transient=False) as live:
+        while True:
+            data = get_status_func()  # Get latest scan results
+
+            table = Table(title=f"Scanning... {len(data)}/{total_tasks} tasks completed")
+            table.add_column("Status", justify="center")
+            table.add_column("URL", overflow="fold")
+            table.add_column("Severity", justify="center")
+
+            for item in data:
+                table.add_row(str(item["status"]), item["url"], item["severity"])
+
+            live.update(table)
+
+            # Break condition when scanning done (can be controlled externally)
+            if len(data) >= total_tasks:
+                break
+
+            sleep(0.25)  # refresh interval
+
+
+class ScanDashboard:
+    """
+    Bounded live view of scan hits.
+
+    Workers hand hits over with `record` (a bare deque append, no lock on
+    the hot path). The renderer drains them into per-status / per-severity
+    counters and a ring buffer of the most recent hits, so a frame costs
+    the same with ten hits or a hundred thousand.
+    """
+
+    def __init__(self, recent: int = 15):
+        self._events = collections.deque()
+        self._drain_lock = threading.Lock()  # consumers only (Live refresh thread, run loop)
+        self.recent = collections.deque(maxlen=recent)
+        self.by_status = collections.Counter()
+        self.by_severity = collections.Counter()
+        self.hits = 0
+
+    def record(self, status, url, label, severity=None):
+        self._events.append((status, url, label, severity or label))
+
+    def drain(self):
+        """Fold pending hits into the counters and ring buffer; returns them."""
+        drained = []
+        with self._drain_lock:
+            while True:
+                try:
+                    event = self._events.popleft()
+                except IndexError:
+                    break
+                status, url, label, severity = event
+                self.recent.append((status, url, label))
+                self.by_status[status] += 1
+                self.by_severity[severity] += 1
+                drained.append(event)
+            self.hits += len(drained)
+        return drained
+
+    def render(self):
+        self.drain()
+        counters = Text.from_markup(
+            "  ".join(f"{format_status(status)} {count}" for status, count in sorted(self.by_status.items()))
+            or "[dim]No hits yet[/dim]"
+        )
+        severities = Text("  ".join(f"{severity}: {count}" for severity, count in self.by_severity.most_common()))
+
+        table = Table(show_header=True, header_style="bold magenta", title=f"Latest {len(self.recent)} of {self.hits} hits")
+        table.add_column("Status", style="cyan", width=10)
+        table.add_column("URL", style="white")
+        table.add_column("Severity", style="yellow")
+        for status, url, label in self.recent:
+            table.add_row(format_status(status), url, label)
+        return Group(counters, severities, table)
+
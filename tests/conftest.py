@@ -0,0 +1,64 @@
+import json
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.server import SyntheticTarget  # noqa: E402
+from modules.async_engine import AsyncContentDiscoverer  # noqa: E402
+from modules.content_discoverer import ContentDiscoverer  # noqa: E402
+from modules.output import iter_results  # noqa: E402
+from utils.context import ScanContext  # noqa: E402
+from utils.wordlist import iter_wordlist  # noqa: E402
+
+ENGINES = {"thread": ContentDiscoverer, "async": AsyncContentDiscoverer}
+
+
+@pytest.fixture
+def target():
+    with SyntheticTarget() as target:
+        yield target
+
+
+@pytest.fixture
+def wordlist(tmp_path):
+    """wordlist(n): a file with the first n words of wordlists/common.txt."""
+
+    def make(words):
+        path = tmp_path / f"common.{words}.txt"
+        with open(path, "w", encoding="utf-8") as f:
+            for i, word in enumerate(iter_wordlist(os.path.join(REPO_ROOT, "wordlists", "common.txt"))):
+                if i >= words:
+                    break
+                f.write(word + "\n")
+        return str(path)
+
+    return make
+
+
+def sorted_results(path):
+    """The results of a JSONL file, comparable across runs (one sorted JSON string each)."""
+    return sorted(json.dumps(result, sort_keys=True) for result in iter_results(path))
+
+
+@pytest.fixture
+def scan(tmp_path):
+    """scan(url, wordlist, engine="thread", **options): run a headless scan, return (discoverer, sorted results)."""
+    runs = iter(range(1000))
+
+    def run(url, wordlist, engine="thread", **options):
+        options = dict(dict(recursion=False, rate=5000, max_rate=10000, threads=20), **options)
+        discoverer = ENGINES[engine](
+            context=ScanContext(target_url=url, wordlist_path=wordlist),
+            output_path=str(tmp_path / f"{engine}-{next(runs)}"),
+            formats=["json"],
+            ui=False,
+            **options,
+        )
+        discoverer.run(url, wordlist)
+        return discoverer, sorted_results(discoverer.results.path)
+
+    return run
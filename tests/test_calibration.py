@@ -0,0 +1,44 @@
+from modules.calibration import Calibrator
+
+DIRECTORY = "http://127.0.0.1/"
+
+
+def calibrated(answers, statuses=(200, 302, 403)):
+    """A Calibrator for DIRECTORY whose random probes got answers: [(kind, status, content, location)]."""
+    calibrator = Calibrator(["php"], samples=len(answers), statuses=set(statuses))
+    for i, (kind, status, content, location) in enumerate(answers):
+        calibrator.learn(DIRECTORY, kind, status, content, f"{DIRECTORY}probe{i}.{kind}", location)
+    calibrator.finish(DIRECTORY)
+    return calibrator
+
+
+def test_catch_all_page_is_dropped():
+    calibrator = calibrated([("php", 200, "<html>Welcome</html>", None)] * 2)
+    assert calibrator.is_wildcard(DIRECTORY, "php", 200, "<html>Welcome</html>", f"{DIRECTORY}a.php")
+
+
+def test_echoing_catch_all_matches_on_word_and_line_counts():
+    calibrator = calibrated([
+        ("php", 200, "<html>You asked for /x1.php</html>", None),
+        ("php", 200, "<html>You asked for /longer2.php</html>", None),
+    ])
+    assert calibrator.is_wildcard(DIRECTORY, "php", 200, "<html>You asked for /admin.php</html>")
+    assert not calibrator.is_wildcard(DIRECTORY, "php", 200, "<html><h1>Admin</h1> sign in to continue</html>")
+
+
+def test_probe_that_hit_a_real_page_gives_no_baseline():
+    calibrator = calibrated([("php", 403, "forbidden", None), ("php", 404, "not found", None)])
+    assert not calibrator.has_baseline(DIRECTORY, 403)
+    assert not calibrator.is_wildcard(DIRECTORY, "php", 403, "forbidden")
+
+
+def test_catch_all_without_stable_fields_filters_nothing():
+    calibrator = calibrated([("php", 200, "a", None), ("php", 200, "bb bb\ncc", None)])
+    assert not calibrator.has_baseline(DIRECTORY, 200)
+    assert not calibrator.is_wildcard(DIRECTORY, "php", 200, "anything")
+
+
+def test_redirects_match_only_the_same_target():
+    calibrator = calibrated([("php", 302, "", "/login")] * 2)
+    assert calibrator.is_wildcard(DIRECTORY, "php", 302, "", f"{DIRECTORY}a.php", "/login")
+    assert not calibrator.is_wildcard(DIRECTORY, "php", 302, "", f"{DIRECTORY}a.php", "/a.php/next")
@@ -0,0 +1,30 @@
+from modules.output import ResultWriter
+from utils.context import ScanContext
+
+
+def result(i):
+    return {"url": f"http://target/dir{i % 3}/page{i}", "status": 200 if i % 2 else 403, "severity": "low"}
+
+
+def test_memory_store_keeps_a_bounded_window():
+    context = ScanContext(target_url="http://target/", wordlist_path=None)
+    for i in range(5000):
+        context.add_discovery_result(result(i))
+    assert context.count == 5000
+    assert context.results_by_status == {200: 2500, 403: 2500}
+    assert len(context.get_all_discoveries()) == 1000
+    assert context.get_all_discoveries()[-1] == result(4999)
+
+
+def test_queries_read_the_attached_result_file(tmp_path):
+    context = ScanContext(target_url="http://target/", wordlist_path=None)
+    writer = ResultWriter(str(tmp_path / "results.json"))
+    context.attach_results(writer.read)
+    for i in range(5000):
+        writer.write(result(i))
+        context.add_discovery_result(result(i))
+    assert context.get_all_discoveries() == [result(i) for i in range(5000)]
+    found = list(context.iter_discoveries(status=200, directory="http://target/dir1/"))
+    assert [d.url for d in found] == [result(i)["url"] for i in range(5000) if i % 2 and i % 3 == 1]
+    writer.close()
+    assert len(context.get_all_discoveries()) == 5000
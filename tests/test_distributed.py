@@ -0,0 +1,112 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from conftest import REPO_ROOT, sorted_results
+from modules.content_discoverer import ContentDiscoverer
+from modules.distributed import TOKEN_ENV, DistributedScan, run_worker
+from utils.context import ScanContext
+
+TOKEN = "test-token"
+
+
+def free_address():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()
+
+
+def wait_listening(address, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(address, timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def start_coordinator(target, words, tmp_path, options, worker_options=None):
+    discoverer = ContentDiscoverer(
+        context=ScanContext(target_url=target.url, wordlist_path=words),
+        output_path=str(tmp_path / "distributed"),
+        formats=["json"],
+        ui=False,
+        **options,
+    )
+    address = free_address()
+    scan = DistributedScan(discoverer, address, worker_options or options, lease_size=16, token=TOKEN)
+    thread = threading.Thread(target=scan.run, args=(target.url, words), daemon=True)
+    thread.start()
+    wait_listening(address)
+    return discoverer, address, thread
+
+
+def start_workers(address, count):
+    env = dict(os.environ, **{TOKEN_ENV: TOKEN})
+    command = [sys.executable, os.path.join(REPO_ROOT, "main.py"), "worker", f"{address[0]}:{address[1]}"]
+    return [
+        subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("recursion", [False, True])
+def test_distributed_scan_matches_a_local_one(target, wordlist, scan, tmp_path, recursion):
+    words = wordlist(300)
+    options = dict(recursion=recursion, max_depth=2, recursion_budget=50, rate=5000, max_rate=10000, threads=20)
+    _, expected = scan(target.url, words, **options)
+
+    discoverer, address, coordinator = start_coordinator(target, words, tmp_path, options)
+    workers = start_workers(address, 2)
+    coordinator.join(timeout=120)
+    for worker in workers:
+        assert worker.wait(timeout=30) == 0
+    assert not coordinator.is_alive()
+    assert expected
+    assert sorted_results(discoverer.results.path) == expected
+
+
+def test_workers_get_the_rule_file_content(target, wordlist, scan, tmp_path):
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps({"signatures": [{"name": "synthetic page", "pattern": "found", "severity": "high"}]}))
+    words = wordlist(300)
+    options = dict(recursion=False, rate=5000, max_rate=10000, rules_path=str(rules))
+    _, expected = scan(target.url, words, **options)
+
+    discoverer, address, coordinator = start_coordinator(target, words, tmp_path, options)
+    rules.unlink()  # read by the coordinator: the workers never open it
+    for worker in start_workers(address, 2):
+        assert worker.wait(timeout=60) == 0
+    coordinator.join(timeout=30)
+    assert any("synthetic page" in result for result in expected)
+    assert sorted_results(discoverer.results.path) == expected
+
+
+def test_worker_with_a_wrong_token_is_refused(target, wordlist, tmp_path):
+    options = dict(recursion=False, rate=5000, max_rate=10000)
+    _, address, coordinator = start_coordinator(target, wordlist(20), tmp_path, options)
+    run_worker(address, "wrong")  # returns instead of scanning
+    start_workers(address, 1)[0].wait(timeout=30)
+    coordinator.join(timeout=30)
+    assert not coordinator.is_alive()
+
+
+def test_worker_setup_failure_stops_the_scan(target, wordlist, tmp_path):
+    options = dict(recursion=False, rate=5000, max_rate=10000)
+    discoverer, address, coordinator = start_coordinator(
+        target, wordlist(20), tmp_path, options, dict(options, session_mode="bogus")
+    )
+    worker = start_workers(address, 1)[0]
+    assert worker.wait(timeout=30) == 0
+    coordinator.join(timeout=30)
+    assert not coordinator.is_alive()
+    assert not sorted_results(discoverer.results.path)
@@ -0,0 +1,31 @@
+import pytest
+
+from modules.content_discoverer import ContentDiscoverer
+
+
+@pytest.mark.parametrize("recursion", [False, True])
+def test_thread_and_async_engines_find_the_same(target, wordlist, scan, recursion):
+    words = wordlist(600)
+    options = dict(recursion=recursion, max_depth=2, recursion_budget=100)
+    _, threaded = scan(target.url, words, "thread", **options)
+    _, asynchronous = scan(target.url, words, "async", concurrency=50, **options)
+    assert threaded
+    assert threaded == asynchronous
+
+
+@pytest.mark.parametrize("engine", ["thread", "async"])
+def test_failing_probe_keeps_the_rest_of_its_word(target, wordlist, scan, monkeypatch, engine):
+    words = wordlist(300)
+    _, expected = scan(target.url, words, engine, extensions=["bak", "php"])
+    accept = ContentDiscoverer._accept_response
+
+    def failing(self, directory, target, *args):
+        if target.endswith(".bak"):
+            raise ValueError("broken rule")
+        return accept(self, directory, target, *args)
+
+    monkeypatch.setattr(ContentDiscoverer, "_accept_response", failing)
+    discoverer, results = scan(target.url, words, engine, extensions=["bak", "php"])
+    assert any('.php"' in result for result in expected)
+    assert results == [result for result in expected if '.bak"' not in result]
+    assert discoverer.metrics.counters()["errors"]
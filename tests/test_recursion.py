@@ -0,0 +1,32 @@
+from modules.recursion import RecursionScheduler, names_file
+
+
+def test_words_with_slashes_count_every_segment():
+    scheduler = RecursionScheduler(["a", "b"], max_depth=2)
+    root = "http://target/"
+    assert scheduler.add(root + "admin/", root, 200)
+    assert scheduler.add(root + "api/v1/", root, 200)
+    assert scheduler.depth_of(root + "api/v1/") == 2
+    assert not scheduler.add(root + "api/v1/users/", root + "api/v1/", 200)
+    assert not scheduler.add(root + "admin/api/v1/", root + "admin/", 200)
+    assert not scheduler.add("http://target/other/", root + "admin/", 200)
+    assert scheduler.stats()["skipped"] == 2
+
+
+def test_file_names_are_not_directories():
+    assert names_file(".rhosts/")
+    assert names_file(".git/config/")
+    assert names_file(".well-known/security.txt/")
+    assert names_file("backup.zip/")
+    assert not names_file("admin/")
+    assert not names_file("api/v1/")
+
+
+def test_recursion_stays_within_max_depth(target, wordlist, scan):
+    discoverer, _ = scan(target.url, wordlist(600), recursion=True, max_depth=2, recursion_budget=100)
+    depths = discoverer.recursion_scheduler.state()["depths"]
+    assert depths
+    for directory, depth in depths.items():
+        segments = directory[len(target.url):].strip("/").split("/")
+        assert depth == len(segments) <= 2
+        assert not names_file(directory[len(target.url):])
@@ -0,0 +1,20 @@
+import pytest
+
+from benchmarks.server import SyntheticTarget
+from modules.transport import http2_available
+
+
+@pytest.mark.skipif(not http2_available(), reason="needs httpcore[http2]")
+@pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+@pytest.mark.parametrize("server_h2", [True, False])
+def test_http2_falls_back_to_http1_without_alpn(wordlist, scan, server_h2):
+    words = wordlist(200)
+    with SyntheticTarget(tls=True, http2=server_h2) as target:
+        _, expected = scan(target.url, words, verify_ssl=False)
+        discoverer, results = scan(target.url, words, verify_ssl=False, http2=True)
+    stats = discoverer.transport.stats()
+    assert results == expected
+    if server_h2:
+        assert stats["http2"] and not stats["h1_hosts"]
+    else:
+        assert not stats["http2"] and stats["h1_hosts"] == [target.url.split("/")[2]]
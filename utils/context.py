@@ -1,29 +1,197 @@
-# utils/context.py
-class ScanContext:
-    def __init__(self, target_url, wordlist_path, verify_ssl=True,
-                 threads=30, delay=0.1, proxy=None, include_regex=None, exclude_regex=None):
-        self.target_url = target_url
-        self.wordlist_path = wordlist_path
-        self.verify_ssl = verify_ssl
-        self.threads = threads
-        self.delay = delay
-        self.proxy = proxy
-        self.include_regex = include_regex
-        self.exclude_regex = exclude_regex
-
-        self.found_paths = set()
-        self.discovery_results = []
-        self.discoveries = [] 
-
-    def add_discovery_result(self, result):
-        self.discovery_results.append(result)
-
-    def get_all_discoveries(self):
-        return self.discovery_results
-
-
-    def add_discovery_result(self, result):
-        self.discoveries.append(result)
-
-    def get_all_discoveries(self):
-        return self.discoveries
+# utils/context.py
+import json
+import sqlite3
+import threading
+from collections import Counter, deque, namedtuple
+from urllib.parse import urlsplit
+
+# One discovery, compact: the fields every result has, plus whatever else it
+# carries (location, bypass technique, host tag) in `extra`
+Discovery = namedtuple("Discovery", "url status severity directory host extra")
+
+CORE_FIELDS = ("url", "status", "severity")
+SQLITE_BATCH = 256  # rows buffered before an INSERT
+RECENT_WINDOW = 1000  # discoveries the memory store keeps
+
+
+def _directory(url):
+    """Directory a result lives in (a directory's parent)."""
+    return url[: url.rstrip("/").rfind("/") + 1]
+
+
+def _host(url):
+    return urlsplit(url).netloc.lower()
+
+
+def to_discovery(result):
+    url = result["url"]
+    extra = {key: value for key, value in result.items() if key not in CORE_FIELDS}
+    return Discovery(url, result.get("status"), result.get("severity"), _directory(url), _host(url), extra or None)
+
+
+def to_result(discovery):
+    result = {"url": discovery.url, "status": discovery.status}
+    if discovery.severity is not None:
+        result["severity"] = discovery.severity
+    result.update(discovery.extra or {})
+    return result
+
+
+# --------------------------------------------------------------------------- #
+# Stores
+# --------------------------------------------------------------------------- #
+class _MemoryStore:
+    """
+    The last `window` discoveries; memory stays bounded however many a scan
+    finds. When `source` is set (a callable streaming every result of the
+    scan: the JSONL result file), queries read it instead of the window.
+    """
+
+    def __init__(self, window: int = RECENT_WINDOW):
+        self._recent = deque(maxlen=window)
+        self.source = None
+
+    def add(self, discovery):
+        self._recent.append(discovery)
+
+    def query(self, **where):
+        """The window as a list (taken under the context lock), or a stream of the source."""
+        where = {field: value for field, value in where.items() if value is not None}
+        if self.source is None:
+            return [d for d in self._recent if all(getattr(d, f) == v for f, v in where.items())]
+        return self._stream(self.source, where)
+
+    @staticmethod
+    def _stream(source, where):
+        for result in source():
+            discovery = to_discovery(result)
+            if all(getattr(discovery, f) == v for f, v in where.items()):
+                yield discovery
+
+    def close(self):
+        pass
+
+
+class _SqliteStore:
+    """
+    Discoveries in an SQLite file (for result sets too large for memory).
+    Rows are inserted in batches; a query flushes them first and then
+    streams its rows. The file belongs to one scan: it is emptied when opened.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS discoveries (
+                url TEXT, status INTEGER, severity TEXT, directory TEXT, host TEXT, extra TEXT
+            );
+            CREATE INDEX IF NOT EXISTS discoveries_status ON discoveries (status);
+            CREATE INDEX IF NOT EXISTS discoveries_severity ON discoveries (severity);
+            CREATE INDEX IF NOT EXISTS discoveries_directory ON discoveries (directory);
+            DELETE FROM discoveries;
+            """
+        )
+        self._pending = []
+
+    def add(self, discovery):
+        self._pending.append(discovery[:5] + (json.dumps(discovery.extra) if discovery.extra else None,))
+        if len(self._pending) >= SQLITE_BATCH:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._db.executemany("INSERT INTO discoveries VALUES (?, ?, ?, ?, ?, ?)", self._pending)
+            self._db.commit()
+            self._pending = []
+
+    def query(self, **where):
+        self._flush()
+        where = {field: value for field, value in where.items() if value is not None}
+        sql = "SELECT url, status, severity, directory, host, extra FROM discoveries"
+        if where:
+            sql += " WHERE " + " AND ".join(f"{field} = ?" for field in where)
+        return self._rows(sql + " ORDER BY rowid", tuple(where.values()))
+
+    def _rows(self, sql, parameters):
+        # a connection of its own: rows stream while the scan keeps inserting
+        db = sqlite3.connect(self.path)
+        try:
+            for row in db.execute(sql, parameters):
+                yield Discovery(*row[:5], json.loads(row[5]) if row[5] else None)
+        finally:
+            db.close()
+
+    def close(self):
+        self._flush()
+        self._db.close()
+
+
+# --------------------------------------------------------------------------- #
+# ScanContext
+# --------------------------------------------------------------------------- #
+class ScanContext:
+    """
+    Scan settings plus the store of discoveries. Adding is thread-safe; the
+    counts (total, per status / severity / host) are kept up to date, so
+    reading them costs O(1). With store_path, discoveries go to an SQLite
+    file; otherwise only the most recent ones are kept in memory, and
+    queries read the scan's result file once one is attached.
+    """
+
+    def __init__(self, target_url, wordlist_path, verify_ssl=True,
+                 threads=30, delay=0.1, proxy=None, include_regex=None, exclude_regex=None,
+                 targets=None, store_path=None):
+        self.target_url = target_url
+        # batch scans: every target; target_url is the first one
+        self.targets = list(targets) if targets else [target_url]
+        self.wordlist_path = wordlist_path
+        self.verify_ssl = verify_ssl
+        self.threads = threads
+        self.delay = delay
+        self.proxy = proxy
+        self.include_regex = include_regex
+        self.exclude_regex = exclude_regex
+
+        self.store_path = store_path
+        self._store = _SqliteStore(store_path) if store_path else _MemoryStore()
+        self._lock = threading.Lock()
+        self.count = 0
+        self.results_by_status = Counter()
+        self.results_by_severity = Counter()
+        self.results_by_host = Counter()
+
+    def tag_result(self, result):
+        """Record the host of a batch-scan result in it."""
+        result.setdefault("host", _host(result["url"]))
+        return result
+
+    def add_discovery_result(self, result):
+        discovery = to_discovery(result)
+        with self._lock:
+            self._store.add(discovery)
+            self.count += 1
+            self.results_by_status[discovery.status] += 1
+            if discovery.severity is not None:
+                self.results_by_severity[discovery.severity] += 1
+            self.results_by_host[discovery.host] += 1
+        return discovery
+
+    def attach_results(self, read):
+        """read() streams every result of the scan (the ResultWriter's JSONL) for queries."""
+        if self.store_path is None:
+            self._store.source = read
+
+    def iter_discoveries(self, status=None, severity=None, directory=None):
+        """Discoveries matching every given field, in the order they were added."""
+        with self._lock:
+            found = self._store.query(status=status, severity=severity, directory=directory)
+        return iter(found)
+
+    def get_all_discoveries(self):
+        return [to_result(discovery) for discovery in self.iter_discoveries()]
+
+    def close(self):
+        with self._lock:
+            self._store.close()
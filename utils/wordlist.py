@@ -0,0 +1,252 @@
+# utils/wordlist.py
+import hashlib
+import itertools
+import os
+import struct
+import threading
+from collections import OrderedDict, deque
+
+CHUNK_SIZE = 1 << 20
+WINDOW = 4096  # recently read words SharedWordlist keeps for consumers moving in step
+MAX_CURSORS = 32  # open per-consumer readers SharedWordlist keeps
+
+
+def iter_wordlist(path):
+    """Yield normalized words one at a time (no blank lines, no surrounding '/')."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Wordlist not found: {path}")
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            word = line.strip()
+            if word:
+                yield word.strip('/')
+
+
+def count_lines(path):
+    """Cheap line count for progress totals: counts newlines in binary chunks."""
+    count = 0
+    last = b""
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            count += chunk.count(b"\n")
+            last = chunk
+    if last and not last.endswith(b"\n"):
+        count += 1
+    return count
+
+
+# --------------------------------------------------------------------------- #
+# Compiled wordlists (.phw)
+#
+#   header  : magic, source size, source mtime_ns, sha256(source), word count
+#   index   : uint32 blob offset of every INDEX_STRIDE-th word (sparse seek table)
+#   blob    : normalized, deduplicated words joined by "\n"
+# --------------------------------------------------------------------------- #
+COMPILED_SUFFIX = ".phw"
+MAGIC = b"PHWL1"
+HEADER = struct.Struct("<5sQq32sI")
+OFFSET = struct.Struct("<I")
+INDEX_STRIDE = 64
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def compiled_path_for(source):
+    return source + COMPILED_SUFFIX
+
+
+def is_compiled(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def compile_wordlist(source, dest=None):
+    """Normalize + dedupe a text wordlist into the indexed .phw form. Returns dest."""
+    dest = dest or compiled_path_for(source)
+    stat = os.stat(source)
+    digest = _hash_file(source)
+
+    seen = set()
+    offsets = []
+    blob = bytearray()
+    for word in iter_wordlist(source):
+        if not word or word in seen:
+            continue
+        if len(seen) % INDEX_STRIDE == 0:
+            offsets.append(len(blob))
+        seen.add(word)
+        blob += word.encode("utf-8") + b"\n"
+
+    # write next to the destination and swap in, so readers never see a partial file
+    tmp = f"{dest}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, digest, len(seen)))
+        for offset in offsets:
+            f.write(OFFSET.pack(offset))
+        f.write(blob)
+    os.replace(tmp, dest)
+    return dest
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        magic, size, mtime_ns, digest, count = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"Not a compiled wordlist: {path}")
+    return {"source_size": size, "source_mtime_ns": mtime_ns, "sha256": digest.hex(), "count": count}
+
+
+def is_stale(source, compiled):
+    """True if compiled is missing or was built from different source text."""
+    try:
+        header = read_header(compiled)
+    except (OSError, ValueError, struct.error):
+        return True
+    stat = os.stat(source)
+    if stat.st_size == header["source_size"] and stat.st_mtime_ns == header["source_mtime_ns"]:
+        return False
+    # touched or copied: only the content hash decides
+    return _hash_file(source).hex() != header["sha256"]
+
+
+def ensure_compiled(source):
+    """Path of an up-to-date compiled form of source, rebuilding it if needed."""
+    compiled = compiled_path_for(source)
+    if is_stale(source, compiled):
+        compile_wordlist(source, compiled)
+    return compiled
+
+
+class CompiledWordlist:
+    """Read-only view over a .phw file; iteration streams from disk."""
+
+    def __init__(self, path):
+        self.path = path
+        header = read_header(path)
+        self.count = header["count"]
+        self.sha256 = header["sha256"]
+        self._index_start = HEADER.size
+        index_entries = (self.count + INDEX_STRIDE - 1) // INDEX_STRIDE
+        self._blob_start = HEADER.size + OFFSET.size * index_entries
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return self.iter_from(0)
+
+    def iter_from(self, index):
+        """Yield words starting at position index (seeks via the offset table)."""
+        if index >= self.count:
+            return
+        block, skip = divmod(index, INDEX_STRIDE)
+        with open(self.path, "rb") as f:
+            f.seek(self._index_start + OFFSET.size * block)
+            (offset,) = OFFSET.unpack(f.read(OFFSET.size))
+            f.seek(self._blob_start + offset)
+            for _ in range(skip):
+                f.readline()
+            for line in f:
+                yield line[:-1].decode("utf-8")
+
+
+def wordlist_size(path):
+    """Exact word count for compiled lists, cheap line count for text."""
+    if is_compiled(path):
+        return len(CompiledWordlist(path))
+    return count_lines(path)
+
+
+def stream_wordlist(path, start=0):
+    """Stream words from position start (compiled lists seek, text lists skip)."""
+    if is_compiled(path):
+        return CompiledWordlist(path).iter_from(start)
+    return itertools.islice(iter_wordlist(path), start, None)
+
+
+def count_words(path):
+    """Exact word count: the header of a compiled list, one streaming pass over text."""
+    if is_compiled(path):
+        return len(CompiledWordlist(path))
+    return sum(1 for _ in iter_wordlist(path))
+
+
+class SharedWordlist:
+    """
+    Indexed access to a word list for consumers that each walk it at their
+    own pace (the hosts of a batch scan, recursion's directories), without
+    loading it: words are read through stream_wordlist. With step > 1 it
+    is every step-th word from start.
+
+    The last WINDOW words read stay in memory, so consumers moving roughly
+    in step share one pass over the file. A consumer that falls behind the
+    window (or jumps ahead of it) reads on through a cursor of its own; at
+    most MAX_CURSORS stay open, the least recently used is closed first.
+    """
+
+    def __init__(self, path, start: int = 0, step: int = 1):
+        self.path = path
+        self.start = start
+        self.step = step
+        self._count = len(range(start, count_words(path), step))
+        self._window = deque()
+        self._low = 0  # index of the first word in the window
+        self._reader = None
+        self._cursors = OrderedDict()  # consumer -> [word iterator, index of its next word]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def _open(self, index):
+        """Words from index on (a generator: closing it lets go of the file)."""
+        yield from itertools.islice(stream_wordlist(self.path, self.start + index * self.step), 0, None, self.step)
+
+    def word(self, index, consumer=None):
+        """The word at index, for consumer (any hashable; one per reader walking the list)."""
+        with self._lock:
+            high = self._low + len(self._window)
+            if self._low <= index < high:
+                return self._window[index - self._low]
+            if high <= index < high + WINDOW:
+                return self._extend(index)
+            return self._read(index, consumer)
+
+    def _extend(self, index):
+        if self._reader is None:
+            self._reader = self._open(self._low + len(self._window))
+        while self._low + len(self._window) <= index:
+            self._window.append(next(self._reader))
+            if len(self._window) > WINDOW:
+                self._window.popleft()
+                self._low += 1
+        return self._window[-1]
+
+    def _read(self, index, consumer):
+        cursor = self._cursors.pop(consumer, None)
+        if cursor is None or cursor[1] != index:
+            if cursor is not None:
+                cursor[0].close()
+            cursor = [self._open(index), index]
+        word = next(cursor[0])
+        cursor[1] += 1
+        self._cursors[consumer] = cursor
+        if len(self._cursors) > MAX_CURSORS:
+            self._cursors.popitem(last=False)[1][0].close()
+        return word
+
+    def release(self, consumer):
+        """consumer is done: close its cursor."""
+        with self._lock:
+            cursor = self._cursors.pop(consumer, None)
+        if cursor is not None:
+            cursor[0].close()